@@ -0,0 +1,77 @@
+"""
+Micro-benchmark of message encode/decode cost per message.
+
+Compares the baseline path (nested to_dict() and the standard json module) with
+task._utils.codec for conversations of 10 to 10k messages. Run from the repository
+root:
+
+    python benchmarks/bench_models.py > bench_output.txt
+"""
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from task._models.custom_content import Attachment, CustomContent
+from task._models.message import Message
+from task._models.role import Role
+from task._utils import codec
+
+SIZES = (10, 100, 1_000, 10_000)
+"""
+Conversation lengths to benchmark.
+"""
+
+MIN_MESSAGES_PER_RUN = 50_000
+"""
+Minimum number of messages processed per timing run, so small conversations are repeated enough to measure.
+"""
+
+
+def build_conversation(size: int) -> list:
+    messages = []
+    for i in range(size):
+        if i % 10 == 9:
+            custom_content = CustomContent(attachments=[
+                Attachment(title=f"image_{i}.png", type="image/png", url=f"files/bucket/image_{i}.png")
+            ])
+        else:
+            custom_content = None
+        role = Role.USER if i % 2 == 0 else Role.AI
+        messages.append(Message(role=role, content=f"Message {i}: " + "lorem ipsum " * 8, custom_content=custom_content))
+    return messages
+
+
+def baseline_encode(messages: list) -> bytes:
+    return json.dumps([message.to_dict() for message in messages]).encode("utf-8")
+
+
+def baseline_decode(data: bytes) -> list:
+    return [Message.from_dict(item) for item in json.loads(data)]
+
+
+def per_message_us(func, arg, size: int) -> float:
+    number = max(1, MIN_MESSAGES_PER_RUN // size)
+    best = min(timeit.repeat(lambda: func(arg), number=number, repeat=5))
+    return best / number / size * 1e6
+
+
+def main() -> None:
+    print(f"codec backend: {'orjson' if codec.FAST_JSON else 'json'}")
+    print(f"{'messages':>9} | {'encode json':>12} | {'encode codec':>12} | {'decode json':>12} | {'decode codec':>12}   (us/message)")
+    for size in SIZES:
+        messages = build_conversation(size)
+        data = baseline_encode(messages)
+        assert codec.decode_messages(codec.encode_messages(messages)) == messages
+        print(
+            f"{size:>9} | {per_message_us(baseline_encode, messages, size):>12.3f} | "
+            f"{per_message_us(codec.encode_messages, messages, size):>12.3f} | "
+            f"{per_message_us(baseline_decode, data, size):>12.3f} | "
+            f"{per_message_us(codec.decode_messages, data, size):>12.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,34 @@
 import uuid
 from dataclasses import dataclass, field
-from typing import List
+from typing import Any, Dict, List, Optional
 
 from task._models.message import Message
+from task._utils.tokens import estimate_message_tokens
 
 
 @dataclass
 class Conversation:
     """
     Represents a conversation with a unique ID and a list of messages.
+
+    The encoded form and estimated token count of every message are cached as it is
+    added, so building a request for turn N only encodes the messages added since the
+    previous turn.
+    Entries replaced in `messages` are re-encoded automatically; a message changed
+    in place must be reported with invalidate().
     
     Attributes:
         id (str): Unique identifier for the conversation, generated automatically
         messages (list[Message]): List of messages in the conversation
+        _encoded (List[Dict[str, Any]]): Cached to_dict() of each message, in order
+        _tokens (List[int]): Cached token estimate of each message, in order
+        _sources (List[Optional[Message]]): Message each cached entry was encoded from, None once invalidated
     """
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     messages: List[Message] = field(default_factory=list)
+    _encoded: List[Dict[str, Any]] = field(default_factory=list, init=False, repr=False, compare=False)
+    _tokens: List[int] = field(default_factory=list, init=False, repr=False, compare=False)
+    _sources: List[Optional[Message]] = field(default_factory=list, init=False, repr=False, compare=False)
 
     def add_message(self, message: Message) -> None:
         """
@@ -34,4 +47,55 @@ class Conversation:
             List[Message]: List of messages in the conversation
         """
         return self.messages
-    
\ No newline at end of file
+
+    def invalidate(self, index: int) -> None:
+        """
+        Drop the cached encoding of a message that was changed in place.
+
+        Args:
+            index (int): Position of the changed message
+        """
+        if -len(self._sources) <= index < len(self._sources):
+            self._sources[index] = None
+
+    def _sync(self) -> None:
+        """
+        Bring the cached encodings and token counts in line with `messages`.
+
+        Cached entries are matched to messages by identity, so only new, replaced or
+        invalidated messages are encoded.
+        """
+        encoded, tokens, sources = self._encoded, self._tokens, self._sources
+        del encoded[len(self.messages):]
+        del tokens[len(self.messages):]
+        del sources[len(self.messages):]
+        for i, message in enumerate(self.messages):
+            if i == len(sources):
+                encoded.append(message.to_dict())
+                tokens.append(estimate_message_tokens(encoded[i]))
+                sources.append(message)
+            elif sources[i] is not message:
+                encoded[i] = message.to_dict()
+                tokens[i] = estimate_message_tokens(encoded[i])
+                sources[i] = message
+
+    def encoded_messages(self) -> List[Dict[str, Any]]:
+        """
+        Get the messages in request form, encoding only entries not cached yet.
+
+        Returns:
+            List[Dict[str, Any]]: to_dict() of every message, in order. The dictionaries
+            are shared with the cache and must not be modified
+        """
+        self._sync()
+        return list(self._encoded)
+
+    def token_counts(self) -> List[int]:
+        """
+        Get the estimated prompt tokens of every message, estimating only entries not cached yet.
+
+        Returns:
+            List[int]: Token estimate of every message, in order
+        """
+        self._sync()
+        return list(self._tokens)
@@ -1,8 +1,12 @@
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 
+ATTACHMENT_FIELDS = frozenset({"title", "data", "type", "url"})
+"""
+Keys of an attachment dictionary that map to Attachment fields.
+"""
 
-@dataclass
+@dataclass(slots=True)
 class Attachment:
     """
     Represents an attachment with optional title, data, type, and URL.
@@ -33,7 +37,7 @@ class Attachment:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class CustomContent:
     """
     Represents custom content with a list of attachments.
@@ -70,7 +74,7 @@ class CustomContent:
             if isinstance(attachment_data, list):
                 attachments = [
                     Attachment(**{k: v for k, v in attachment.items()
-                                  if k in ["title", "data", "type", "url"]})
+                                  if k in ATTACHMENT_FIELDS})
                     for attachment in attachment_data
                 ]
         return cls(attachments=attachments)
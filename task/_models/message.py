@@ -5,7 +5,7 @@ from task._models.custom_content import CustomContent
 from task._models.role import Role
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """
     Represents a message with a role, content, and optional custom content.
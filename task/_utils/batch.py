@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Generic, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_CONCURRENCY = 10
+"""
+Default number of requests a batch keeps in flight at once.
+"""
+
+
+@dataclass
+class BatchItemResult(Generic[R]):
+    """
+    Outcome of a single item in a batch run.
+
+    Attributes:
+        index (int): Position of the item in the batch input
+        result (Optional[R]): Result of the item, if it succeeded
+        error (Optional[BaseException]): Exception raised by the item, if it failed
+        latency (float): Time spent processing the item, in seconds
+    """
+    index: int
+    result: Optional[R] = None
+    error: Optional[BaseException] = None
+    latency: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """
+        Whether the item completed without an error.
+        """
+        return self.error is None
+
+
+@dataclass
+class BatchReport(Generic[R]):
+    """
+    Results and throughput statistics of a batch run.
+
+    Attributes:
+        results (List[BatchItemResult[R]]): Per-item results in input order
+        elapsed (float): Wall-clock duration of the batch, in seconds
+    """
+    results: List[BatchItemResult[R]] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def succeeded(self) -> int:
+        """
+        Number of items that completed successfully.
+        """
+        return sum(1 for item in self.results if item.ok)
+
+    @property
+    def failed(self) -> int:
+        """
+        Number of items that raised an error.
+        """
+        return len(self.results) - self.succeeded
+
+    @property
+    def throughput(self) -> float:
+        """
+        Completed items per second over the whole batch.
+        """
+        return len(self.results) / self.elapsed if self.elapsed > 0 else 0.0
+
+
+async def run_batch(
+    items: Sequence[T],
+    worker: Callable[[T], Awaitable[R]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> BatchReport[R]:
+    """
+    Run a worker over many items with a bounded pool of concurrent tasks.
+
+    A fixed number of worker tasks pull items from a shared queue, so the number of
+    tasks and requests in flight stays bounded by the concurrency. The result of every
+    item is kept for the report, so memory still grows with the batch size; stream
+    large inputs through execute_jsonl() instead. Errors are recorded per item instead
+    of cancelling the batch.
+
+    Args:
+        items (Sequence[T]): Items to process
+        worker (Callable[[T], Awaitable[R]]): Coroutine function applied to each item
+        concurrency (int): Maximum number of items processed at once
+
+    Returns:
+        BatchReport[R]: Per-item results in input order and throughput statistics
+
+    Raises:
+        ValueError: If concurrency is less than 1
+    """
+    if concurrency < 1:
+        raise ValueError("Concurrency must be at least 1")
+
+    results: List[Optional[BatchItemResult[R]]] = [None] * len(items)
+    queue: asyncio.Queue = asyncio.Queue()
+    for index, item in enumerate(items):
+        queue.put_nowait((index, item))
+
+    async def consume() -> None:
+        while True:
+            try:
+                index, item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started = time.perf_counter()
+            try:
+                result = await worker(item)
+                results[index] = BatchItemResult(index=index, result=result, latency=time.perf_counter() - started)
+            except Exception as e:
+                results[index] = BatchItemResult(index=index, error=e, latency=time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(consume() for _ in range(min(concurrency, len(items)))))
+    report = BatchReport(results=[item for item in results if item is not None], elapsed=time.perf_counter() - started)
+
+    logging.info(
+        "Batch finished: %d succeeded, %d failed in %.2fs (%.2f items/s)",
+        report.succeeded, report.failed, report.elapsed, report.throughput
+    )
+    return report
@@ -1,20 +1,262 @@
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass
 from io import BytesIO
-from typing import Any, Dict, Optional
+from pathlib import Path
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Optional, Tuple, Union
 
+import aiofiles
 import httpx
 
+DEFAULT_CHUNK_SIZE = 64 * 1024
+"""
+Default size in bytes of the chunks streamed to and from the bucket.
+"""
+
+DEFAULT_BUCKET_ID_TTL = 3600.0
+"""
+Default number of seconds a looked-up bucket ID is reused across clients.
+"""
+
+BUCKET_INVALIDATING_STATUSES = frozenset({403, 404})
+"""
+Upload response statuses that suggest the cached bucket ID is no longer valid.
+"""
+
+DEFAULT_MAX_RESUMES = 3
+"""
+Default number of times a broken download is resumed before giving up.
+"""
+
+PARTIAL_SUFFIX = ".part"
+"""
+Suffix of the file a download is written to until it completes.
+"""
+
+VALIDATOR_SUFFIX = ".validator"
+"""
+Suffix of the file next to a partial download holding the ETag or Last-Modified it was fetched with.
+"""
+
+FileContent = Union[BytesIO, str, os.PathLike, AsyncIterable[bytes]]
+"""
+Content accepted by put_file: an in-memory buffer, a path on disk or an async byte iterator.
+"""
+
+
+class BucketIdCache:
+    """
+    Process-wide cache of bucket IDs shared by all DialBucketClient instances.
+
+    Entries are keyed by the service URL and a hash of the API key, so the key
+    itself is never stored. The cache is safe to use from several threads and
+    event loops.
+
+    Attributes:
+        ttl (float): Seconds an entry stays valid
+    """
+
+    def __init__(self, ttl: float = DEFAULT_BUCKET_ID_TTL):
+        """
+        Initialize an empty cache.
+
+        Args:
+            ttl (float): Seconds an entry stays valid
+        """
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(base_url: str, api_key: str) -> Tuple[str, str]:
+        """
+        Build the cache key for a service URL and API key.
+
+        Args:
+            base_url (str): Base URL of the DIAL service
+            api_key (str): API key for authentication
+
+        Returns:
+            Tuple[str, str]: The base URL and the SHA-256 of the API key
+        """
+        return base_url, hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+    def get(self, key: Tuple[str, str]) -> Optional[str]:
+        """
+        Look up a bucket ID.
+
+        Args:
+            key (Tuple[str, str]): Cache key from BucketIdCache.key()
+
+        Returns:
+            Optional[str]: The bucket ID, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            bucket_id, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return bucket_id
+
+    def set(self, key: Tuple[str, str], bucket_id: str) -> None:
+        """
+        Store a bucket ID.
+
+        Args:
+            key (Tuple[str, str]): Cache key from BucketIdCache.key()
+            bucket_id (str): The bucket ID
+        """
+        with self._lock:
+            self._entries[key] = (bucket_id, time.monotonic() + self.ttl)
+
+    def invalidate(self, key: Tuple[str, str]) -> None:
+        """
+        Drop a bucket ID so the next lookup asks the service again.
+
+        Args:
+            key (Tuple[str, str]): Cache key from BucketIdCache.key()
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Drop all bucket IDs.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+bucket_id_cache = BucketIdCache()
+"""
+Bucket ID cache shared by all DialBucketClient instances in the process.
+"""
+
+
+@dataclass
+class DownloadResult:
+    """
+    Summary of a completed download.
+
+    Attributes:
+        path (Path): Location of the downloaded file
+        bytes_written (int): Bytes received during this call, excluding data resumed from an earlier partial file
+        size (int): Final size of the file in bytes
+        elapsed (float): Duration of the download in seconds
+        resumes (int): Number of times the transfer was resumed or restarted after breaking
+    """
+    path: Path
+    bytes_written: int
+    size: int
+    elapsed: float
+    resumes: int = 0
+
+    @property
+    def bytes_per_second(self) -> float:
+        """
+        Average transfer rate of the bytes received during this call.
+        """
+        return self.bytes_written / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _parse_content_range(value: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Parse a `Content-Range: bytes <start>-<end>/<total>` header.
+
+    Args:
+        value (Optional[str]): Header value, if present
+
+    Returns:
+        Tuple[Optional[int], Optional[int]]: First byte offset and total size, None where unknown
+    """
+    if not value or not value.startswith("bytes "):
+        return None, None
+    byte_range, _, total = value[len("bytes "):].partition("/")
+    start = byte_range.partition("-")[0]
+    return (
+        int(start) if start.isdigit() else None,
+        int(total) if total.isdigit() else None,
+    )
+
+
+def _expected_size(response: httpx.Response, offset: int) -> Optional[int]:
+    """
+    Final file size announced by a download response.
+
+    Args:
+        response (httpx.Response): Response to a full or ranged GET
+        offset (int): Bytes already on disk before the response body
+
+    Returns:
+        Optional[int]: Expected size of the complete file, None if the response does not say
+    """
+    if response.status_code == 206:
+        return _parse_content_range(response.headers.get("content-range"))[1]
+    length = response.headers.get("content-length")
+    if length is None or response.headers.get("content-encoding"):
+        return None
+    return offset + int(length)
+
+
+async def _iter_file(path: Union[str, os.PathLike], chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Read a file from disk in chunks without blocking the event loop.
+
+    Args:
+        path (Union[str, os.PathLike]): Path of the file
+        chunk_size (int): Size of each chunk in bytes
+
+    Yields:
+        bytes: Consecutive chunks of the file
+    """
+    async with aiofiles.open(path, "rb") as file:
+        while chunk := await file.read(chunk_size):
+            yield chunk
+
+
+def _multipart_envelope(field_name: str, mime_type: str) -> Tuple[str, bytes, bytes]:
+    """
+    Build the parts of a single-file multipart/form-data body that surround the file bytes.
+
+    Args:
+        field_name (str): Form field and file name
+        mime_type (str): MIME type of the file
+
+    Returns:
+        Tuple[str, bytes, bytes]: Content-Type header value, bytes before the file and bytes after it
+    """
+    boundary = uuid.uuid4().hex
+    quoted_name = field_name.replace('"', "%22")
+    head = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{quoted_name}"; filename="{quoted_name}"\r\n'
+        f"Content-Type: {mime_type}\r\n\r\n"
+    ).encode("utf-8")
+    tail = f"\r\n--{boundary}--\r\n".encode("utf-8")
+    return f"multipart/form-data; boundary={boundary}", head, tail
+
 
 class DialBucketClient:
     """
     Async client for interacting with DIAL bucket storage service.
     
     This client provides methods to upload and download files from a DIAL bucket.
-    It should be used as an async context manager.
+    It should be used as an async context manager. The bucket ID is looked up once
+    per process and shared through bucket_id_cache.
     
     Attributes:
         api_key (str): API key for authentication
         base_url (str): Base URL of the DIAL service
         _bucket_id (Optional[str]): Cached bucket ID
+        _bucket_lock (asyncio.Lock): Serializes the bucket lookup between concurrent uploads
         _client (Optional[httpx.AsyncClient]): HTTP client instance
     """
     def __init__(self, api_key: str , base_url: str):
@@ -28,6 +270,7 @@ class DialBucketClient:
         self.api_key = api_key
         self.base_url = base_url
         self._bucket_id: Optional[str] = None
+        self._bucket_lock = asyncio.Lock()
         self._client: Optional[httpx.AsyncClient] = None
 
     async def __aenter__(self):
@@ -64,7 +307,9 @@ class DialBucketClient:
         """
         Get the bucket ID from the DIAL service.
         
-        Fetches the bucket ID from the service if not already cached.
+        Uses the process-wide bucket_id_cache and fetches the bucket ID from the
+        service only on a miss. Concurrent callers wait for a single lookup instead
+        of each sending their own.
         
         Returns:
             str: The bucket ID
@@ -74,49 +319,106 @@ class DialBucketClient:
             ValueError: If no appdata or bucket is found in response
         """
         if not self._bucket_id:
-            if self._client is None:
-                raise RuntimeError("Client not initialized. Use as context manager.")
-            response = await self._client.get('/v1/bucket')
-            response.raise_for_status()
+            async with self._bucket_lock:
+                if not self._bucket_id:
+                    self._bucket_id = bucket_id_cache.get(BucketIdCache.key(self.base_url, self.api_key))
+                if not self._bucket_id:
+                    if self._client is None:
+                        raise RuntimeError("Client not initialized. Use as context manager.")
+                    response = await self._client.get('/v1/bucket')
+                    response.raise_for_status()
 
-            bucket_json = response.json()
-            if "appdata" in bucket_json:
-                self._bucket_id = bucket_json["appdata"]
-            elif "bucket" in bucket_json:
-                self._bucket_id = bucket_json["bucket"]
-            else:
-                raise ValueError("No appdata or bucket found")
+                    bucket_json = response.json()
+                    if "appdata" in bucket_json:
+                        self._bucket_id = bucket_json["appdata"]
+                    elif "bucket" in bucket_json:
+                        self._bucket_id = bucket_json["bucket"]
+                    else:
+                        raise ValueError("No appdata or bucket found")
+                    bucket_id_cache.set(BucketIdCache.key(self.base_url, self.api_key), self._bucket_id)
 
         if self._bucket_id is None:
             raise RuntimeError("Bucket ID could not be determined")
         return self._bucket_id
 
+    async def get_bucket_id(self) -> str:
+        """
+        Get the ID of the bucket this client uploads to.
+
+        The ID is looked up once and shared with other clients of the same service
+        and API key through bucket_id_cache.
+
+        Returns:
+            str: The bucket ID
+
+        Raises:
+            RuntimeError: If the client is not initialized and the ID is not cached
+            ValueError: If no appdata or bucket is found in the lookup response
+        """
+        return await self._get_bucket()
+
+    def invalidate_bucket(self) -> None:
+        """
+        Forget the bucket ID on this client and in the process-wide cache.
+        """
+        self._bucket_id = None
+        bucket_id_cache.invalidate(BucketIdCache.key(self.base_url, self.api_key))
+
 
     async def put_file(
-        self, name: str, mime_type: str, content: BytesIO
+        self, name: str, mime_type: str, content: FileContent, chunk_size: int = DEFAULT_CHUNK_SIZE
     ) -> Dict[str, Any]:
         """
         Upload a file to the DIAL bucket.
+
+        A path or an async byte iterator is streamed as the multipart body in chunks,
+        so memory use does not grow with the file size. A path also lets the body be
+        sent with a Content-Length instead of chunked encoding.
         
         Args:
             name (str): Name of the file
             mime_type (str): MIME type of the file
-            content (BytesIO): File content as BytesIO object
+            content (FileContent): File content as a BytesIO object, a path on disk or an async byte iterator
+            chunk_size (int): Size of the chunks read from a path
             
         Returns:
             Dict[str, Any]: Response from the upload operation
             
         Raises:
             RuntimeError: If the client is not initialized
+            httpx.HTTPStatusError: If the upload fails; on 403 or 404 the cached bucket ID is dropped first
         """
         path = await self._get_bucket()
 
         if self._client is None:
             raise RuntimeError("Client not initialized. Use as context manager.")
-        response = await self._client.put(
-            f"/v1/files/{path}/{name}",
-            files={name: (name, content, mime_type)},
-        )
+        if isinstance(content, BytesIO):
+            response = await self._client.put(
+                f"/v1/files/{path}/{name}",
+                files={name: (name, content, mime_type)},
+            )
+        else:
+            content_type, head, tail = _multipart_envelope(name, mime_type)
+            headers = {"Content-Type": content_type}
+            if isinstance(content, (str, os.PathLike)):
+                headers["Content-Length"] = str(len(head) + os.path.getsize(content) + len(tail))
+                source = _iter_file(content, chunk_size)
+            else:
+                source = content
+
+            async def body() -> AsyncIterator[bytes]:
+                yield head
+                async for chunk in source:
+                    yield chunk
+                yield tail
+
+            response = await self._client.put(
+                f"/v1/files/{path}/{name}",
+                content=body(),
+                headers=headers,
+            )
+        if response.status_code in BUCKET_INVALIDATING_STATUSES:
+            self.invalidate_bucket()
         response.raise_for_status()
         return response.json()
 
@@ -139,3 +441,136 @@ class DialBucketClient:
         response.raise_for_status()
         return response.content
 
+    async def file_exists(self, url: str) -> bool:
+        """
+        Check whether a file is still present in the DIAL service.
+
+        Args:
+            url (str): URL of the file
+
+        Returns:
+            bool: True if the file exists, False if the service reports it missing
+
+        Raises:
+            RuntimeError: If the client is not initialized
+        """
+        if self._client is None:
+            raise RuntimeError("Client not initialized. Use as context manager.")
+        response = await self._client.head(f"/v1/{url}")
+        if response.status_code == 404:
+            return False
+        response.raise_for_status()
+        return True
+
+    async def iter_file(self, url: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """
+        Stream a file from the DIAL service in chunks.
+
+        Args:
+            url (str): URL of the file to download
+            chunk_size (int): Size of each chunk in bytes
+
+        Yields:
+            bytes: Consecutive chunks of the file
+
+        Raises:
+            RuntimeError: If the client is not initialized
+        """
+        if self._client is None:
+            raise RuntimeError("Client not initialized. Use as context manager.")
+        async with self._client.stream("GET", f"/v1/{url}") as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(chunk_size):
+                yield chunk
+
+    async def download_to(
+        self,
+        url: str,
+        path: Union[str, os.PathLike],
+        max_resumes: int = DEFAULT_MAX_RESUMES,
+    ) -> DownloadResult:
+        """
+        Stream a file from the DIAL service straight to disk.
+
+        Chunks are written as they arrive to `<path>.part`, which is renamed once
+        complete. If the transfer breaks, or a `.part` file is left from an earlier
+        attempt, the download continues from the bytes already on disk using an HTTP
+        Range request guarded by If-Range, so a file changed on the service is
+        fetched again in full. The final size is checked against Content-Length or
+        Content-Range, and a mismatching file is downloaded again from the start.
+
+        Args:
+            url (str): URL of the file to download
+            path (Union[str, os.PathLike]): Destination file
+            max_resumes (int): Number of times a broken transfer is resumed or restarted before giving up
+
+        Returns:
+            DownloadResult: Size, duration and transfer rate of the download
+
+        Raises:
+            RuntimeError: If the client is not initialized
+            httpx.TransportError: If the transfer keeps breaking after max_resumes resumes
+        """
+        if self._client is None:
+            raise RuntimeError("Client not initialized. Use as context manager.")
+
+        destination = Path(path)
+        partial = destination.with_name(destination.name + PARTIAL_SUFFIX)
+        validator_path = partial.with_name(partial.name + VALIDATOR_SUFFIX)
+        validator = None
+        if partial.exists() and validator_path.exists():
+            async with aiofiles.open(validator_path, "r") as file:
+                validator = (await file.read()).strip() or None
+        offset = partial.stat().st_size if validator else 0
+        written = 0
+        resumes = 0
+        started = time.perf_counter()
+
+        while True:
+            headers = {}
+            if offset:
+                headers["Range"] = f"bytes={offset}-"
+                if validator:
+                    headers["If-Range"] = validator
+            try:
+                async with self._client.stream("GET", f"/v1/{url}", headers=headers) as response:
+                    if offset and response.status_code == 416:
+                        expected = _parse_content_range(response.headers.get("content-range"))[1]
+                    else:
+                        response.raise_for_status()
+                        if not offset or response.status_code != 206 or (
+                            _parse_content_range(response.headers.get("content-range"))[0] != offset
+                        ):
+                            offset = 0
+                            validator = response.headers.get("etag") or response.headers.get("last-modified")
+                            async with aiofiles.open(validator_path, "w") as file:
+                                await file.write(validator or "")
+                        expected = _expected_size(response, offset)
+                        async with aiofiles.open(partial, "ab" if offset else "wb") as file:
+                            async for chunk in response.aiter_bytes():
+                                await file.write(chunk)
+                                offset += len(chunk)
+                                written += len(chunk)
+                if expected == offset or (expected is None and response.status_code != 416):
+                    break
+                error = httpx.RemoteProtocolError(f"Download of {url} has {offset} bytes, expected {expected}")
+                offset = 0
+                validator = None
+            except httpx.TransportError as transport_error:
+                error = transport_error
+            if resumes >= max_resumes:
+                raise error
+            resumes += 1
+            logging.warning(f"Download of {url} interrupted, resuming from {offset} bytes ({resumes}/{max_resumes}): {error}")
+
+        os.replace(partial, destination)
+        validator_path.unlink(missing_ok=True)
+        result = DownloadResult(
+            path=destination,
+            bytes_written=written,
+            size=offset,
+            elapsed=time.perf_counter() - started,
+            resumes=resumes,
+        )
+        logging.info(f"Downloaded {url} to {destination}: {result.size} bytes at {result.bytes_per_second:.0f} B/s")
+        return result
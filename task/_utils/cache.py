@@ -0,0 +1,219 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Protocol, Tuple, Union
+
+from task._models.message import Message
+from task._utils.data_url import DataUrl
+
+DEFAULT_MAX_ENTRIES = 1024
+"""
+Default number of responses kept by the in-memory completion cache.
+"""
+
+
+def completion_cache_key(endpoint: str, request_data: Dict[str, Any]) -> str:
+    """
+    Build a content-addressed key for a completion request.
+
+    The key is a SHA-256 hash of the endpoint and a canonical JSON encoding of the
+    request body, so requests that differ only in key order share a key. Lazily
+    encoded data URLs are represented by the hash of their content.
+
+    Args:
+        endpoint (str): The API endpoint of the deployment
+        request_data (Dict[str, Any]): Request body
+
+    Returns:
+        str: Hex digest identifying the request
+    """
+    canonical = json.dumps(
+        {"endpoint": endpoint, "body": request_data},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_canonical_default,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _canonical_default(value: Any) -> str:
+    if isinstance(value, DataUrl):
+        return f"data-url:{value.digest}"
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class CompletionCache(Protocol):
+    """
+    Storage for completion responses keyed by completion_cache_key().
+    """
+
+    def get(self, key: str) -> Optional[Message]:
+        """
+        Look up a cached response.
+
+        Args:
+            key (str): Request key
+
+        Returns:
+            Optional[Message]: The cached message, or None on a miss or expired entry
+        """
+        ...
+
+    def set(self, key: str, message: Message) -> None:
+        """
+        Store a response.
+
+        Args:
+            key (str): Request key
+            message (Message): Response message to cache
+        """
+        ...
+
+
+class MemoryCompletionCache:
+    """
+    In-process LRU completion cache with optional TTL and size limit.
+
+    Attributes:
+        max_entries (int): Maximum number of cached responses
+        max_bytes (Optional[int]): Maximum total size of cached responses, if limited
+        ttl (Optional[float]): Seconds a response stays valid, if limited
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: Optional[int] = None, ttl: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Maximum number of cached responses
+            max_bytes (Optional[int]): Maximum total size of cached responses in bytes
+            ttl (Optional[float]): Seconds a response stays valid; None keeps responses until evicted
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[Optional[float], str]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Message]:
+        with self._lock:
+            if (entry := self._entries.get(key)) is None:
+                return None
+            expires_at, payload = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+        return Message.from_dict(json.loads(payload))
+
+    def set(self, key: str, message: Message) -> None:
+        payload = json.dumps(message.to_dict())
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, payload)
+            self._size += len(payload)
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self._size > self.max_bytes)
+            ):
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        _, payload = self._entries.pop(key)
+        self._size -= len(payload)
+
+
+class SQLiteCompletionCache:
+    """
+    On-disk completion cache backed by SQLite, with optional TTL and size limit.
+
+    Entries are evicted least-recently-used first once the total stored size
+    exceeds max_bytes. The cache is safe to share between threads.
+
+    Attributes:
+        path (Path): Location of the database file
+        max_bytes (Optional[int]): Maximum total size of cached responses, if limited
+        ttl (Optional[float]): Seconds a response stays valid, if limited
+    """
+
+    def __init__(self, path: Union[str, Path], max_bytes: Optional[int] = None, ttl: Optional[float] = None):
+        """
+        Initialize the cache, creating the database if needed.
+
+        Args:
+            path (Union[str, Path]): Location of the database file
+            max_bytes (Optional[int]): Maximum total size of cached responses in bytes
+            ttl (Optional[float]): Seconds a response stays valid; None keeps responses until evicted
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS completions ("
+            "key TEXT PRIMARY KEY, payload TEXT NOT NULL, size INTEGER NOT NULL, "
+            "expires_at REAL, accessed_at REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS completions_accessed ON completions (accessed_at)")
+        self._connection.commit()
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def get(self, key: str) -> Optional[Message]:
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT payload, expires_at FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            payload, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._connection.execute("DELETE FROM completions WHERE key = ?", (key,))
+                self._connection.commit()
+                return None
+            self._connection.execute("UPDATE completions SET accessed_at = ? WHERE key = ?", (now, key))
+            self._connection.commit()
+        return Message.from_dict(json.loads(payload))
+
+    def set(self, key: str, message: Message) -> None:
+        payload = json.dumps(message.to_dict())
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO completions (key, payload, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), expires_at, now),
+            )
+            self._connection.execute("DELETE FROM completions WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+            if self.max_bytes is not None:
+                self._evict(self.max_bytes)
+            self._connection.commit()
+
+    def _evict(self, max_bytes: int) -> None:
+        (total,) = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM completions").fetchone()
+        if total <= max_bytes:
+            return
+        rows = self._connection.execute("SELECT key, size FROM completions ORDER BY accessed_at, rowid").fetchall()
+        for key, size in rows:
+            if total <= max_bytes:
+                break
+            self._connection.execute("DELETE FROM completions WHERE key = ?", (key,))
+            total -= size
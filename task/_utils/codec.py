@@ -0,0 +1,103 @@
+import json
+from typing import Any, List, Sequence, Union
+
+from task._models.message import Message
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+FAST_JSON = orjson is not None
+"""
+Whether the orjson encoder is installed and used. Without it the standard library
+json module is used with compact separators.
+"""
+
+
+def _default(value: Any) -> Any:
+    """
+    Encode a model the standard library encoder does not support through its to_dict().
+
+    Args:
+        value (Any): Object that is not natively JSON serializable
+
+    Returns:
+        Any: JSON-compatible representation of the object
+
+    Raises:
+        TypeError: If the object has no to_dict() method
+    """
+    to_dict = getattr(value, "to_dict", None)
+    if to_dict is None:
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+    return to_dict()
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Encode a JSON-compatible value to compact UTF-8 JSON.
+
+    Dataclass models such as Message are encoded through their to_dict() by both
+    encoders, so optional fields are omitted exactly as to_dict() omits them.
+
+    Args:
+        value (Any): Value built from dicts, lists, strings, numbers, booleans, None and models
+
+    Returns:
+        bytes: Encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_PASSTHROUGH_DATACLASS)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Decode JSON text.
+
+    Args:
+        data (Union[bytes, str]): Encoded JSON
+
+    Returns:
+        Any: Decoded value
+
+    Raises:
+        json.JSONDecodeError: If the data is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def encode_messages(messages: Sequence[Message]) -> bytes:
+    """
+    Encode messages to a JSON array in one call to the encoder.
+
+    The output is the same with either encoder: each message is written as its
+    to_dict() representation.
+
+    Args:
+        messages (Sequence[Message]): Messages to encode
+
+    Returns:
+        bytes: Encoded JSON array of message objects
+    """
+    return dumps(list(messages))
+
+
+def decode_messages(data: Union[bytes, str]) -> List[Message]:
+    """
+    Decode a JSON array of message objects.
+
+    Args:
+        data (Union[bytes, str]): Encoded JSON array
+
+    Returns:
+        List[Message]: Decoded messages
+
+    Raises:
+        json.JSONDecodeError: If the data is not valid JSON
+    """
+    from_dict = Message.from_dict
+    return [from_dict(item) for item in loads(data)]
@@ -0,0 +1,317 @@
+import asyncio
+import inspect
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from task._models.conversation import Conversation
+from task._models.message import Message
+from task._models.role import Role
+
+DEPLOYMENT_CONTEXT_WINDOWS = {
+    "gpt-4": 8_192,
+    "gpt-4o": 128_000,
+    "gpt-4o-2024-05-13": 128_000,
+    "gpt-4o-2024-08-06": 128_000,
+    "gpt-4o-2024-11-20": 128_000,
+    "gpt-4o-mini-2024-07-18": 128_000,
+    "text-embedding-ada-002": 8_191,
+    "text-embedding-3-small-1": 8_191,
+    "anthropic.claude-v3-opus": 200_000,
+    "anthropic.claude-v3-5-sonnet-v1": 200_000,
+    "anthropic.claude-v3-5-sonnet": 200_000,
+    "anthropic.claude-v3-5-haiku": 200_000,
+    "anthropic.claude-v3-haiku": 200_000,
+    "anthropic.claude-3-7-sonnet-20250219-v1:0": 200_000,
+    "deepseek.r1-v1:0": 128_000,
+    "gemini-2.0-flash-lite": 1_048_576,
+    "gemini-2.0-flash": 1_048_576,
+    "claude-3-5-haiku@20241022": 200_000,
+    "claude-3-5-sonnet-v2@latest": 200_000,
+    "claude-3-7-sonnet@20250219": 200_000,
+}
+"""
+Context window, in tokens, of every deployment listed in available_models.txt.
+"""
+
+DEFAULT_CONTEXT_WINDOW = 8_192
+"""
+Context window assumed for deployments missing from DEPLOYMENT_CONTEXT_WINDOWS.
+"""
+
+DEFAULT_RESPONSE_TOKENS = 1_024
+"""
+Default number of tokens kept free in the window for the model's response.
+"""
+
+DEFAULT_SUMMARY_TOKENS = 512
+"""
+Default number of tokens reserved for the summary of dropped turns.
+"""
+
+DEFAULT_MAX_SUMMARIES = 256
+"""
+Default number of conversation summaries kept before the least recently used is evicted.
+"""
+
+MESSAGE_OVERHEAD_TOKENS = 4
+"""
+Tokens each message costs beyond its content, for role and separators.
+"""
+
+Summarizer = Callable[[List[Message]], Union[Message, Awaitable[Message]]]
+"""
+Turns dropped messages into one summary message; either a plain function or a coroutine function.
+"""
+
+Covered = Tuple[Tuple[int, Dict[str, Any]], ...]
+"""
+Index and encoded form of every dropped message a summary was built from.
+"""
+
+
+def context_window(deployment_name: str) -> int:
+    """
+    Look up the context window of a deployment.
+
+    Args:
+        deployment_name (str): Name of the model deployment
+
+    Returns:
+        int: Window size in tokens, or DEFAULT_CONTEXT_WINDOW for unknown deployments
+    """
+    return DEPLOYMENT_CONTEXT_WINDOWS.get(deployment_name, DEFAULT_CONTEXT_WINDOW)
+
+
+class ContextWindow:
+    """
+    Fits a conversation into a deployment's context window.
+
+    System messages and the latest user turn (the last user message and everything
+    after it) are always kept. Older turns are kept newest first while they fit the
+    budget; the rest are dropped, or replaced by a single summary message when a
+    summarizer is configured. Token counts come from the conversation's per-message cache.
+
+    An asynchronous summarizer is only usable through encoded_messages_async(), which
+    is what the async client calls; a synchronous one is run there in a worker thread
+    so it does not block the event loop.
+
+    Attributes:
+        budget (int): Prompt tokens available for the conversation with the default response reservation
+        response_tokens (int): Tokens kept free for the response unless the request sets max_tokens
+        summary_tokens (int): Tokens reserved for the summary of dropped turns, 0 without a summarizer
+        _summarizer (Optional[Summarizer]): Turns dropped messages into a summary
+        _summaries (OrderedDict[str, Tuple[Covered, Message]]): Last summary per conversation and
+            the messages it covers, least recently used first
+        _max_summaries (int): Number of summaries kept
+    """
+
+    def __init__(
+        self,
+        deployment_name: str,
+        max_context_tokens: Optional[int] = None,
+        response_tokens: int = DEFAULT_RESPONSE_TOKENS,
+        summarizer: Optional[Summarizer] = None,
+        summary_tokens: int = DEFAULT_SUMMARY_TOKENS,
+        max_summaries: int = DEFAULT_MAX_SUMMARIES,
+    ):
+        """
+        Initialize the context window.
+
+        Args:
+            deployment_name (str): Name of the model deployment, used to look up its window
+            max_context_tokens (Optional[int]): Token budget to use instead of the deployment's window
+            response_tokens (int): Tokens kept free for the model's response
+            summarizer (Optional[Summarizer]): Builds one message summarizing dropped turns; may be
+                a coroutine function. Dropped turns are discarded when omitted
+            summary_tokens (int): Tokens reserved for the summary when a summarizer is set
+            max_summaries (int): Number of conversation summaries kept before the least recently used is evicted
+        """
+        window = max_context_tokens if max_context_tokens is not None else context_window(deployment_name)
+        self.summary_tokens = summary_tokens if summarizer else 0
+        self.budget = window - response_tokens - self.summary_tokens
+        self.response_tokens = response_tokens
+        self._summarizer = summarizer
+        self._summaries: "OrderedDict[str, Tuple[Covered, Message]]" = OrderedDict()
+        self._max_summaries = max_summaries
+
+    def _budget(self, max_tokens: Optional[int]) -> int:
+        """
+        Prompt tokens available when the response is limited to `max_tokens`.
+
+        Args:
+            max_tokens (Optional[int]): max_tokens of the request, if set
+
+        Returns:
+            int: Budget with max_tokens reserved for the response instead of response_tokens
+        """
+        if max_tokens is None:
+            return self.budget
+        return self.budget + self.response_tokens - max_tokens
+
+    def select(self, conversation: Conversation, max_tokens: Optional[int] = None) -> Tuple[List[int], List[int]]:
+        """
+        Choose which messages of a conversation fit the budget.
+
+        Args:
+            conversation (Conversation): Conversation to fit
+            max_tokens (Optional[int]): max_tokens of the request, reserved for the response when set
+
+        Returns:
+            Tuple[List[int], List[int]]: Indices of kept messages and of dropped messages, both in order
+        """
+        budget = self._budget(max_tokens)
+        messages = conversation.messages
+        counts = conversation.token_counts()
+        last_user = next((i for i in range(len(messages) - 1, -1, -1) if messages[i].role == Role.USER), len(messages))
+
+        required = [i for i in range(last_user) if messages[i].role == Role.SYSTEM] + list(range(last_user, len(messages)))
+        used = sum(counts[i] + MESSAGE_OVERHEAD_TOKENS for i in required)
+        if used > budget:
+            logging.warning(f"System messages and the latest turn need {used} tokens, over the budget of {budget}")
+
+        optional = [i for i in range(last_user - 1, -1, -1) if messages[i].role != Role.SYSTEM]
+        kept = 0
+        for i in optional:
+            cost = counts[i] + MESSAGE_OVERHEAD_TOKENS
+            if used + cost > budget:
+                break
+            used += cost
+            kept += 1
+
+        return sorted(required + optional[:kept]), sorted(optional[kept:])
+
+    def _cached_summary(self, conversation: Conversation, dropped: List[int]) -> Tuple[Covered, Optional[Message]]:
+        """
+        Look up the summary of dropped messages built by an earlier request.
+
+        Summaries are matched on the index and encoded content of every dropped message,
+        so a message replaced or changed since then invalidates the summary.
+
+        Args:
+            conversation (Conversation): Conversation the messages belong to
+            dropped (List[int]): Indices of dropped messages
+
+        Returns:
+            Tuple[Covered, Optional[Message]]: Key of the dropped messages, and their cached
+            summary or None if it has to be built
+        """
+        encoded = conversation.encoded_messages()
+        covered = tuple((i, encoded[i]) for i in dropped)
+        cached = self._summaries.get(conversation.id)
+        if cached is None or cached[0] != covered:
+            return covered, None
+        self._summaries.move_to_end(conversation.id)
+        return covered, cached[1]
+
+    def _store_summary(self, conversation: Conversation, covered: Covered, summary: Message) -> None:
+        """
+        Keep a new summary, evicting the least recently used ones over the limit.
+
+        Args:
+            conversation (Conversation): Conversation the summary belongs to
+            covered (Covered): Key of the dropped messages the summary was built from
+            summary (Message): Summary message
+        """
+        self._summaries[conversation.id] = (covered, summary)
+        self._summaries.move_to_end(conversation.id)
+        while len(self._summaries) > self._max_summaries:
+            self._summaries.popitem(last=False)
+
+    def _assemble(
+        self, conversation: Conversation, kept: List[int], dropped: List[int], summary: Optional[Message]
+    ) -> List[Dict[str, Any]]:
+        """
+        Build the encoded messages to send from a selection.
+
+        Args:
+            conversation (Conversation): Conversation the messages belong to
+            kept (List[int]): Indices of kept messages
+            dropped (List[int]): Indices of dropped messages
+            summary (Optional[Message]): Summary of the dropped messages, if any
+
+        Returns:
+            List[Dict[str, Any]]: Kept messages, with the summary placed before the oldest kept turn
+        """
+        encoded = conversation.encoded_messages()
+        result = [encoded[i] for i in kept]
+        if summary is not None:
+            position = next((n for n, i in enumerate(kept) if i > dropped[0]), len(kept))
+            result.insert(position, summary.to_dict())
+        return result
+
+    def encoded_messages(self, conversation: Conversation, max_tokens: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the conversation in request form, trimmed to the budget.
+
+        Args:
+            conversation (Conversation): Conversation to fit
+            max_tokens (Optional[int]): max_tokens of the request, reserved for the response when set
+
+        Returns:
+            List[Dict[str, Any]]: Encoded messages to send, with the summary of dropped
+            turns placed before the oldest kept turn
+
+        Raises:
+            TypeError: If a summary has to be built and the summarizer is asynchronous
+        """
+        kept, dropped = self.select(conversation, max_tokens)
+        summary = None
+        if self._summarizer is not None and dropped:
+            covered, summary = self._cached_summary(conversation, dropped)
+            if summary is None:
+                if inspect.iscoroutinefunction(self._summarizer):
+                    raise TypeError("The summarizer is asynchronous; use encoded_messages_async()")
+                summary = self._summarizer([conversation.messages[i] for i in dropped])
+                self._store_summary(conversation, covered, summary)
+        return self._assemble(conversation, kept, dropped, summary)
+
+    async def encoded_messages_async(
+        self, conversation: Conversation, max_tokens: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the conversation in request form, trimmed to the budget, without blocking the event loop.
+
+        An asynchronous summarizer is awaited; a synchronous one runs in a worker thread.
+
+        Args:
+            conversation (Conversation): Conversation to fit
+            max_tokens (Optional[int]): max_tokens of the request, reserved for the response when set
+
+        Returns:
+            List[Dict[str, Any]]: Encoded messages to send, with the summary of dropped
+            turns placed before the oldest kept turn
+        """
+        kept, dropped = self.select(conversation, max_tokens)
+        summary = None
+        if self._summarizer is not None and dropped:
+            covered, summary = self._cached_summary(conversation, dropped)
+            if summary is None:
+                messages = [conversation.messages[i] for i in dropped]
+                if inspect.iscoroutinefunction(self._summarizer):
+                    summary = await self._summarizer(messages)
+                else:
+                    summary = await asyncio.to_thread(self._summarizer, messages)
+                self._store_summary(conversation, covered, summary)
+        return self._assemble(conversation, kept, dropped, summary)
+
+    def tokens(self, conversation: Conversation, max_tokens: Optional[int] = None) -> int:
+        """
+        Estimate the prompt tokens of the trimmed conversation.
+
+        The summarizer is never called: a summary of dropped turns is counted at its
+        reserved size.
+
+        Args:
+            conversation (Conversation): Conversation to fit
+            max_tokens (Optional[int]): max_tokens of the request, reserved for the response when set
+
+        Returns:
+            int: Estimated prompt tokens of the messages that would be sent
+        """
+        kept, dropped = self.select(conversation, max_tokens)
+        counts = conversation.token_counts()
+        used = sum(counts[i] + MESSAGE_OVERHEAD_TOKENS for i in kept)
+        if self._summarizer is not None and dropped:
+            used += self.summary_tokens + MESSAGE_OVERHEAD_TOKENS
+        return used
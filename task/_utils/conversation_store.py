@@ -0,0 +1,535 @@
+import logging
+import mmap
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from task._models.conversation import Conversation
+from task._models.message import Message
+from task._utils import codec
+from task._utils.metrics import metrics
+
+DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024
+"""
+Default size in bytes after which the active log segment is sealed and a new one started.
+"""
+
+DEFAULT_COMPACTION_INTERVAL = 60.0
+"""
+Default number of seconds between background compaction checks.
+"""
+
+DEFAULT_MIN_GARBAGE_RATIO = 0.5
+"""
+Default garbage ratio from which background compaction rewrites the sealed segments.
+"""
+
+SEGMENT_SUFFIX = ".log"
+TEMPORARY_SUFFIX = ".tmp"
+INDEX_FILE_NAME = "index.json"
+
+
+class RecordLocation(NamedTuple):
+    """
+    Position of one log record holding messages of a conversation.
+
+    Attributes:
+        seq (int): Store-wide sequence number of the record; later records have higher numbers
+        segment (int): Number of the segment the record is in
+        offset (int): Byte offset of the record in the segment
+        length (int): Length of the record in bytes, including the trailing newline
+        count (int): Number of messages in the record
+    """
+    seq: int
+    segment: int
+    offset: int
+    length: int
+    count: int
+
+
+def _encode_record(seq: int, conversation_id: str, messages: bytes) -> bytes:
+    """
+    Build one log line appending messages to a conversation.
+
+    Args:
+        seq (int): Sequence number of the record
+        conversation_id (str): Conversation the messages belong to
+        messages (bytes): Encoded JSON array of message objects
+
+    Returns:
+        bytes: Newline-terminated JSON record
+    """
+    return b'{"seq":%d,"id":%s,"messages":%s}\n' % (seq, codec.dumps(conversation_id), messages)
+
+
+class _Segment:
+    """
+    One file of the log. Records are appended through a file handle and read
+    through a memory map that is extended when the file has grown.
+
+    Attributes:
+        number (int): Segment number, unique within the store
+        path (Path): Current location of the file
+        size (int): Bytes written to the file
+    """
+
+    def __init__(self, number: int, path: Path, size: int):
+        self.number = number
+        self.path = path
+        self.size = size
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+
+    def append(self, data: bytes, sync: bool = False) -> int:
+        """
+        Write a record at the end of the segment.
+
+        Args:
+            data (bytes): Encoded record
+            sync (bool): Whether to fsync the file after writing
+
+        Returns:
+            int: Offset the record was written at
+        """
+        if self._file is None:
+            self._file = open(self.path, "ab")
+        offset = self.size
+        self._file.write(data)
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+        self.size += len(data)
+        return offset
+
+    def read(self, offset: int, length: int) -> bytes:
+        """
+        Read a record through the memory map.
+
+        Args:
+            offset (int): Byte offset of the record
+            length (int): Length of the record in bytes
+
+        Returns:
+            bytes: Record bytes
+        """
+        if self._map is None or len(self._map) < offset + length:
+            if self._map is not None:
+                self._map.close()
+            with open(self.path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map[offset:offset + length]
+
+    def seal(self, sync: bool = False) -> None:
+        """
+        Close the append handle; the segment is read-only from now on.
+
+        Args:
+            sync (bool): Whether to fsync the file before closing it
+        """
+        if self._file is not None:
+            if sync:
+                os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+    def close(self) -> None:
+        self.seal()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+class ConversationStore:
+    """
+    Persistent conversation store built on a segmented append-only log.
+
+    Every save appends one JSON record with the new messages of a conversation to
+    the active segment, and an in-memory index maps each conversation id to the
+    locations of its records, so a conversation is loaded with a few memory-mapped
+    reads and no scan. Deletions append a tombstone record.
+
+    Compaction rewrites all sealed segments so each live conversation is a single
+    record and deleted ones are dropped; it runs in a background thread when a
+    compaction interval is given. The index is snapshotted on close and after each
+    compaction, and on open only log data written after the snapshot is scanned.
+    The store is safe to share between threads.
+
+    Attributes:
+        directory (Path): Directory holding the segments and the index snapshot
+        segment_bytes (int): Size after which the active segment is sealed
+        min_garbage_ratio (float): Garbage ratio from which background compaction runs
+        sync (bool): Whether every append is fsynced
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, os.PathLike],
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        compaction_interval: Optional[float] = None,
+        min_garbage_ratio: float = DEFAULT_MIN_GARBAGE_RATIO,
+        sync: bool = False,
+    ):
+        """
+        Open a store, creating the directory if needed.
+
+        Args:
+            directory (Union[str, os.PathLike]): Directory holding the segments and the index snapshot
+            segment_bytes (int): Size in bytes after which the active segment is sealed
+            compaction_interval (Optional[float]): Seconds between background compaction checks;
+                None disables background compaction
+            min_garbage_ratio (float): Garbage ratio from which background compaction runs
+            sync (bool): Whether to fsync every append, trading throughput for durability
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.min_garbage_ratio = min_garbage_ratio
+        self.sync = sync
+        self._lock = threading.RLock()
+        self._compaction_lock = threading.Lock()
+        self._segments: Dict[int, _Segment] = {}
+        self._index: Dict[str, List[RecordLocation]] = {}
+        self._seq = 0
+        self._next_segment = 1
+        self._live_bytes = 0
+        self._records = 0
+        self._load()
+        self._active = self._open_active()
+        self._stop = threading.Event()
+        self._compactor: Optional[threading.Thread] = None
+        if compaction_interval:
+            self._compactor = threading.Thread(target=self._compaction_loop, args=(compaction_interval,), daemon=True)
+            self._compactor.start()
+
+    def __enter__(self) -> "ConversationStore":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, conversation_id: str) -> bool:
+        return conversation_id in self._index
+
+    def message_count(self, conversation_id: str) -> int:
+        """
+        Count the stored messages of a conversation.
+
+        Args:
+            conversation_id (str): Conversation id
+
+        Returns:
+            int: Number of stored messages, 0 for unknown conversations
+        """
+        with self._lock:
+            return sum(location.count for location in self._index.get(conversation_id, ()))
+
+    def append(self, conversation_id: str, messages: Sequence[Message]) -> None:
+        """
+        Append messages to a stored conversation, creating it if needed.
+
+        Args:
+            conversation_id (str): Conversation id
+            messages (Sequence[Message]): Messages to append, in order
+        """
+        if not messages:
+            return
+        payload = codec.encode_messages(messages)
+        with self._lock:
+            self._seq += 1
+            data = _encode_record(self._seq, conversation_id, payload)
+            if self._active.size and self._active.size + len(data) > self.segment_bytes:
+                self._roll()
+            offset = self._active.append(data, self.sync)
+            self._add(conversation_id, RecordLocation(self._seq, self._active.number, offset, len(data), len(messages)))
+
+    def save(self, conversation: Conversation) -> None:
+        """
+        Persist the messages added to a conversation since it was last saved.
+
+        The log is append-only: messages already stored are never rewritten. To
+        replace a conversation, delete() it first. The stored count is read and the
+        new messages appended under one lock, so concurrent saves of the same
+        conversation never store a message twice.
+
+        Args:
+            conversation (Conversation): Conversation to persist
+
+        Raises:
+            ValueError: If the conversation has fewer messages than are stored for it
+        """
+        with self._lock:
+            stored = self.message_count(conversation.id)
+            if len(conversation.messages) < stored:
+                raise ValueError(
+                    f"Conversation {conversation.id} has {len(conversation.messages)} messages but {stored} are stored"
+                )
+            self.append(conversation.id, conversation.messages[stored:])
+
+    def load(self, conversation_id: str) -> Optional[Conversation]:
+        """
+        Load a conversation.
+
+        Args:
+            conversation_id (str): Conversation id
+
+        Returns:
+            Optional[Conversation]: The stored conversation, or None if it is unknown
+        """
+        with self._lock:
+            if not (locations := self._index.get(conversation_id)):
+                return None
+            records = [self._segments[location.segment].read(location.offset, location.length) for location in locations]
+        from_dict = Message.from_dict
+        messages = [from_dict(item) for record in records for item in codec.loads(record)["messages"]]
+        return Conversation(id=conversation_id, messages=messages)
+
+    def delete(self, conversation_id: str) -> bool:
+        """
+        Delete a conversation. Its records are reclaimed by the next compaction.
+
+        Args:
+            conversation_id (str): Conversation id
+
+        Returns:
+            bool: True if the conversation existed
+        """
+        with self._lock:
+            if conversation_id not in self._index:
+                return False
+            self._seq += 1
+            data = codec.dumps({"seq": self._seq, "id": conversation_id, "deleted": True}) + b"\n"
+            self._active.append(data, self.sync)
+            self._remove(conversation_id)
+            return True
+
+    def garbage_ratio(self) -> float:
+        """
+        Measure how much compaction would gain.
+
+        Returns:
+            float: The larger of the share of stored bytes no longer referenced and the
+            share of records compaction would merge into another
+        """
+        with self._lock:
+            total = sum(segment.size for segment in self._segments.values())
+            dead = 1 - self._live_bytes / total if total else 0.0
+            fragmented = 1 - len(self._index) / self._records if self._records else 0.0
+            return max(dead, fragmented)
+
+    def compact(self) -> int:
+        """
+        Rewrite the sealed segments so each live conversation is one record.
+
+        The active segment is sealed first. Writers are only blocked while the index
+        is swapped; appends and deletions made while records are copied are kept.
+
+        Returns:
+            int: Number of bytes reclaimed
+        """
+        with self._compaction_lock:
+            with self._lock:
+                if self._active.size:
+                    self._roll()
+                inputs = {number for number in self._segments if number != self._active.number}
+                if not inputs:
+                    return 0
+                plan = {}
+                for conversation_id, locations in self._index.items():
+                    if sealed := [location for location in locations if location.segment in inputs]:
+                        plan[conversation_id] = sealed
+                before = sum(self._segments[number].size for number in inputs)
+
+            outputs: List[_Segment] = []
+            replacements: Dict[str, Tuple[List[RecordLocation], RecordLocation]] = {}
+            for conversation_id, locations in plan.items():
+                with self._lock:
+                    records = [self._segments[location.segment].read(location.offset, location.length) for location in locations]
+                messages = [item for record in records for item in codec.loads(record)["messages"]]
+                data = _encode_record(locations[-1].seq, conversation_id, codec.dumps(messages))
+                if not outputs or (outputs[-1].size and outputs[-1].size + len(data) > self.segment_bytes):
+                    outputs.append(self._new_segment(TEMPORARY_SUFFIX))
+                offset = outputs[-1].append(data)
+                merged = RecordLocation(locations[-1].seq, outputs[-1].number, offset, len(data), len(messages))
+                replacements[conversation_id] = (locations, merged)
+            for output in outputs:
+                output.seal(sync=True)
+
+            with self._lock:
+                for conversation_id, (old, merged) in replacements.items():
+                    current = self._index.get(conversation_id)
+                    if current and current[:len(old)] == old:
+                        self._index[conversation_id] = [merged] + current[len(old):]
+                        self._live_bytes += merged.length - sum(location.length for location in old)
+                        self._records -= len(old) - 1
+                for output in outputs:
+                    self._segments[output.number] = output
+                removed = [self._segments.pop(number) for number in inputs]
+                self._save_snapshot()
+                for output in outputs:
+                    path = output.path.with_suffix(SEGMENT_SUFFIX)
+                    os.replace(output.path, path)
+                    output.path = path
+                for segment in removed:
+                    segment.close()
+                    segment.path.unlink()
+            reclaimed = before - sum(output.size for output in outputs)
+            metrics.increment("conversation_store.compactions")
+            logging.info(f"Compacted {len(inputs)} segments into {len(outputs)}, reclaiming {reclaimed} bytes")
+            return reclaimed
+
+    def close(self) -> None:
+        """
+        Stop background compaction, snapshot the index and close all segments.
+        """
+        self._stop.set()
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+        with self._lock:
+            self._active.seal(self.sync)
+            self._save_snapshot()
+            for segment in self._segments.values():
+                segment.close()
+
+    def _compaction_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                if self.garbage_ratio() >= self.min_garbage_ratio:
+                    self.compact()
+            except Exception:
+                logging.exception("Conversation store compaction failed")
+
+    def _add(self, conversation_id: str, location: RecordLocation) -> None:
+        self._index.setdefault(conversation_id, []).append(location)
+        self._live_bytes += location.length
+        self._records += 1
+
+    def _remove(self, conversation_id: str) -> None:
+        locations = self._index.pop(conversation_id, [])
+        self._live_bytes -= sum(location.length for location in locations)
+        self._records -= len(locations)
+
+    def _new_segment(self, suffix: str = SEGMENT_SUFFIX) -> _Segment:
+        # Compaction allocates its output segments outside the write lock, so the
+        # number is taken under it to never collide with a segment rolled by append().
+        with self._lock:
+            number = self._next_segment
+            self._next_segment += 1
+            path = self.directory / f"{number:08d}{suffix}"
+            path.touch()
+            segment = _Segment(number, path, 0)
+            if suffix == SEGMENT_SUFFIX:
+                self._segments[number] = segment
+            return segment
+
+    def _open_active(self) -> _Segment:
+        if self._segments:
+            last = self._segments[max(self._segments)]
+            if last.size < self.segment_bytes:
+                return last
+        return self._new_segment()
+
+    def _roll(self) -> None:
+        self._active.seal(self.sync)
+        self._active = self._new_segment()
+
+    def _save_snapshot(self) -> None:
+        snapshot = {
+            "seq": self._seq,
+            "next_segment": self._next_segment,
+            "segments": {str(number): segment.size for number, segment in self._segments.items()},
+            "conversations": {conversation_id: [list(location) for location in locations] for conversation_id, locations in self._index.items()},
+        }
+        path = self.directory / INDEX_FILE_NAME
+        temporary = path.with_name(path.name + TEMPORARY_SUFFIX)
+        with open(temporary, "wb") as f:
+            f.write(codec.dumps(snapshot))
+            if self.sync:
+                os.fsync(f.fileno())
+        os.replace(temporary, path)
+
+    def _read_snapshot(self, files: Dict[int, Path]) -> Optional[Dict]:
+        path = self.directory / INDEX_FILE_NAME
+        if not path.exists():
+            return None
+        snapshot = codec.loads(path.read_bytes())
+        for number, size in snapshot["segments"].items():
+            if int(number) not in files or files[int(number)].stat().st_size < size:
+                logging.warning(f"Index snapshot refers to missing segment {number}, rebuilding the index from the log")
+                return None
+        return snapshot
+
+    def _load(self) -> None:
+        """
+        Rebuild the in-memory index from the snapshot and the log written after it.
+
+        Temporary files of an interrupted compaction are discarded, and segments older
+        than the snapshot that it no longer lists are leftovers of a finished compaction.
+        """
+        for temporary in self.directory.glob(f"*{TEMPORARY_SUFFIX}"):
+            temporary.unlink()
+        files = {int(path.stem): path for path in self.directory.glob(f"*{SEGMENT_SUFFIX}") if path.stem.isdigit()}
+
+        scan_from: Dict[int, int] = {number: 0 for number in files}
+        if (snapshot := self._read_snapshot(files)) is not None:
+            self._seq = snapshot["seq"]
+            self._next_segment = snapshot["next_segment"]
+            for conversation_id, locations in snapshot["conversations"].items():
+                for location in locations:
+                    self._add(conversation_id, RecordLocation(*location))
+            for number in list(files):
+                if str(number) in snapshot["segments"]:
+                    scan_from[number] = snapshot["segments"][str(number)]
+                elif number < snapshot["next_segment"]:
+                    files.pop(number).unlink()
+                    del scan_from[number]
+
+        for number, path in files.items():
+            self._segments[number] = _Segment(number, path, path.stat().st_size)
+            self._next_segment = max(self._next_segment, number + 1)
+
+        entries: List[Tuple[int, str, Optional[RecordLocation]]] = []
+        for number, start in scan_from.items():
+            entries.extend(self._scan(self._segments[number], start))
+        for seq, conversation_id, location in sorted(entries, key=lambda entry: entry[0]):
+            if location is None:
+                self._remove(conversation_id)
+            else:
+                self._add(conversation_id, location)
+            self._seq = max(self._seq, seq)
+
+    def _scan(self, segment: _Segment, start: int) -> List[Tuple[int, str, Optional[RecordLocation]]]:
+        """
+        Read the records of a segment from an offset on.
+
+        A trailing record without a newline was cut short by a crash and is truncated.
+
+        Args:
+            segment (_Segment): Segment to scan
+            start (int): Offset to start at
+
+        Returns:
+            List[Tuple[int, str, Optional[RecordLocation]]]: Sequence number, conversation id
+            and location of each record; the location is None for deletions
+        """
+        entries = []
+        offset = start
+        if segment.size > start:
+            with open(segment.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                while (end := mapped.find(b"\n", offset)) >= 0:
+                    record = codec.loads(mapped[offset:end])
+                    if record.get("deleted"):
+                        entries.append((record["seq"], record["id"], None))
+                    else:
+                        location = RecordLocation(record["seq"], segment.number, offset, end + 1 - offset, len(record["messages"]))
+                        entries.append((record["seq"], record["id"], location))
+                    offset = end + 1
+        if offset < segment.size:
+            logging.warning(f"Truncating {segment.size - offset} bytes of an incomplete record in {segment.path}")
+            os.truncate(segment.path, offset)
+            segment.size = offset
+        return entries
@@ -0,0 +1,292 @@
+import abc
+import base64
+import hashlib
+import json
+import mimetypes
+import mmap
+import os
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterator, Optional, Union
+
+DEFAULT_ENCODE_CHUNK_SIZE = 3 * 64 * 1024
+"""
+Default number of raw bytes base64-encoded at a time. A multiple of 3, so chunks
+encode without padding and can be concatenated.
+"""
+
+DEFAULT_BODY_CHUNK_SIZE = 64 * 1024
+"""
+Default size in bytes of the chunks a streamed request body is sent in.
+"""
+
+
+class DataUrl(abc.ABC):
+    """
+    Base64 data URL encoded lazily in chunks.
+
+    The payload is encoded piece by piece while the request body is written, so the
+    image is never held in memory as bytes, base64 text and JSON at the same time.
+    It can be used anywhere a data URL string is expected in a message.
+
+    Attributes:
+        mime_type (str): MIME type written in the data URL header
+    """
+
+    def __init__(self, mime_type: str, size: int):
+        """
+        Initialize the data URL.
+
+        Args:
+            mime_type (str): MIME type written in the data URL header
+            size (int): Size of the raw payload in bytes
+        """
+        self.mime_type = mime_type
+        self._size = size
+        self._digest: Optional[str] = None
+
+    @property
+    def size(self) -> int:
+        """
+        Size of the raw payload in bytes.
+        """
+        return self._size
+
+    @property
+    def prefix(self) -> str:
+        """
+        Data URL header preceding the base64 payload.
+        """
+        return f"data:{self.mime_type};base64,"
+
+    def __len__(self) -> int:
+        """
+        Length of the full data URL in characters, computed without encoding the payload.
+        """
+        return len(self.prefix) + 4 * ((self._size + 2) // 3)
+
+    def __str__(self) -> str:
+        """
+        Materialize the full data URL. Prefer iter_chunks() for large payloads.
+        """
+        return "".join(self.iter_chunks())
+
+    @property
+    def digest(self) -> str:
+        """
+        SHA-256 of the MIME type and payload, computed once on first use.
+        """
+        if self._digest is None:
+            sha = hashlib.sha256(self.mime_type.encode("utf-8"))
+            for chunk in self._iter_raw(DEFAULT_ENCODE_CHUNK_SIZE):
+                sha.update(chunk)
+            self._digest = sha.hexdigest()
+        return self._digest
+
+    @abc.abstractmethod
+    def _iter_raw(self, chunk_size: int) -> Iterator[memoryview]:
+        """
+        Yield slices of the raw payload.
+
+        Args:
+            chunk_size (int): Size of each slice in bytes
+
+        Yields:
+            memoryview: Consecutive slices of the payload, valid until the next one is requested
+        """
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_ENCODE_CHUNK_SIZE) -> Iterator[str]:
+        """
+        Yield the data URL in pieces: the header, then the base64 payload chunk by chunk.
+
+        Args:
+            chunk_size (int): Number of raw bytes encoded per chunk, rounded down to a multiple of 3
+
+        Yields:
+            str: Consecutive pieces of the data URL
+        """
+        chunk_size = max(3, chunk_size - chunk_size % 3)
+        yield self.prefix
+        for chunk in self._iter_raw(chunk_size):
+            yield base64.b64encode(chunk).decode("ascii")
+
+
+class FileDataUrl(DataUrl):
+    """
+    Data URL of a file, memory-mapped and encoded while the request is written.
+
+    Attributes:
+        path (Path): Location of the file
+        mime_type (str): MIME type written in the data URL header
+    """
+
+    def __init__(self, path: Union[str, Path], mime_type: Optional[str] = None):
+        """
+        Create a data URL for a file.
+
+        Args:
+            path (Union[str, Path]): Location of the file
+            mime_type (Optional[str]): MIME type of the file. Guessed from the extension when omitted
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        self.path = Path(path)
+        super().__init__(
+            mime_type or mimetypes.guess_type(self.path.name)[0] or "application/octet-stream",
+            os.path.getsize(self.path),
+        )
+
+    def __repr__(self) -> str:
+        return f"FileDataUrl(path={str(self.path)!r}, mime_type={self.mime_type!r})"
+
+    def _iter_raw(self, chunk_size: int) -> Iterator[memoryview]:
+        if self._size == 0:
+            return
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                for offset in range(0, len(mapped), chunk_size):
+                    with view[offset:offset + chunk_size] as chunk:
+                        yield chunk
+
+
+class BytesDataUrl(DataUrl):
+    """
+    Data URL of an in-memory buffer, encoded while the request is written.
+
+    Only the raw bytes are kept; the base64 text is never materialized as a whole.
+
+    Attributes:
+        mime_type (str): MIME type written in the data URL header
+    """
+
+    def __init__(self, data: bytes, mime_type: str):
+        """
+        Create a data URL for a buffer.
+
+        Args:
+            data (bytes): Raw payload
+            mime_type (str): MIME type of the payload
+        """
+        super().__init__(mime_type, len(data))
+        self._data = data
+
+    def __repr__(self) -> str:
+        return f"BytesDataUrl(size={self._size}, mime_type={self.mime_type!r})"
+
+    def _iter_raw(self, chunk_size: int) -> Iterator[memoryview]:
+        with memoryview(self._data) as view:
+            for offset in range(0, self._size, chunk_size):
+                with view[offset:offset + chunk_size] as chunk:
+                    yield chunk
+
+
+def has_data_urls(value: Any) -> bool:
+    """
+    Check whether a request body contains any lazily encoded data URL.
+
+    Args:
+        value (Any): JSON-compatible value, possibly containing DataUrl objects
+
+    Returns:
+        bool: True if at least one DataUrl is present
+    """
+    if isinstance(value, DataUrl):
+        return True
+    if isinstance(value, dict):
+        return any(has_data_urls(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(has_data_urls(item) for item in value)
+    return False
+
+
+def _iter_json_parts(value: Any) -> Iterator[Union[str, DataUrl]]:
+    """
+    Serialize a value to JSON piece by piece, leaving data URLs unencoded.
+
+    Args:
+        value (Any): JSON-compatible value, possibly containing DataUrl objects
+
+    Yields:
+        Union[str, DataUrl]: JSON text fragments, and data URLs to be written as JSON strings
+    """
+    if isinstance(value, DataUrl):
+        yield value
+    elif isinstance(value, dict):
+        yield "{"
+        for i, (key, item) in enumerate(value.items()):
+            yield ("," if i else "") + json.dumps(str(key), ensure_ascii=False) + ":"
+            yield from _iter_json_parts(item)
+        yield "}"
+    elif isinstance(value, (list, tuple)):
+        yield "["
+        for i, item in enumerate(value):
+            if i:
+                yield ","
+            yield from _iter_json_parts(item)
+        yield "]"
+    else:
+        yield json.dumps(value, ensure_ascii=False)
+
+
+class JsonBody:
+    """
+    JSON request body streamed in chunks, with data URLs encoded while sending.
+
+    The body has a known length, so it is sent with a Content-Length header instead
+    of chunked transfer encoding, and it can be iterated again when a request is retried.
+
+    Attributes:
+        _value (Any): Request body value
+        _chunk_size (int): Size in bytes of the chunks yielded
+    """
+
+    def __init__(self, value: Any, chunk_size: int = DEFAULT_BODY_CHUNK_SIZE):
+        """
+        Wrap a request body for streaming.
+
+        Args:
+            value (Any): JSON-compatible value, possibly containing DataUrl objects
+            chunk_size (int): Size in bytes of the chunks yielded
+        """
+        self._value = value
+        self._chunk_size = chunk_size
+
+    def __len__(self) -> int:
+        """
+        Size of the encoded body in bytes. Data URL payloads are measured, not encoded.
+        """
+        return sum(
+            len(part) + 2 if isinstance(part, DataUrl) else len(part.encode("utf-8"))
+            for part in _iter_json_parts(self._value)
+        )
+
+    def __iter__(self) -> Iterator[bytes]:
+        """
+        Yield the encoded body in chunks of roughly chunk_size bytes.
+        """
+        buffer = bytearray()
+        for part in _iter_json_parts(self._value):
+            if isinstance(part, DataUrl):
+                buffer += b'"'
+                for piece in part.iter_chunks():
+                    buffer += piece.encode("ascii")
+                    if len(buffer) >= self._chunk_size:
+                        yield bytes(buffer)
+                        buffer.clear()
+                buffer += b'"'
+            else:
+                buffer += part.encode("utf-8")
+            if len(buffer) >= self._chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+        if buffer:
+            yield bytes(buffer)
+
+    async def aiter_bytes(self) -> AsyncIterator[bytes]:
+        """
+        Yield the encoded body in chunks, for async HTTP clients.
+
+        Each call starts a new pass over the body, so a fresh iterator is needed per attempt.
+        """
+        for chunk in self:
+            yield chunk
@@ -0,0 +1,294 @@
+import hashlib
+import io
+import os
+import tempfile
+from dataclasses import dataclass
+from enum import StrEnum
+from pathlib import Path
+from typing import Optional, Tuple
+
+DEFAULT_MAX_DIMENSION = 1568
+"""
+Default longest image side, in pixels, for models without a known limit.
+"""
+
+MODEL_MAX_DIMENSIONS = {
+    "gpt-4o": 2048,
+    "gpt-4": 2048,
+    "anthropic.claude": 1568,
+    "gemini": 3072,
+}
+"""
+Longest image side each model family uses before downsampling internally, keyed by
+deployment name prefix. Larger images only cost upload bytes and latency.
+"""
+
+DEFAULT_QUALITY = 85
+"""
+Default encoder quality used when recompressing images.
+"""
+
+DEFAULT_CACHE_DIR = Path(tempfile.gettempdir()) / "dial-image-cache"
+"""
+Default directory for preprocessed image variants.
+"""
+
+
+class ImageFormat(StrEnum):
+    """
+    Enum representing the formats images can be recompressed to.
+
+    Attributes:
+        JPEG: JPEG format, best supported by vision models
+        WEBP: WebP format, smaller files at the same quality
+    """
+    JPEG = "JPEG"
+    WEBP = "WEBP"
+
+
+@dataclass(frozen=True)
+class ImageSettings:
+    """
+    Target size and encoding of a preprocessed image.
+
+    Attributes:
+        max_dimension (int): Longest side of the output image, in pixels
+        format (ImageFormat): Output image format
+        quality (int): Encoder quality between 1 and 100
+        model (str): Deployment the settings were chosen for; part of the cache key
+    """
+    max_dimension: int = DEFAULT_MAX_DIMENSION
+    format: ImageFormat = ImageFormat.JPEG
+    quality: int = DEFAULT_QUALITY
+    model: str = ""
+
+    @classmethod
+    def for_model(cls, model: str, format: ImageFormat = ImageFormat.JPEG, quality: int = DEFAULT_QUALITY) -> "ImageSettings":
+        """
+        Build settings sized for a model deployment.
+
+        Args:
+            model (str): Name of the model deployment
+            format (ImageFormat): Output image format
+            quality (int): Encoder quality between 1 and 100
+
+        Returns:
+            ImageSettings: Settings using the model's maximum image dimension
+        """
+        return cls(max_dimension=max_dimension_for_model(model), format=format, quality=quality, model=model)
+
+    @property
+    def mime_type(self) -> str:
+        """
+        MIME type of images produced with these settings.
+        """
+        return f"image/{self.format.lower()}"
+
+    @property
+    def extension(self) -> str:
+        """
+        File extension of images produced with these settings.
+        """
+        return ".jpg" if self.format == ImageFormat.JPEG else f".{self.format.lower()}"
+
+    def cache_key(self, digest: str) -> str:
+        """
+        Build the cache key of an image processed with these settings.
+
+        Args:
+            digest (str): SHA-256 hex digest of the original image
+
+        Returns:
+            str: Key combining content hash, model and settings
+        """
+        variant = f"{digest}:{self.model}:{self.max_dimension}:{self.format}:{self.quality}"
+        return hashlib.sha256(variant.encode("utf-8")).hexdigest()[:32]
+
+
+def max_dimension_for_model(model: str) -> int:
+    """
+    Look up the longest image side a model deployment uses.
+
+    Args:
+        model (str): Name of the model deployment
+
+    Returns:
+        int: Maximum dimension of the longest matching prefix, or DEFAULT_MAX_DIMENSION
+    """
+    matches = [prefix for prefix in MODEL_MAX_DIMENSIONS if model.startswith(prefix)]
+    return MODEL_MAX_DIMENSIONS[max(matches, key=len)] if matches else DEFAULT_MAX_DIMENSION
+
+
+def _import_pillow():
+    """
+    Import Pillow on first use, so it stays an optional dependency.
+
+    Returns:
+        module: The PIL.Image module
+
+    Raises:
+        ImportError: If Pillow is not installed
+    """
+    try:
+        from PIL import Image
+    except ImportError as e:
+        raise ImportError("Image preprocessing requires Pillow. Install it with: pip install Pillow") from e
+    return Image
+
+
+def preprocess_image(data: bytes, settings: ImageSettings) -> bytes:
+    """
+    Downscale an image to the maximum dimension and recompress it.
+
+    The EXIF orientation is applied first, so photos stay upright once the metadata is
+    dropped by recompression. The aspect ratio is kept and images already within the
+    limit are not enlarged. Transparency is flattened onto white for formats without
+    an alpha channel.
+
+    Args:
+        data (bytes): Original encoded image
+        settings (ImageSettings): Target size and encoding
+
+    Returns:
+        bytes: Recompressed image
+
+    Raises:
+        ImportError: If Pillow is not installed
+    """
+    Image = _import_pillow()
+    from PIL import ImageOps
+
+    with Image.open(io.BytesIO(data)) as source:
+        image = ImageOps.exif_transpose(source)
+        image.thumbnail((settings.max_dimension, settings.max_dimension), Image.Resampling.LANCZOS)
+        if settings.format == ImageFormat.JPEG and image.mode != "RGB":
+            rgba = image.convert("RGBA")
+            image = Image.new("RGB", rgba.size, (255, 255, 255))
+            image.paste(rgba, mask=rgba.getchannel("A"))
+        output = io.BytesIO()
+        image.save(output, format=settings.format.value, quality=settings.quality, optimize=True)
+    return output.getvalue()
+
+
+class PreprocessedImageCache:
+    """
+    On-disk cache of preprocessed image variants.
+
+    Variants are stored as files named by their (content hash, model, settings) key, so
+    they can be streamed to the bucket directly and survive between runs.
+
+    Attributes:
+        directory (Path): Directory holding the cached variants
+    """
+
+    def __init__(self, directory: Path = DEFAULT_CACHE_DIR):
+        """
+        Open a cache directory, creating it if needed.
+
+        Args:
+            directory (Path): Directory holding the cached variants
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, digest: str, settings: ImageSettings) -> Path:
+        """
+        Location of a variant, whether or not it exists yet.
+
+        Args:
+            digest (str): SHA-256 hex digest of the original image
+            settings (ImageSettings): Settings the variant is produced with
+
+        Returns:
+            Path: File the variant is stored in
+        """
+        return self.directory / f"{settings.cache_key(digest)}{settings.extension}"
+
+    def store(self, path: Path, data: bytes) -> None:
+        """
+        Write a variant atomically.
+
+        Each call writes to its own temporary file, so concurrent stores of the same
+        variant never interleave; the last rename wins.
+
+        Args:
+            path (Path): File returned by path_for()
+            data (bytes): Encoded variant
+        """
+        tmp = tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False)
+        try:
+            with tmp:
+                tmp.write(data)
+            os.replace(tmp.name, path)
+        except BaseException:
+            os.unlink(tmp.name)
+            raise
+
+
+def prepare_image_bytes(
+    data: bytes,
+    mime_type: str,
+    settings: ImageSettings,
+    cache: Optional[PreprocessedImageCache] = None,
+) -> Tuple[bytes, str]:
+    """
+    Get the preprocessed variant of an in-memory image, using the cache when possible.
+
+    The original is kept when recompressing would not make it smaller.
+
+    Args:
+        data (bytes): Original encoded image
+        mime_type (str): MIME type of the original image
+        settings (ImageSettings): Target size and encoding
+        cache (Optional[PreprocessedImageCache]): Cache of processed variants
+
+    Returns:
+        Tuple[bytes, str]: Image to send and its MIME type
+
+    Raises:
+        ImportError: If the variant is not cached and Pillow is not installed
+    """
+    path = cache.path_for(hashlib.sha256(data).hexdigest(), settings) if cache else None
+    if path is not None and path.exists():
+        processed = path.read_bytes()
+    else:
+        processed = preprocess_image(data, settings)
+        if path is not None:
+            cache.store(path, processed)
+    if len(processed) >= len(data):
+        return data, mime_type
+    return processed, settings.mime_type
+
+
+def prepare_image_file(
+    path: Path,
+    mime_type: str,
+    settings: ImageSettings,
+    cache: Optional[PreprocessedImageCache] = None,
+) -> Tuple[Path, str]:
+    """
+    Get the preprocessed variant of an image file, using the cache when possible.
+
+    The original is kept when recompressing would not make it smaller.
+
+    Args:
+        path (Path): Location of the original image
+        mime_type (str): MIME type of the original image
+        settings (ImageSettings): Target size and encoding
+        cache (Optional[PreprocessedImageCache]): Cache of processed variants. A cache in
+            DEFAULT_CACHE_DIR is used when omitted
+
+    Returns:
+        Tuple[Path, str]: File to upload and its MIME type
+
+    Raises:
+        ImportError: If the variant is not cached and Pillow is not installed
+    """
+    cache = cache or PreprocessedImageCache()
+    data = Path(path).read_bytes()
+    variant = cache.path_for(hashlib.sha256(data).hexdigest(), settings)
+    if not variant.exists():
+        cache.store(variant, preprocess_image(data, settings))
+    if variant.stat().st_size >= len(data):
+        return Path(path), mime_type
+    return variant, settings.mime_type
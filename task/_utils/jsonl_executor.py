@@ -0,0 +1,384 @@
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import time
+from collections import deque
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+
+import aiofiles
+
+from task._models.message import Message
+from task._models.role import Role
+from task._utils.batch import DEFAULT_CONCURRENCY
+from task._utils.codec import dumps, loads
+from task._utils.constants import API_KEY, DEFAULT_MODEL, DIAL_CHAT_COMPLETIONS_ENDPOINT
+from task._utils.model_client import AsyncDialModelClient
+
+DEFAULT_PROGRESS_INTERVAL = 5.0
+"""
+Default number of seconds between live progress reports.
+"""
+
+DEFAULT_LATENCY_SAMPLES = 10_000
+"""
+Default number of latencies kept for percentiles; larger runs keep a uniform random sample.
+"""
+
+REQUEST_FIELDS = frozenset({"id", "model", "messages"})
+"""
+Request record keys consumed by the executor rather than sent with the request.
+"""
+
+COMPLETION_PARAMETERS = frozenset({
+    "temperature", "top_p", "n", "stop", "max_tokens", "max_completion_tokens", "presence_penalty",
+    "frequency_penalty", "logit_bias", "seed", "user", "response_format", "tools", "tool_choice",
+})
+"""
+Standard chat-completion parameters sent as top-level request fields; every other key is sent as a custom field.
+"""
+
+
+@dataclass
+class LatencyStats:
+    """
+    Running throughput and latency statistics of a batch run.
+
+    Attributes:
+        started (float): Monotonic time the run started at
+        succeeded (int): Number of requests that completed successfully
+        failed (int): Number of requests that raised an error
+        latencies (List[float]): Reservoir sample of finished request latencies, in seconds;
+            holds every latency until max_samples requests have finished
+        max_samples (int): Maximum number of latencies kept
+    """
+    started: float = field(default_factory=time.perf_counter)
+    succeeded: int = 0
+    failed: int = 0
+    latencies: List[float] = field(default_factory=list)
+    max_samples: int = DEFAULT_LATENCY_SAMPLES
+
+    @property
+    def finished(self) -> int:
+        """
+        Number of requests that finished, successfully or not.
+        """
+        return self.succeeded + self.failed
+
+    def record(self, latency: float, ok: bool) -> None:
+        """
+        Record one finished request.
+
+        Memory stays bounded on long runs: once max_samples latencies are kept, each new
+        one replaces a random sample with the probability that keeps the sample uniform.
+
+        Args:
+            latency (float): Time spent on the request, in seconds
+            ok (bool): Whether the request succeeded
+        """
+        if ok:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+        if len(self.latencies) < self.max_samples:
+            self.latencies.append(latency)
+        elif (slot := random.randrange(self.finished)) < self.max_samples:
+            self.latencies[slot] = latency
+
+    def percentiles(self, *qs: float) -> List[float]:
+        """
+        Latency percentiles over the sampled requests, using the nearest-rank method.
+
+        The sample is sorted once for all requested percentiles.
+
+        Args:
+            *qs (float): Percentiles between 0 and 100
+
+        Returns:
+            List[float]: Latency in seconds for each percentile, 0.0 if nothing finished yet
+        """
+        if not self.latencies:
+            return [0.0 for _ in qs]
+        ordered = sorted(self.latencies)
+        return [ordered[max(1, math.ceil(q / 100 * len(ordered))) - 1] for q in qs]
+
+    def percentile(self, q: float) -> float:
+        """
+        Latency percentile over the sampled requests, using the nearest-rank method.
+
+        Args:
+            q (float): Percentile between 0 and 100
+
+        Returns:
+            float: Latency in seconds, or 0.0 if nothing finished yet
+        """
+        return self.percentiles(q)[0]
+
+    @property
+    def throughput(self) -> float:
+        """
+        Finished requests per second since the run started.
+        """
+        elapsed = time.perf_counter() - self.started
+        return self.finished / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        """
+        Format the statistics as a single progress line.
+
+        Returns:
+            str: Counts, throughput and p50/p95/p99 latencies
+        """
+        p50, p95, p99 = self.percentiles(50, 95, 99)
+        return (
+            f"{self.succeeded} ok, {self.failed} failed | {self.throughput:.2f} req/s | "
+            f"p50 {p50:.2f}s p95 {p95:.2f}s p99 {p99:.2f}s"
+        )
+
+
+def load_checkpoint(output_path: Path) -> Set[int]:
+    """
+    Collect the input indices that already completed successfully in an output file.
+
+    The output file is the checkpoint: every result line carries the index of its input
+    line. Only results with status "ok" count as completed, so failed requests are retried
+    on resume and their new result is appended after the error. A trailing partial line
+    left by a killed run is truncated away so new results can be appended safely.
+
+    Args:
+        output_path (Path): Location of the output JSONL file
+
+    Returns:
+        Set[int]: Indices of input lines that already have a successful result
+    """
+    done: Set[int] = set()
+    if not output_path.exists():
+        return done
+
+    complete_size = 0
+    with open(output_path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            complete_size += len(line)
+            try:
+                result = json.loads(line)
+                if result["status"] == "ok":
+                    done.add(result["index"])
+            except (json.JSONDecodeError, KeyError, TypeError):
+                continue
+
+    if complete_size < os.path.getsize(output_path):
+        with open(output_path, "r+b") as f:
+            f.truncate(complete_size)
+    return done
+
+
+def parse_request(
+    record: Dict[str, Any],
+    prompt_field: Optional[str] = None,
+) -> Tuple[List[Message], Dict[str, Any], Dict[str, Any]]:
+    """
+    Turn a request record into messages, completion parameters and custom fields.
+
+    Args:
+        record (Dict[str, Any]): Parsed JSONL line. Either has a "messages" list, or a text
+            field named by prompt_field that becomes a single user message
+        prompt_field (Optional[str]): Name of the field holding the prompt text
+
+    Returns:
+        Tuple[List[Message], Dict[str, Any], Dict[str, Any]]: Messages to send, standard
+            parameters such as temperature, and custom fields for the request
+
+    Raises:
+        ValueError: If the record has neither messages nor the prompt field
+    """
+    if "messages" in record:
+        messages = [Message.from_dict(message) for message in record["messages"]]
+        parameters = {key: value for key, value in record.items() if key in COMPLETION_PARAMETERS}
+        custom_fields = {
+            key: value for key, value in record.items()
+            if key not in REQUEST_FIELDS and key not in COMPLETION_PARAMETERS
+        }
+        return messages, parameters, custom_fields
+    if prompt_field and prompt_field in record:
+        return [Message(role=Role.USER, content=str(record[prompt_field]))], {}, {}
+    raise ValueError("Request has no 'messages' and no prompt field")
+
+
+async def _read_lines(input_path: Path, skip: Set[int]) -> AsyncIterator[Tuple[int, str]]:
+    """
+    Stream non-empty input lines with their index, skipping checkpointed ones.
+
+    Args:
+        input_path (Path): Location of the input JSONL file
+        skip (Set[int]): Indices of lines that already have a result
+
+    Yields:
+        Tuple[int, str]: Line index and stripped line text
+    """
+    index = 0
+    async with aiofiles.open(input_path, "r", encoding="utf-8") as f:
+        async for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if index not in skip:
+                yield index, line
+            index += 1
+
+
+async def execute_jsonl(
+    input_path: Path,
+    output_path: Path,
+    model: str = DEFAULT_MODEL,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    ordered: bool = True,
+    prompt_field: Optional[str] = None,
+    requests_per_minute: Optional[int] = None,
+    progress_interval: float = DEFAULT_PROGRESS_INTERVAL,
+) -> LatencyStats:
+    """
+    Run every chat-completion request of a JSONL file with bounded concurrency.
+
+    Input lines are read one at a time and only a bounded window of them is held in
+    memory. Results are appended to the output file, one JSON line per request with its
+    input index, either in input order or as soon as each finishes. Running again with
+    the same output file resumes where the previous run stopped, retrying failed requests.
+
+    Args:
+        input_path (Path): Location of the input JSONL file
+        output_path (Path): Location of the output JSONL file
+        model (str): Deployment used for requests that do not name a "model"
+        concurrency (int): Maximum number of requests in flight at once
+        ordered (bool): Whether results are written in input order rather than completion order
+        prompt_field (Optional[str]): Field used as the prompt for records without "messages"
+        requests_per_minute (Optional[int]): Request budget per minute for each deployment
+        progress_interval (float): Seconds between live progress reports
+
+    Returns:
+        LatencyStats: Throughput and latency statistics of this run
+
+    Raises:
+        ValueError: If concurrency is less than 1
+    """
+    if concurrency < 1:
+        raise ValueError("Concurrency must be at least 1")
+
+    input_path, output_path = Path(input_path), Path(output_path)
+    done = load_checkpoint(output_path)
+    if done:
+        logging.info(f"Resuming: {len(done)} requests already in {output_path}")
+
+    stats = LatencyStats()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    window = asyncio.Semaphore(concurrency * 4)
+    pending: Dict[int, str] = {}
+    order: Deque[int] = deque()
+
+    async with AsyncExitStack() as stack:
+        clients: Dict[str, AsyncDialModelClient] = {}
+        output = stack.enter_context(open(output_path, "a", encoding="utf-8"))
+
+        clients_lock = asyncio.Lock()
+
+        async def client_for(deployment_name: str) -> AsyncDialModelClient:
+            async with clients_lock:
+                if deployment_name not in clients:
+                    clients[deployment_name] = await stack.enter_async_context(AsyncDialModelClient(
+                        endpoint=DIAL_CHAT_COMPLETIONS_ENDPOINT,
+                        deployment_name=deployment_name,
+                        api_key=API_KEY,
+                        requests_per_minute=requests_per_minute,
+                    ))
+                return clients[deployment_name]
+
+        def write(index: int, line: str) -> None:
+            if not ordered:
+                output.write(line)
+                output.flush()
+                window.release()
+                return
+            pending[index] = line
+            while order and order[0] in pending:
+                output.write(pending.pop(order.popleft()))
+                window.release()
+            output.flush()
+
+        async def produce() -> None:
+            async for index, line in _read_lines(input_path, done):
+                await window.acquire()
+                order.append(index)
+                await queue.put((index, line))
+            for _ in range(concurrency):
+                await queue.put(None)
+
+        async def consume() -> None:
+            while (item := await queue.get()) is not None:
+                index, line = item
+                result: Dict[str, Any] = {"index": index}
+                started = time.perf_counter()
+                try:
+                    record = loads(line)
+                    result["id"] = record.get("id")
+                    messages, parameters, custom_fields = parse_request(record, prompt_field)
+                    client = await client_for(record.get("model") or model)
+                    message = await client.get_completion(messages, custom_fields=custom_fields or None, **parameters)
+                    result.update(status="ok", response=message.to_dict())
+                except Exception as e:
+                    result.update(status="error", error=str(e))
+                latency = time.perf_counter() - started
+                result["latency"] = round(latency, 3)
+                stats.record(latency, result["status"] == "ok")
+                write(index, dumps(result).decode("utf-8") + "\n")
+
+        async def report_progress() -> None:
+            while True:
+                await asyncio.sleep(progress_interval)
+                logging.info(stats.summary())
+
+        reporter = asyncio.create_task(report_progress())
+        try:
+            # A task group cancels the consumers when reading the input fails, instead of
+            # leaving them blocked on a queue that will never receive its sentinels.
+            async with asyncio.TaskGroup() as workers:
+                workers.create_task(produce())
+                for _ in range(concurrency):
+                    workers.create_task(consume())
+        except ExceptionGroup as e:
+            raise e.exceptions[0]
+        finally:
+            reporter.cancel()
+
+    logging.info(f"Batch finished: {stats.summary()}")
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run chat-completion requests from a JSONL file")
+    parser.add_argument("input", type=Path, help="Input JSONL file, one request per line")
+    parser.add_argument("output", type=Path, help="Output JSONL file; reused as the resume checkpoint")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Deployment for requests without a 'model' field")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--completion-order", action="store_true", help="Write results as they finish instead of in input order")
+    parser.add_argument("--prompt-field", help="Field used as the user prompt for records without 'messages', e.g. 'body'")
+    parser.add_argument("--rpm", type=int, help="Requests per minute budget per deployment")
+    parser.add_argument("--progress-interval", type=float, default=DEFAULT_PROGRESS_INTERVAL)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(execute_jsonl(
+        args.input,
+        args.output,
+        model=args.model,
+        concurrency=args.concurrency,
+        ordered=not args.completion_order,
+        prompt_field=args.prompt_field,
+        requests_per_minute=args.rpm,
+        progress_interval=args.progress_interval,
+    ))
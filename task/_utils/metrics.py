@@ -0,0 +1,73 @@
+import threading
+from collections import defaultdict
+from typing import Dict, Tuple
+
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class Counters:
+    """
+    Thread-safe registry of named counters with optional labels.
+
+    Counters are identified by a name plus label values, e.g.
+    `increment("model_client.attempts", deployment="gpt-4o")`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[MetricKey, int] = defaultdict(int)
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, str]) -> MetricKey:
+        return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def increment(self, name: str, value: int = 1, **labels) -> None:
+        """
+        Add to a counter.
+
+        Args:
+            name (str): Counter name
+            value (int): Amount to add. Defaults to 1
+            **labels: Label values identifying the counter series
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            self._values[key] += value
+
+    def get(self, name: str, **labels) -> int:
+        """
+        Read a counter.
+
+        Args:
+            name (str): Counter name
+            **labels: Label values identifying the counter series
+
+        Returns:
+            int: Current value, or 0 if the counter was never incremented
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def snapshot(self) -> Dict[MetricKey, int]:
+        """
+        Copy all counter values.
+
+        Returns:
+            Dict[MetricKey, int]: Counter values keyed by (name, labels)
+        """
+        with self._lock:
+            return dict(self._values)
+
+    def reset(self) -> None:
+        """
+        Reset all counters to zero.
+        """
+        with self._lock:
+            self._values.clear()
+
+
+metrics = Counters()
+"""
+Process-wide counters shared by the clients.
+"""
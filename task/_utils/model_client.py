@@ -1,10 +1,239 @@
-import json
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Union
 
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 
+from task._models.conversation import Conversation
 from task._models.message import Message
-from task._utils.request import print_request
+from task._utils.batch import DEFAULT_CONCURRENCY, BatchReport, run_batch
+from task._utils.cache import CompletionCache, completion_cache_key
+from task._utils.context_window import ContextWindow
+from task._utils.data_url import JsonBody, has_data_urls
+from task._utils.metrics import metrics
+from task._utils.rate_limiter import DeploymentRateLimiter, estimate_request_tokens, get_rate_limiter
+from task._utils.request import log_response, print_request
+from task._utils.retry import RetryPolicy, async_call_with_retry, call_with_retry
+from task._utils.singleflight import SingleFlight
+from task._utils.streaming import AsyncCompletionStream, CompletionStream
+from task.image_to_text.openai.message import ContentedMessage
+
+
+ChatMessage = Union[Message, ContentedMessage]
+"""
+Message types accepted by the model clients: text messages with optional attachments,
+and messages whose content is a list of text and image parts, sent as-is.
+"""
+
+ChatHistory = Union[List[ChatMessage], Conversation]
+"""
+Messages accepted by a completion call: a list of messages, or a Conversation whose
+cached message encodings are reused between turns.
+"""
+
+DEFAULT_MAX_CONNECTIONS = 100
+"""
+Default maximum number of concurrent connections in the async client pool.
+"""
+
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+"""
+Default number of idle keep-alive connections retained by the async client pool.
+"""
+
+DEFAULT_POOL_CONNECTIONS = 10
+"""
+Default number of per-host connection pools kept by the sync client session.
+"""
+
+DEFAULT_POOL_MAXSIZE = 10
+"""
+Default maximum number of connections kept per host by the sync client session.
+"""
+
+DEFAULT_MAX_RETRIES = 0
+"""
+Default number of connection-level retries performed by the sync client session.
+"""
+
+DEFAULT_TIMEOUT = 60.0
+"""
+Default request timeout in seconds for model completions.
+"""
+
+
+class DialHTTPError(Exception):
+    """
+    Raised when the DIAL service responds with a non-success HTTP status.
+
+    Attributes:
+        status_code (int): HTTP status code of the response
+        text (str): Body of the response
+    """
+
+    def __init__(self, status_code: int, text: str):
+        """
+        Initialize the error.
+
+        Args:
+            status_code (int): HTTP status code of the response
+            text (str): Body of the response
+        """
+        super().__init__(f"HTTP {status_code}: {text}")
+        self.status_code = status_code
+        self.text = text
+
+
+def _build_headers(api_key: str) -> Dict[str, str]:
+    """
+    Build the HTTP headers for a completion request.
+
+    Args:
+        api_key (str): API key for authentication
+
+    Returns:
+        Dict[str, str]: Request headers
+    """
+    return {
+        "api-key": api_key,
+        "Content-Type": "application/json"
+    }
+
+
+def _encode_history(
+    messages: ChatHistory,
+    context_window: Optional[ContextWindow] = None,
+    max_tokens: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Encode the messages of a completion request.
+
+    A Conversation supplies its cached message encodings, so only messages added
+    since the previous request are encoded, and it is trimmed to the context window
+    when one is given. Plain message lists are sent as they are.
+
+    Args:
+        messages (ChatHistory): List of messages, or a conversation, to send to the model
+        context_window (Optional[ContextWindow]): Budget a conversation is fitted into
+        max_tokens (Optional[int]): max_tokens of the request, reserved in the context window for the response
+
+    Returns:
+        List[Dict[str, Any]]: Encoded messages
+    """
+    if not isinstance(messages, Conversation):
+        return [msg.to_dict() for msg in messages]
+    if context_window is not None:
+        return context_window.encoded_messages(messages, max_tokens)
+    return messages.encoded_messages()
+
+
+async def _encode_history_async(
+    messages: ChatHistory,
+    context_window: Optional[ContextWindow] = None,
+    max_tokens: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Encode the messages of a completion request without blocking the event loop.
+
+    Same as _encode_history(), except that summarizing the dropped turns of a
+    conversation is awaited instead of run inline.
+
+    Args:
+        messages (ChatHistory): List of messages, or a conversation, to send to the model
+        context_window (Optional[ContextWindow]): Budget a conversation is fitted into
+        max_tokens (Optional[int]): max_tokens of the request, reserved in the context window for the response
+
+    Returns:
+        List[Dict[str, Any]]: Encoded messages
+    """
+    if isinstance(messages, Conversation) and context_window is not None:
+        return await context_window.encoded_messages_async(messages, max_tokens)
+    return _encode_history(messages)
+
+
+def _build_request_data(messages: List[Dict[str, Any]], custom_fields: Optional[Dict[str, Any]], **kwargs) -> Dict[str, Any]:
+    """
+    Build the JSON body of a chat completion request.
+
+    Args:
+        messages (List[Dict[str, Any]]): Encoded messages, as returned by _encode_history()
+        custom_fields (Optional[Dict[str, Any]]): Optional custom fields for the request
+        **kwargs: Additional parameters to pass to the model
+
+    Returns:
+        Dict[str, Any]: Request body
+    """
+    request_data: Dict[str, Any] = {
+        "messages": messages,
+        **kwargs
+    }
+    if custom_fields:
+        request_data["custom_fields"] = {
+            "configuration": {**custom_fields}
+        }
+    return request_data
+
+
+def _create_rate_limiter(
+    deployment_name: str,
+    requests_per_minute: Optional[int],
+    tokens_per_minute: Optional[int],
+) -> Optional[DeploymentRateLimiter]:
+    """
+    Get the shared rate limiter for a deployment if any budget is configured.
+
+    Args:
+        deployment_name (str): Name of the model deployment
+        requests_per_minute (Optional[int]): Request budget per minute
+        tokens_per_minute (Optional[int]): Token budget per minute
+
+    Returns:
+        Optional[DeploymentRateLimiter]: The deployment's limiter, or None when unlimited
+    """
+    if requests_per_minute is None and tokens_per_minute is None:
+        return None
+    return get_rate_limiter(deployment_name, requests_per_minute, tokens_per_minute)
+
+
+def _cache_get(cache: CompletionCache, key: str, deployment_name: str) -> Optional[Message]:
+    """
+    Look up a cached completion and count the hit or miss.
+
+    Args:
+        cache (CompletionCache): Completion cache
+        key (str): Request key
+        deployment_name (str): Name of the model deployment, used as a metric label
+
+    Returns:
+        Optional[Message]: The cached message, or None on a miss
+    """
+    if (message := cache.get(key)) is not None:
+        metrics.increment("completion_cache.hits", deployment=deployment_name)
+        return message
+    metrics.increment("completion_cache.misses", deployment=deployment_name)
+    return None
+
+
+def _parse_completion(data: Dict[str, Any]) -> Message:
+    """
+    Extract the first choice message from a completion response body.
+
+    Args:
+        data (Dict[str, Any]): Parsed JSON response body
+
+    Returns:
+        Message: The response message from the model
+
+    Raises:
+        ValueError: If no choices or message is present in the response
+    """
+    log_response(data)
+    choices = data.get("choices", [])
+    if choices:
+        if message := choices[0].get("message"):
+            return Message.from_dict(message)
+        raise ValueError("No Message has been present in the response")
+    raise ValueError("No Choice has been present in the response")
 
 
 class DialModelClient:
@@ -12,15 +241,38 @@ class DialModelClient:
     Client for interacting with DIAL model completion service.
     
     This client provides methods to get completions from DIAL models.
+    Requests go through a persistent session, so keep-alive connections are
+    reused between calls. It can be used as a context manager to close the
+    session when done.
     
     Attributes:
         _endpoint (str): The API endpoint for the model
         _api_key (str): API key for authentication
+        _session (requests.Session): Pooled HTTP session
+        _timeout (float): Request timeout in seconds
+        _rate_limiter (Optional[DeploymentRateLimiter]): Shared per-deployment rate limiter
+        _retry_policy (RetryPolicy): Policy for retrying transient failures
+        _cache (Optional[CompletionCache]): Opt-in cache of completion responses
+        _context_window (Optional[ContextWindow]): Budget conversations are fitted into, if any
     """
     _endpoint: str
     _api_key: str
 
-    def __init__(self, endpoint: str, deployment_name: str, api_key: str):
+    def __init__(
+        self,
+        endpoint: str,
+        deployment_name: str,
+        api_key: str,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        timeout: float = DEFAULT_TIMEOUT,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[CompletionCache] = None,
+        context_window: Optional[ContextWindow] = None,
+    ):
         """
         Initialize the DIAL model client.
         
@@ -28,6 +280,15 @@ class DialModelClient:
             endpoint (str): The API endpoint template for the model
             deployment_name (str): Name of the model deployment
             api_key (str): API key for authentication
+            pool_connections (int): Number of per-host connection pools to cache
+            pool_maxsize (int): Maximum number of connections kept per host
+            max_retries (int): Number of connection-level retries
+            timeout (float): Request timeout in seconds
+            requests_per_minute (Optional[int]): Request budget per minute shared by all clients of this deployment
+            tokens_per_minute (Optional[int]): Token budget per minute shared by all clients of this deployment
+            retry_policy (Optional[RetryPolicy]): Policy for retrying transient failures. Defaults to RetryPolicy()
+            cache (Optional[CompletionCache]): Cache for completion responses; identical requests are answered from it
+            context_window (Optional[ContextWindow]): Budget conversations are trimmed or summarized to before sending
             
         Raises:
             ValueError: If the API key is null or empty
@@ -39,14 +300,87 @@ class DialModelClient:
             model=deployment_name
         )
         self._api_key = api_key
+        self._timeout = timeout
+        self._deployment_name = deployment_name
+        self._rate_limiter = _create_rate_limiter(deployment_name, requests_per_minute, tokens_per_minute)
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._cache = cache
+        self._context_window = context_window
+
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+        )
+        self._session = requests.Session()
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def __enter__(self):
+        """
+        Context manager entry point.
+
+        Returns:
+            DialModelClient: Self instance for use in context manager
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Context manager exit point.
+
+        Closes the HTTP session.
+
+        Args:
+            exc_type: Exception type if an exception occurred
+            exc_value: Exception value if an exception occurred
+            traceback: Traceback if an exception occurred
+        """
+        self.close()
 
+    def close(self) -> None:
+        """
+        Close the HTTP session and release its pooled connections.
+        """
+        self._session.close()
 
-    def get_completion(self, messages: List[Message], custom_fields: Optional[Dict[str, Any]] = None, **kwargs) -> Message:
+    def _send(self, headers: Dict[str, str], request_data: Dict[str, Any], stream: bool = False) -> requests.Response:
+        """
+        Send a completion request, waiting for rate-limit capacity and retrying
+        transient failures.
+
+        Bodies containing DataUrl values are streamed, encoding the images while
+        the request is written.
+
+        Args:
+            headers (Dict[str, str]): Request headers
+            request_data (Dict[str, Any]): Request body
+            stream (bool): Whether to stream the response body
+
+        Returns:
+            requests.Response: The final response
+        """
+        body = JsonBody(request_data) if has_data_urls(request_data) else None
+
+        def attempt() -> requests.Response:
+            if self._rate_limiter:
+                self._rate_limiter.acquire(estimate_request_tokens(request_data))
+            if body is None:
+                response = self._session.post(url=self._endpoint, headers=headers, json=request_data, timeout=self._timeout, stream=stream)
+            else:
+                response = self._session.post(url=self._endpoint, headers=headers, data=body, timeout=self._timeout, stream=stream)
+            if self._rate_limiter:
+                self._rate_limiter.update_from_headers(response.headers, response.status_code)
+            return response
+
+        return call_with_retry(attempt, self._retry_policy, deployment=self._deployment_name)
+
+    def get_completion(self, messages: ChatHistory, custom_fields: Optional[Dict[str, Any]] = None, **kwargs) -> Message:
         """
         Get completion from the DIAL model.
         
         Args:
-            messages (List[Message]): List of messages to send to the model
+            messages (ChatHistory): List of messages, or a conversation, to send to the model
             custom_fields (Optional[Dict[str, Any]]): Optional custom fields for the request
             **kwargs: Additional parameters to pass to the model
             
@@ -55,35 +389,329 @@ class DialModelClient:
             
         Raises:
             ValueError: If no choices or message is present in the response
-            Exception: If the HTTP request fails
+            DialHTTPError: If the HTTP request fails
         """
-        headers = {
-            "api-key": self._api_key,
-            "Content-Type": "application/json"
-        }
+        headers = _build_headers(self._api_key)
+        request_data = _build_request_data(_encode_history(messages, self._context_window, kwargs.get("max_tokens")), custom_fields, **kwargs)
 
-        request_data: Dict[str, Any] = {
-            "messages": [msg.to_dict() for msg in messages],
-            **kwargs
-        }
-        if custom_fields:
-            request_data["custom_fields"] = {
-                "configuration": {**custom_fields}
-            }
+        cache_key = completion_cache_key(self._endpoint, request_data) if self._cache is not None else None
+        if cache_key and (cached := _cache_get(self._cache, cache_key, self._deployment_name)):
+            return cached
 
         print_request(endpoint=self._endpoint, request_data=request_data, headers=headers)
 
-        response = requests.post(url=self._endpoint, headers=headers, json=request_data)
+        response = self._send(headers, request_data)
 
         if response.status_code == 200:
-            data = response.json()
-            import logging
-            logging.info(json.dumps(data, indent=2))
-            choices = data.get("choices", [])
-            if choices:
-                if message := choices[0].get("message"):
-                    return Message.from_dict(message)
-                raise ValueError("No Message has been present in the response")
-            raise ValueError("No Choice has been present in the response")
+            message = _parse_completion(response.json())
+            if cache_key:
+                self._cache.set(cache_key, message)
+            return message
         else:
-            raise Exception(f"HTTP {response.status_code}: {response.text}")
+            raise DialHTTPError(response.status_code, response.text)
+
+    def stream_completion(self, messages: ChatHistory, custom_fields: Optional[Dict[str, Any]] = None, **kwargs) -> CompletionStream:
+        """
+        Stream a completion from the DIAL model as server-sent events.
+
+        Iterate the returned stream to receive text and attachment deltas as they are
+        generated, then call get_message() for the assembled message.
+
+        Args:
+            messages (ChatHistory): List of messages, or a conversation, to send to the model
+            custom_fields (Optional[Dict[str, Any]]): Optional custom fields for the request
+            **kwargs: Additional parameters to pass to the model
+
+        Returns:
+            CompletionStream: Stream of completion chunks
+
+        Raises:
+            DialHTTPError: If the HTTP request fails
+        """
+        headers = _build_headers(self._api_key)
+        request_data = _build_request_data(_encode_history(messages, self._context_window, kwargs.get("max_tokens")), custom_fields, stream=True, **kwargs)
+
+        print_request(endpoint=self._endpoint, request_data=request_data, headers=headers)
+
+        response = self._send(headers, request_data, stream=True)
+
+        if response.status_code != 200:
+            try:
+                raise DialHTTPError(response.status_code, response.text)
+            finally:
+                response.close()
+
+        def lines() -> Iterator[str]:
+            try:
+                yield from response.iter_lines(decode_unicode=True)
+            finally:
+                response.close()
+
+        return CompletionStream(lines())
+
+
+class AsyncDialModelClient:
+    """
+    Async client for interacting with DIAL model completion service.
+
+    Unlike DialModelClient, this client does not block the event loop while waiting
+    for the model and keeps a shared keep-alive connection pool, so many completions
+    can be in flight at once. It should be used as an async context manager.
+
+    Attributes:
+        _endpoint (str): The API endpoint for the model
+        _api_key (str): API key for authentication
+        _limits (httpx.Limits): Connection pool limits
+        _timeout (float): Request timeout in seconds
+        _rate_limiter (Optional[DeploymentRateLimiter]): Shared per-deployment rate limiter
+        _retry_policy (RetryPolicy): Policy for retrying transient failures
+        _cache (Optional[CompletionCache]): Opt-in cache of completion responses
+        _context_window (Optional[ContextWindow]): Budget conversations are fitted into, if any
+        _single_flight (Optional[SingleFlight[Message]]): Coalescing group for identical in-flight requests
+        _client (Optional[httpx.AsyncClient]): HTTP client instance
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        deployment_name: str,
+        api_key: str,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        timeout: float = DEFAULT_TIMEOUT,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[CompletionCache] = None,
+        coalesce_requests: bool = False,
+        context_window: Optional[ContextWindow] = None,
+    ):
+        """
+        Initialize the async DIAL model client.
+
+        Args:
+            endpoint (str): The API endpoint template for the model
+            deployment_name (str): Name of the model deployment
+            api_key (str): API key for authentication
+            max_connections (int): Maximum number of concurrent connections in the pool
+            max_keepalive_connections (int): Maximum number of idle keep-alive connections
+            timeout (float): Request timeout in seconds
+            requests_per_minute (Optional[int]): Request budget per minute shared by all clients of this deployment
+            tokens_per_minute (Optional[int]): Token budget per minute shared by all clients of this deployment
+            retry_policy (Optional[RetryPolicy]): Policy for retrying transient failures. Defaults to RetryPolicy()
+            cache (Optional[CompletionCache]): Cache for completion responses; identical requests are answered from it
+            coalesce_requests (bool): Whether identical concurrent requests share one upstream call
+            context_window (Optional[ContextWindow]): Budget conversations are trimmed or summarized to before sending
+
+        Raises:
+            ValueError: If the API key is null or empty
+        """
+        if not api_key or api_key.strip() == "":
+            raise ValueError("API key cannot be null or empty")
+
+        self._endpoint = endpoint.format(
+            model=deployment_name
+        )
+        self._api_key = api_key
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self._timeout = timeout
+        self._deployment_name = deployment_name
+        self._rate_limiter = _create_rate_limiter(deployment_name, requests_per_minute, tokens_per_minute)
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._cache = cache
+        self._context_window = context_window
+        self._single_flight: Optional[SingleFlight[Message]] = SingleFlight("model_client.coalesced") if coalesce_requests else None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self):
+        """
+        Async context manager entry point.
+
+        Creates the pooled HTTP client shared by all requests made through this instance.
+
+        Returns:
+            AsyncDialModelClient: Self instance for use in context manager
+        """
+        self._client = httpx.AsyncClient(
+            headers=_build_headers(self._api_key),
+            limits=self._limits,
+            timeout=self._timeout,
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """
+        Async context manager exit point.
+
+        Closes the HTTP client if it exists.
+
+        Args:
+            exc_type: Exception type if an exception occurred
+            exc_value: Exception value if an exception occurred
+            traceback: Traceback if an exception occurred
+        """
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Close the pooled HTTP client and release its connections.
+        """
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    async def _send(self, client: httpx.AsyncClient, request_data: Dict[str, Any], stream: bool = False) -> httpx.Response:
+        """
+        Send a completion request, waiting for rate-limit capacity and retrying
+        transient failures.
+
+        Bodies containing DataUrl values are streamed, encoding the images while
+        the request is written.
+
+        Args:
+            client (httpx.AsyncClient): HTTP client to send the request with
+            request_data (Dict[str, Any]): Request body
+            stream (bool): Whether to stream the response body
+
+        Returns:
+            httpx.Response: The final response
+        """
+        body = JsonBody(request_data) if has_data_urls(request_data) else None
+        body_headers = {"Content-Length": str(len(body))} if body is not None else None
+
+        async def attempt() -> httpx.Response:
+            if self._rate_limiter:
+                await self._rate_limiter.acquire_async(estimate_request_tokens(request_data))
+            if body is None:
+                content: Dict[str, Any] = {"json": request_data}
+            else:
+                content = {"content": body.aiter_bytes(), "headers": body_headers}
+            if stream:
+                response = await client.send(client.build_request("POST", self._endpoint, **content), stream=True)
+            else:
+                response = await client.post(self._endpoint, **content)
+            if self._rate_limiter:
+                self._rate_limiter.update_from_headers(response.headers, response.status_code)
+            return response
+
+        return await async_call_with_retry(attempt, self._retry_policy, deployment=self._deployment_name)
+
+    async def get_completion(self, messages: ChatHistory, custom_fields: Optional[Dict[str, Any]] = None, **kwargs) -> Message:
+        """
+        Get completion from the DIAL model without blocking the event loop.
+
+        With request coalescing enabled, callers sending a byte-identical request while
+        one is already in flight wait for that request and receive the same Message.
+
+        Args:
+            messages (ChatHistory): List of messages, or a conversation, to send to the model
+            custom_fields (Optional[Dict[str, Any]]): Optional custom fields for the request
+            **kwargs: Additional parameters to pass to the model
+
+        Returns:
+            Message: The response message from the model
+
+        Raises:
+            RuntimeError: If the client is not initialized
+            ValueError: If no choices or message is present in the response
+            DialHTTPError: If the HTTP request fails
+        """
+        if self._client is None:
+            raise RuntimeError("Client not initialized. Use as context manager.")
+
+        history = await _encode_history_async(messages, self._context_window, kwargs.get("max_tokens"))
+        request_data = _build_request_data(history, custom_fields, **kwargs)
+
+        cache_key = completion_cache_key(self._endpoint, request_data) if self._cache is not None else None
+        if cache_key and (cached := _cache_get(self._cache, cache_key, self._deployment_name)):
+            return cached
+
+        client = self._client
+
+        async def complete() -> Message:
+            print_request(endpoint=self._endpoint, request_data=request_data, headers=_build_headers(self._api_key))
+
+            response = await self._send(client, request_data)
+
+            if response.status_code == 200:
+                message = _parse_completion(response.json())
+                if cache_key:
+                    self._cache.set(cache_key, message)
+                return message
+            else:
+                raise DialHTTPError(response.status_code, response.text)
+
+        if self._single_flight is None:
+            return await complete()
+        flight_key = cache_key or completion_cache_key(self._endpoint, request_data)
+        return await self._single_flight.do(flight_key, complete, deployment=self._deployment_name)
+
+    async def batch_complete(
+        self,
+        message_lists: List[ChatHistory],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        custom_fields: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> BatchReport[Message]:
+        """
+        Get completions for many conversations with bounded concurrency.
+
+        Results are returned in input order. A failing request is reported as an
+        error on its own item and does not stop the rest of the batch.
+
+        Args:
+            message_lists (List[ChatHistory]): Conversations to complete
+            concurrency (int): Maximum number of requests in flight at once
+            custom_fields (Optional[Dict[str, Any]]): Optional custom fields applied to every request
+            **kwargs: Additional parameters applied to every request
+
+        Returns:
+            BatchReport[Message]: Per-item results and throughput statistics
+        """
+        async def complete(messages: ChatHistory) -> Message:
+            return await self.get_completion(messages, custom_fields=custom_fields, **kwargs)
+
+        return await run_batch(message_lists, complete, concurrency=concurrency)
+
+    def stream_completion(self, messages: ChatHistory, custom_fields: Optional[Dict[str, Any]] = None, **kwargs) -> AsyncCompletionStream:
+        """
+        Stream a completion from the DIAL model as server-sent events.
+
+        The request is built and sent when iteration starts, so summarizing a long
+        conversation is awaited there. Iterate the returned stream with `async for` to
+        receive text and attachment deltas as they are generated, then await
+        get_message() for the assembled message.
+
+        Args:
+            messages (ChatHistory): List of messages, or a conversation, to send to the model
+            custom_fields (Optional[Dict[str, Any]]): Optional custom fields for the request
+            **kwargs: Additional parameters to pass to the model
+
+        Returns:
+            AsyncCompletionStream: Stream of completion chunks
+
+        Raises:
+            RuntimeError: If the client is not initialized
+        """
+        if self._client is None:
+            raise RuntimeError("Client not initialized. Use as context manager.")
+        client = self._client
+
+        async def lines() -> AsyncIterator[str]:
+            history = await _encode_history_async(messages, self._context_window, kwargs.get("max_tokens"))
+            request_data = _build_request_data(history, custom_fields, stream=True, **kwargs)
+            print_request(endpoint=self._endpoint, request_data=request_data, headers=_build_headers(self._api_key))
+            response = await self._send(client, request_data, stream=True)
+            try:
+                if response.status_code != 200:
+                    await response.aread()
+                    raise DialHTTPError(response.status_code, response.text)
+                async for line in response.aiter_lines():
+                    yield line
+            finally:
+                await response.aclose()
+
+        return AsyncCompletionStream(lines())
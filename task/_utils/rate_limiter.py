@@ -0,0 +1,284 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+from task._utils.tokens import estimate_message_tokens
+
+SECONDS_PER_MINUTE = 60.0
+QUOTA_SAFETY_FACTOR = 0.95
+"""
+Fraction of the quota advertised by the proxy that the limiter targets, so sustained
+throughput stays just under the limit.
+"""
+
+RETRY_AFTER_HEADER = "retry-after"
+LIMIT_REQUESTS_HEADER = "x-ratelimit-limit-requests"
+REMAINING_REQUESTS_HEADER = "x-ratelimit-remaining-requests"
+LIMIT_TOKENS_HEADER = "x-ratelimit-limit-tokens"
+REMAINING_TOKENS_HEADER = "x-ratelimit-remaining-tokens"
+
+
+def _parse_number(value: Any) -> Optional[float]:
+    """
+    Parse a numeric header value.
+
+    Args:
+        value (Any): Raw header value
+
+    Returns:
+        Optional[float]: Parsed number, or None if the value is missing or not numeric
+    """
+    if not isinstance(value, (str, int, float)):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def estimate_request_tokens(request_data: Dict[str, Any]) -> int:
+    """
+    Roughly estimate the tokens a completion request will consume.
+
+    Prompt tokens are estimated per message with estimate_message_tokens(), and the
+    requested max_tokens (if any) is added for the completion.
+
+    Args:
+        request_data (Dict[str, Any]): Request body
+
+    Returns:
+        int: Estimated token count
+    """
+    prompt_tokens = sum(estimate_message_tokens(msg) for msg in request_data.get("messages", []))
+    max_tokens = request_data.get("max_tokens") or 0
+    return prompt_tokens + int(max_tokens)
+
+
+class TokenBucket:
+    """
+    Token bucket that refills continuously at a fixed rate.
+
+    Reservations may drive the bucket negative; the caller is then told how long to
+    wait until its share has been refilled. This keeps callers in arrival order.
+
+    Attributes:
+        capacity (float): Maximum number of tokens the bucket can hold
+        rate (float): Tokens added per second
+        tokens (float): Tokens currently available
+    """
+
+    def __init__(self, capacity: float, rate: float):
+        """
+        Initialize the token bucket full.
+
+        Args:
+            capacity (float): Maximum number of tokens the bucket can hold
+            rate (float): Tokens added per second
+        """
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """
+        Take tokens from the bucket.
+
+        Args:
+            amount (float): Number of tokens to take
+            now (float): Current monotonic time
+
+        Returns:
+            float: Seconds to wait before the reserved tokens are available
+        """
+        self._refill(now)
+        self.tokens -= min(amount, self.capacity)
+        return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    def resize(self, capacity: float, now: float) -> None:
+        """
+        Change the per-minute budget of the bucket.
+
+        Args:
+            capacity (float): New capacity; the refill rate is capacity per minute
+            now (float): Current monotonic time
+        """
+        self._refill(now)
+        self.capacity = capacity
+        self.rate = capacity / SECONDS_PER_MINUTE
+        self.tokens = min(self.tokens, capacity)
+
+    def limit_available(self, available: float, now: float) -> None:
+        """
+        Lower the available tokens to what the server reports as remaining.
+
+        Args:
+            available (float): Tokens the server reports as remaining
+            now (float): Current monotonic time
+        """
+        self._refill(now)
+        self.tokens = min(self.tokens, available)
+
+
+class DeploymentRateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute limiter for one deployment.
+
+    Callers reserve capacity before each request and wait until it is available.
+    The budgets adapt to the rate-limit and Retry-After headers returned by the proxy.
+    The limiter is safe to share between threads and event-loop tasks.
+
+    Attributes:
+        requests_per_minute (Optional[int]): Request budget per minute, if limited
+        tokens_per_minute (Optional[int]): Token budget per minute, if limited
+    """
+
+    def __init__(self, requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            requests_per_minute (Optional[int]): Request budget per minute; None disables the request limit
+            tokens_per_minute (Optional[int]): Token budget per minute; None disables the token limit
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._lock = threading.Lock()
+        self._requests = TokenBucket(requests_per_minute, requests_per_minute / SECONDS_PER_MINUTE) if requests_per_minute else None
+        self._tokens = TokenBucket(tokens_per_minute, tokens_per_minute / SECONDS_PER_MINUTE) if tokens_per_minute else None
+        self._blocked_until = 0.0
+
+    def reconfigure(self, requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None) -> None:
+        """
+        Replace the configured budgets, keeping the capacity already used.
+
+        Args:
+            requests_per_minute (Optional[int]): Request budget per minute; None disables the request limit
+            tokens_per_minute (Optional[int]): Token budget per minute; None disables the token limit
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.requests_per_minute = requests_per_minute
+            self.tokens_per_minute = tokens_per_minute
+            self._requests = self._reconfigured(self._requests, requests_per_minute, now)
+            self._tokens = self._reconfigured(self._tokens, tokens_per_minute, now)
+
+    @staticmethod
+    def _reconfigured(bucket: Optional[TokenBucket], per_minute: Optional[int], now: float) -> Optional[TokenBucket]:
+        if not per_minute:
+            return None
+        if bucket is None:
+            return TokenBucket(per_minute, per_minute / SECONDS_PER_MINUTE)
+        bucket.resize(per_minute, now)
+        return bucket
+
+    def reserve(self, tokens: int = 0) -> float:
+        """
+        Reserve capacity for one request.
+
+        Args:
+            tokens (int): Estimated tokens the request will consume
+
+        Returns:
+            float: Seconds the caller must wait before sending the request
+        """
+        with self._lock:
+            now = time.monotonic()
+            delay = max(0.0, self._blocked_until - now)
+            if self._requests:
+                delay = max(delay, self._requests.reserve(1, now))
+            if self._tokens and tokens:
+                delay = max(delay, self._tokens.reserve(tokens, now))
+            return delay
+
+    def acquire(self, tokens: int = 0) -> None:
+        """
+        Block the current thread until capacity for one request is available.
+
+        Args:
+            tokens (int): Estimated tokens the request will consume
+        """
+        if (delay := self.reserve(tokens)) > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, tokens: int = 0) -> None:
+        """
+        Wait without blocking the event loop until capacity for one request is available.
+
+        Args:
+            tokens (int): Estimated tokens the request will consume
+        """
+        if (delay := self.reserve(tokens)) > 0:
+            await asyncio.sleep(delay)
+
+    def update_from_headers(self, headers: Mapping[str, Any], status_code: int) -> None:
+        """
+        Adapt the budgets to the rate-limit headers of a response.
+
+        A Retry-After header on a 429 response pauses all callers for that long.
+        Advertised limits replace the configured budgets (scaled by QUOTA_SAFETY_FACTOR)
+        and reported remaining capacity caps what the buckets may hand out.
+
+        Args:
+            headers (Mapping[str, Any]): Response headers
+            status_code (int): Response status code
+        """
+        lowered = {str(key).lower(): value for key, value in headers.items()} if isinstance(headers, Mapping) else {}
+        with self._lock:
+            now = time.monotonic()
+            if status_code == 429 and (retry_after := _parse_number(lowered.get(RETRY_AFTER_HEADER))) is not None:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+            for bucket, limit_header, remaining_header in (
+                (self._requests, LIMIT_REQUESTS_HEADER, REMAINING_REQUESTS_HEADER),
+                (self._tokens, LIMIT_TOKENS_HEADER, REMAINING_TOKENS_HEADER),
+            ):
+                if bucket is None:
+                    continue
+                if (limit := _parse_number(lowered.get(limit_header))) is not None and limit > 0:
+                    bucket.resize(limit * QUOTA_SAFETY_FACTOR, now)
+                if (remaining := _parse_number(lowered.get(remaining_header))) is not None:
+                    bucket.limit_available(remaining, now)
+
+
+_limiters: Dict[str, DeploymentRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    deployment_name: str,
+    requests_per_minute: Optional[int] = None,
+    tokens_per_minute: Optional[int] = None,
+) -> DeploymentRateLimiter:
+    """
+    Get the process-wide rate limiter for a deployment, creating it on first use.
+
+    All clients bound to the same deployment share one limiter, so their combined
+    traffic stays within the deployment's quota. A call with budgets different from
+    the existing limiter's reconfigures it, so the latest budget applies to all clients.
+
+    Args:
+        deployment_name (str): Name of the model deployment
+        requests_per_minute (Optional[int]): Request budget per minute used when creating the limiter
+        tokens_per_minute (Optional[int]): Token budget per minute used when creating the limiter
+
+    Returns:
+        DeploymentRateLimiter: The shared limiter for the deployment
+    """
+    with _limiters_lock:
+        if (limiter := _limiters.get(deployment_name)) is None:
+            limiter = _limiters[deployment_name] = DeploymentRateLimiter(requests_per_minute, tokens_per_minute)
+        elif (limiter.requests_per_minute, limiter.tokens_per_minute) != (requests_per_minute, tokens_per_minute):
+            logging.warning(
+                f"Reconfiguring the rate limiter of {deployment_name} from "
+                f"{limiter.requests_per_minute} rpm / {limiter.tokens_per_minute} tpm to "
+                f"{requests_per_minute} rpm / {tokens_per_minute} tpm"
+            )
+            limiter.reconfigure(requests_per_minute, tokens_per_minute)
+        return limiter
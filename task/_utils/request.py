@@ -1,50 +1,163 @@
+import contextvars
+import itertools
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict
+
 SEPARATOR_LENGTH = 50
 END_SEPARATOR_LENGTH = 107
 API_KEY_PREVIEW_LENGTH = 8
 API_KEY_SUFFIX_LENGTH = 4
 CONTENT_PREVIEW_LENGTH = 100
+PARAMETER_PREVIEW_LENGTH = 200
+DEFAULT_MAX_LOG_CHARS = 4000
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RequestLogSettings:
+    """
+    Controls how much request and response logging is produced.
+
+    Attributes:
+        sample_rate (int): Log one in every `sample_rate` requests; 1 logs every request
+        max_chars (int): Maximum length of a single logged request or response
+    """
+    sample_rate: int = 1
+    max_chars: int = DEFAULT_MAX_LOG_CHARS
+
+
+settings = RequestLogSettings()
+_counter = itertools.count()
+_counter_lock = threading.Lock()
+_request_sampled: contextvars.ContextVar[bool] = contextvars.ContextVar("request_sampled")
+"""Sampling decision of the current request, reused when its response is logged"""
+
+
+def configure_request_logging(sample_rate: int = 1, max_chars: int = DEFAULT_MAX_LOG_CHARS) -> None:
+    """
+    Configure sampling and size limits of request logging.
+
+    Args:
+        sample_rate (int): Log one in every `sample_rate` requests
+        max_chars (int): Maximum length of a single logged request or response
+
+    Raises:
+        ValueError: If sample_rate or max_chars is less than 1
+    """
+    if sample_rate < 1 or max_chars < 1:
+        raise ValueError("sample_rate and max_chars must be at least 1")
+    settings.sample_rate = sample_rate
+    settings.max_chars = max_chars
+
+
+def _sample_request() -> bool:
+    """
+    Decide whether the current request and its response are logged.
+
+    The decision is taken once per request and remembered in the current context,
+    so `log_response` keeps or drops the response together with its request. The
+    level check comes first, so nothing is counted while logging is disabled.
+
+    Returns:
+        bool: True if the request is selected for logging
+    """
+    if not logger.isEnabledFor(logging.INFO):
+        sampled = False
+    elif settings.sample_rate == 1:
+        sampled = True
+    else:
+        with _counter_lock:
+            sampled = next(_counter) % settings.sample_rate == 0
+    _request_sampled.set(sampled)
+    return sampled
+
+
+def _truncate(text: str, limit: int) -> str:
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+def _preview_content(content: Any) -> str:
+    """
+    Build a short preview of message content.
+
+    Image parts are replaced by a placeholder so base64 data never reaches the log.
+
+    Args:
+        content (Any): Message content, either text or a list of content parts
+
+    Returns:
+        str: Preview of the content
+    """
+    if isinstance(content, list):
+        parts = []
+        for part in content:
+            if isinstance(part, dict) and part.get("type") == "text":
+                parts.append(str(part.get("text", "")))
+            else:
+                parts.append("[image]")
+        content = " ".join(parts)
+    return _truncate(str(content), CONTENT_PREVIEW_LENGTH)
+
+
+def _mask_api_key(api_key: str) -> str:
+    if len(api_key) > (API_KEY_PREVIEW_LENGTH + API_KEY_SUFFIX_LENGTH):
+        return f"{api_key[:API_KEY_PREVIEW_LENGTH]}...{api_key[-API_KEY_SUFFIX_LENGTH:]}"
+    return "***"
+
 
 def print_request(endpoint: str, request_data: dict, headers: dict):
     """
     Print the details of an HTTP request for debugging purposes.
     
     This function logs the endpoint, headers (with API key masked), and request body
-    in a formatted way to help with debugging API requests.
+    in a formatted way to help with debugging API requests. Nothing is formatted
+    unless INFO logging is enabled and the request is selected by the sample rate.
     
     Args:
         endpoint (str): The API endpoint being called
         request_data (dict): The request body data
         headers (dict): The request headers
     """
-    
-    import logging
-    logging.info("\n" + "="*SEPARATOR_LENGTH + " REQUEST " + "="*SEPARATOR_LENGTH)
-    logging.info(f"🔗 Endpoint: {endpoint}")
+    if not _sample_request():
+        return
 
-    logging.info("\n📋 Headers:")
-    safe_headers = headers.copy()
-    if "api-key" in safe_headers:
-        api_key = safe_headers["api-key"]
-        safe_headers["api-key"] = f"{api_key[:API_KEY_PREVIEW_LENGTH]}...{api_key[-API_KEY_SUFFIX_LENGTH:]}" if len(api_key) > (API_KEY_PREVIEW_LENGTH + API_KEY_SUFFIX_LENGTH) else "***"
+    lines = ["\n" + "="*SEPARATOR_LENGTH + " REQUEST " + "="*SEPARATOR_LENGTH, f"🔗 Endpoint: {endpoint}", "\n📋 Headers:"]
+    for key, value in headers.items():
+        lines.append(f" {key}: {_mask_api_key(value) if key == 'api-key' else value}")
 
-    for key, value in safe_headers.items():
-        logging.info(f" {key}: {value}")
-
-    logging.info("\n📝 Request Body:")
+    lines.append("\n📝 Request Body:")
     messages = request_data.get("messages", [])
-    other_params = {k: v for k, v in request_data.items() if k != "messages"}
-
     if messages:
-        logging.info("  Messages:")
+        lines.append("  Messages:")
         for i, msg in enumerate(messages):
             role = msg.get("role", "unknown")
-            content = msg.get("content", "")
-            content_preview = content[:CONTENT_PREVIEW_LENGTH] + "..." if len(content) > CONTENT_PREVIEW_LENGTH else content
-            logging.info(f"   [{i+1}] {role.upper()}: {content_preview}")
+            lines.append(f"   [{i+1}] {role.upper()}: {_preview_content(msg.get('content', ''))}")
 
+    other_params = {k: v for k, v in request_data.items() if k != "messages"}
     if other_params:
-        logging.info("\n  Parameters:")
+        lines.append("\n  Parameters:")
         for key, value in sorted(other_params.items()):
-            logging.info(f"   {key}: {value}")
+            lines.append(f"   {key}: {_truncate(str(value), PARAMETER_PREVIEW_LENGTH)}")
+
+    lines.append("="*END_SEPARATOR_LENGTH)
+    logger.info(_truncate("\n".join(lines), settings.max_chars))
+
 
-    logging.info("="*END_SEPARATOR_LENGTH)
\ No newline at end of file
+def log_response(data: Dict[str, Any]) -> None:
+    """
+    Log a completion response body at DEBUG level.
+
+    The body is serialized only if DEBUG logging is enabled and the request it
+    answers was sampled by `print_request`, and the output is capped at the
+    configured size.
+
+    Args:
+        data (Dict[str, Any]): Parsed JSON response body
+    """
+    if not logger.isEnabledFor(logging.DEBUG) or not _request_sampled.get(settings.sample_rate == 1):
+        return
+    logger.debug(_truncate(json.dumps(data, indent=2), settings.max_chars))
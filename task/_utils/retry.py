@@ -0,0 +1,254 @@
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, FrozenSet, Mapping, Optional, Tuple, Type, TypeVar
+
+import httpx
+import requests
+
+from task._utils.metrics import metrics
+
+R = TypeVar("R")
+
+DEFAULT_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+"""
+HTTP status codes that are retried by default.
+"""
+
+DEFAULT_RETRY_EXCEPTIONS: Tuple[Type[BaseException], ...] = (
+    requests.ConnectionError,
+    requests.Timeout,
+    httpx.TransportError,
+)
+"""
+Transport-level exceptions that are retried by default.
+"""
+
+
+def parse_retry_after(headers: Any) -> Optional[float]:
+    """
+    Read the Retry-After header of a response, in seconds.
+
+    Args:
+        headers (Any): Response headers
+
+    Returns:
+        Optional[float]: Seconds to wait, or None if the header is missing or not numeric
+    """
+    if not isinstance(headers, Mapping):
+        return None
+    value = headers.get("Retry-After", headers.get("retry-after"))
+    if not isinstance(value, str):
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+class RetryBudget:
+    """
+    Process-wide limit on the ratio of retries to requests.
+
+    Every request deposits `ratio` tokens and every retry withdraws one, so under
+    widespread failures retries are capped at roughly `ratio` of the traffic instead
+    of multiplying it. A small reserve of `min_tokens` lets isolated failures retry
+    even when there has been little traffic.
+
+    Attributes:
+        ratio (float): Tokens deposited per request
+        max_tokens (float): Maximum number of tokens kept
+    """
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 10.0, min_tokens: float = 3.0):
+        """
+        Initialize the retry budget.
+
+        Args:
+            ratio (float): Tokens deposited per request
+            max_tokens (float): Maximum number of tokens kept
+            min_tokens (float): Tokens available initially
+        """
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = min(min_tokens, max_tokens)
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        """
+        Deposit tokens for one request.
+        """
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        """
+        Take one token for a retry.
+
+        Returns:
+            bool: True if the retry is allowed, False if the budget is exhausted
+        """
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+
+DEFAULT_RETRY_BUDGET = RetryBudget()
+"""
+Retry budget shared by all clients that do not provide their own.
+"""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Describes which failures are retried and how long to wait between attempts.
+
+    Delays grow exponentially from `base_delay` up to `max_delay`. With jitter
+    enabled a random delay between zero and that value is used, which spreads out
+    retries from many clients. A Retry-After header from the server is always honoured.
+
+    Attributes:
+        max_attempts (int): Maximum number of attempts, including the first one
+        retry_statuses (FrozenSet[int]): HTTP status codes that are retried
+        retry_exceptions (Tuple[Type[BaseException], ...]): Exceptions that are retried
+        base_delay (float): Delay before the first retry, in seconds
+        max_delay (float): Upper bound for a single delay, in seconds
+        max_elapsed (float): Retries are not started once this many seconds have passed
+        jitter (bool): Whether to randomize delays
+        budget (RetryBudget): Budget every retry is withdrawn from. Defaults to the shared DEFAULT_RETRY_BUDGET
+    """
+    max_attempts: int = 3
+    retry_statuses: FrozenSet[int] = DEFAULT_RETRY_STATUSES
+    retry_exceptions: Tuple[Type[BaseException], ...] = DEFAULT_RETRY_EXCEPTIONS
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    max_elapsed: float = 120.0
+    jitter: bool = True
+    budget: RetryBudget = field(default=DEFAULT_RETRY_BUDGET, compare=False)
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Compute the delay before the next attempt.
+
+        Args:
+            attempt (int): Number of the attempt that just failed, starting at 1
+            retry_after (Optional[float]): Delay requested by the server, if any
+
+        Returns:
+            float: Seconds to wait
+        """
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def next_delay(self, attempt: int, started: float, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Decide whether to retry after a failed attempt.
+
+        Args:
+            attempt (int): Number of the attempt that just failed, starting at 1
+            started (float): Monotonic time at which the first attempt started
+            retry_after (Optional[float]): Delay requested by the server, if any
+
+        Returns:
+            Optional[float]: Seconds to wait before retrying, or None to give up
+        """
+        if attempt >= self.max_attempts:
+            return None
+        delay = self.backoff(attempt, retry_after)
+        if time.monotonic() - started + delay > self.max_elapsed:
+            return None
+        if not self.budget.try_withdraw():
+            metrics.increment("retry.budget_exhausted")
+            return None
+        return delay
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
+"""
+Policy that sends each request exactly once.
+"""
+
+
+def call_with_retry(send: Callable[[], R], policy: RetryPolicy, **labels) -> R:
+    """
+    Send a request, retrying transient failures according to a policy.
+
+    Args:
+        send (Callable[[], R]): Sends one attempt and returns the response
+        policy (RetryPolicy): Retry policy to apply
+        **labels: Metric labels for the attempt and retry counters
+
+    Returns:
+        R: The last response received; it may still carry a retryable status
+        if the policy gave up
+
+    Raises:
+        Exception: The last exception raised by `send` if it is not retryable or
+        the policy gave up
+    """
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        attempt += 1
+        metrics.increment("model_client.attempts", **labels)
+        policy.budget.record_request()
+        try:
+            response = send()
+        except policy.retry_exceptions:
+            if (delay := policy.next_delay(attempt, started)) is None:
+                raise
+        else:
+            if response.status_code not in policy.retry_statuses:
+                return response
+            if (delay := policy.next_delay(attempt, started, parse_retry_after(response.headers))) is None:
+                return response
+            response.close()
+        metrics.increment("model_client.retries", **labels)
+        time.sleep(delay)
+
+
+async def async_call_with_retry(send: Callable[[], Awaitable[R]], policy: RetryPolicy, **labels) -> R:
+    """
+    Send a request without blocking the event loop, retrying transient failures.
+
+    Args:
+        send (Callable[[], Awaitable[R]]): Sends one attempt and returns the response
+        policy (RetryPolicy): Retry policy to apply
+        **labels: Metric labels for the attempt and retry counters
+
+    Returns:
+        R: The last response received; it may still carry a retryable status
+        if the policy gave up
+
+    Raises:
+        Exception: The last exception raised by `send` if it is not retryable or
+        the policy gave up
+    """
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        attempt += 1
+        metrics.increment("model_client.attempts", **labels)
+        policy.budget.record_request()
+        try:
+            response = await send()
+        except policy.retry_exceptions:
+            if (delay := policy.next_delay(attempt, started)) is None:
+                raise
+        else:
+            if response.status_code not in policy.retry_statuses:
+                return response
+            if (delay := policy.next_delay(attempt, started, parse_retry_after(response.headers))) is None:
+                return response
+            await response.aclose()
+        metrics.increment("model_client.retries", **labels)
+        await asyncio.sleep(delay)
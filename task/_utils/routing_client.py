@@ -0,0 +1,409 @@
+import random
+import threading
+import time
+from contextlib import AsyncExitStack
+from enum import StrEnum
+from typing import Any, Dict, Mapping, Optional, Sequence, Set, Union
+
+from task._models.message import Message
+from task._utils.metrics import metrics
+from task._utils.model_client import AsyncDialModelClient, ChatHistory, DialHTTPError, DialModelClient
+from task._utils.retry import DEFAULT_RETRY_EXCEPTIONS, NO_RETRY
+
+DEFAULT_EWMA_ALPHA = 0.3
+"""
+Default weight of the newest latency sample in the moving average.
+"""
+
+DEFAULT_FAILOVER_COOLDOWN = 5.0
+"""
+Default number of seconds a deployment is avoided after a failed request.
+"""
+
+
+class RoutingStrategy(StrEnum):
+    """
+    Enum representing how a deployment is picked for each request.
+
+    Attributes:
+        LEAST_OUTSTANDING: Fewest requests in flight relative to the deployment's weight
+        LATENCY_EWMA: Lowest moving-average latency, scaled by requests in flight and weight
+    """
+    LEAST_OUTSTANDING = "least_outstanding"
+    LATENCY_EWMA = "latency_ewma"
+
+
+def is_failover_error(error: BaseException) -> bool:
+    """
+    Check whether a failed request should be sent to another deployment.
+
+    Args:
+        error (BaseException): Exception raised by the request
+
+    Returns:
+        bool: True for 429 and 5xx responses and transport errors
+    """
+    if isinstance(error, DialHTTPError):
+        return error.status_code == 429 or error.status_code >= 500
+    return isinstance(error, DEFAULT_RETRY_EXCEPTIONS)
+
+
+def _deployment_client_kwargs(
+    pool: "DeploymentPool",
+    client_kwargs: Dict[str, Any],
+    deployment_kwargs: Optional[Mapping[str, Mapping[str, Any]]],
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Build the client arguments of every deployment in a pool.
+
+    Args:
+        pool (DeploymentPool): Pool the clients are created for
+        client_kwargs (Dict[str, Any]): Arguments shared by every deployment's client
+        deployment_kwargs (Optional[Mapping[str, Mapping[str, Any]]]): Arguments of single deployments,
+            such as their context_window, applied over the shared ones
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Client arguments by deployment name
+
+    Raises:
+        ValueError: If deployment_kwargs names a deployment that is not in the pool
+    """
+    overrides = deployment_kwargs or {}
+    if unknown := set(overrides) - set(pool.deployments):
+        raise ValueError(f"Client arguments given for unknown deployments: {', '.join(sorted(unknown))}")
+    client_kwargs.setdefault("retry_policy", NO_RETRY)
+    return {name: {**client_kwargs, **overrides.get(name, {})} for name in pool.deployments}
+
+
+class DeploymentState:
+    """
+    Load and latency statistics of one deployment in a pool.
+
+    Attributes:
+        name (str): Name of the model deployment
+        weight (float): Relative share of traffic the deployment should receive
+        outstanding (int): Requests currently in flight
+        latency (Optional[float]): Moving average of successful request latency in seconds, None until measured
+        cooldown_until (float): Monotonic time until which the deployment is avoided
+    """
+
+    def __init__(self, name: str, weight: float = 1.0):
+        """
+        Initialize the deployment state.
+
+        Args:
+            name (str): Name of the model deployment
+            weight (float): Relative share of traffic the deployment should receive
+
+        Raises:
+            ValueError: If the weight is not positive
+        """
+        if weight <= 0:
+            raise ValueError(f"Weight of deployment {name} must be positive, got {weight}")
+        self.name = name
+        self.weight = weight
+        self.outstanding = 0
+        self.latency: Optional[float] = None
+        self.cooldown_until = 0.0
+
+    def score(self, strategy: RoutingStrategy) -> float:
+        """
+        Cost of sending the next request to this deployment; lower is better.
+
+        Deployments without a latency sample score zero under LATENCY_EWMA, so each
+        one is tried before the averages decide.
+
+        Args:
+            strategy (RoutingStrategy): Routing strategy in use
+
+        Returns:
+            float: Routing score
+        """
+        load = (self.outstanding + 1) / self.weight
+        if strategy == RoutingStrategy.LATENCY_EWMA:
+            return (self.latency or 0.0) * load
+        return load
+
+
+class DeploymentPool:
+    """
+    Picks a deployment for each request and tracks the outcome.
+
+    Deployments in cooldown after a failure are only picked when every deployment
+    is cooling down. Ties are broken at random. The pool is safe to share between
+    threads and event-loop tasks.
+
+    Attributes:
+        strategy (RoutingStrategy): How deployments are ranked
+        ewma_alpha (float): Weight of the newest latency sample
+        cooldown (float): Seconds a deployment is avoided after a failed request
+        deployments (Dict[str, DeploymentState]): State of every deployment, by name
+    """
+
+    def __init__(
+        self,
+        deployments: Union[Sequence[str], Mapping[str, float]],
+        strategy: RoutingStrategy = RoutingStrategy.LEAST_OUTSTANDING,
+        ewma_alpha: float = DEFAULT_EWMA_ALPHA,
+        cooldown: float = DEFAULT_FAILOVER_COOLDOWN,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            deployments (Union[Sequence[str], Mapping[str, float]]): Deployment names, or names mapped to weights
+            strategy (RoutingStrategy): How deployments are ranked
+            ewma_alpha (float): Weight of the newest latency sample, between 0 and 1
+            cooldown (float): Seconds a deployment is avoided after a failed request
+
+        Raises:
+            ValueError: If no deployment is given or a weight is not positive
+        """
+        weights = dict(deployments) if isinstance(deployments, Mapping) else {name: 1.0 for name in deployments}
+        if not weights:
+            raise ValueError("At least one deployment is required")
+        self.strategy = strategy
+        self.ewma_alpha = ewma_alpha
+        self.cooldown = cooldown
+        self.deployments = {name: DeploymentState(name, weight) for name, weight in weights.items()}
+        self._lock = threading.Lock()
+
+    def acquire(self, exclude: Set[str]) -> Optional[str]:
+        """
+        Pick the best deployment and count a request in flight on it.
+
+        Args:
+            exclude (Set[str]): Deployments already tried for this request
+
+        Returns:
+            Optional[str]: Name of the picked deployment, or None if all are excluded
+        """
+        with self._lock:
+            now = time.monotonic()
+            candidates = [state for name, state in self.deployments.items() if name not in exclude]
+            if not candidates:
+                return None
+            best = min(candidates, key=lambda state: (state.cooldown_until > now, state.score(self.strategy), random.random()))
+            best.outstanding += 1
+            return best.name
+
+    def release(self, name: str, latency: Optional[float] = None, failed: bool = False) -> None:
+        """
+        Record the outcome of a request acquired with acquire().
+
+        Args:
+            name (str): Deployment the request was sent to
+            latency (Optional[float]): Latency of a successful request in seconds
+            failed (bool): Whether the deployment failed and should cool down
+        """
+        with self._lock:
+            state = self.deployments[name]
+            state.outstanding -= 1
+            if latency is not None:
+                state.latency = latency if state.latency is None else self.ewma_alpha * latency + (1 - self.ewma_alpha) * state.latency
+            if failed:
+                state.cooldown_until = time.monotonic() + self.cooldown
+
+
+class RoutingModelClient:
+    """
+    Client that spreads completions over interchangeable deployments.
+
+    Each request goes to the deployment picked by the pool. On a 429, a 5xx or a
+    transport error the deployment is put in cooldown and the request is sent to
+    the next best deployment, until every deployment has been tried once. The
+    per-deployment clients do not retry by default, since failover replaces retrying.
+
+    Attributes:
+        pool (DeploymentPool): Deployment selection and statistics
+        _clients (Dict[str, DialModelClient]): Client of each deployment
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        deployments: Union[Sequence[str], Mapping[str, float]],
+        api_key: str,
+        strategy: RoutingStrategy = RoutingStrategy.LEAST_OUTSTANDING,
+        ewma_alpha: float = DEFAULT_EWMA_ALPHA,
+        cooldown: float = DEFAULT_FAILOVER_COOLDOWN,
+        deployment_kwargs: Optional[Mapping[str, Mapping[str, Any]]] = None,
+        **client_kwargs: Any,
+    ):
+        """
+        Initialize the routing client.
+
+        Args:
+            endpoint (str): The API endpoint template for the models
+            deployments (Union[Sequence[str], Mapping[str, float]]): Deployment names, or names mapped to weights
+            api_key (str): API key for authentication
+            strategy (RoutingStrategy): How deployments are ranked
+            ewma_alpha (float): Weight of the newest latency sample, between 0 and 1
+            cooldown (float): Seconds a deployment is avoided after a failed request
+            deployment_kwargs (Optional[Mapping[str, Mapping[str, Any]]]): Arguments for the DialModelClient
+                of single deployments, such as their own context_window, applied over client_kwargs
+            **client_kwargs: Additional arguments for each DialModelClient
+
+        Raises:
+            ValueError: If the API key is empty, no deployment is given, a weight is not positive
+                or deployment_kwargs names an unknown deployment
+        """
+        self.pool = DeploymentPool(deployments, strategy, ewma_alpha, cooldown)
+        self._clients = {
+            name: DialModelClient(endpoint, name, api_key, **kwargs)
+            for name, kwargs in _deployment_client_kwargs(self.pool, client_kwargs, deployment_kwargs).items()
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the client of every deployment.
+        """
+        for client in self._clients.values():
+            client.close()
+
+    def get_completion(self, messages: ChatHistory, custom_fields: Optional[Dict[str, Any]] = None, **kwargs) -> Message:
+        """
+        Get a completion from the best available deployment, failing over on errors.
+
+        Args:
+            messages (ChatHistory): List of messages, or a conversation, to send to the model
+            custom_fields (Optional[Dict[str, Any]]): Optional custom fields for the request
+            **kwargs: Additional parameters to pass to the model
+
+        Returns:
+            Message: The response message from the model
+
+        Raises:
+            ValueError: If no choices or message is present in the response
+            DialHTTPError: If the request fails on every deployment, or fails with a non-failover status
+        """
+        tried: Set[str] = set()
+        while (name := self.pool.acquire(tried)) is not None:
+            tried.add(name)
+            started = time.perf_counter()
+            try:
+                message = self._clients[name].get_completion(messages, custom_fields, **kwargs)
+            except BaseException as e:
+                failover = is_failover_error(e)
+                self.pool.release(name, failed=failover)
+                if not failover or len(tried) == len(self._clients):
+                    raise
+                metrics.increment("routing.failovers", deployment=name)
+                continue
+            self.pool.release(name, latency=time.perf_counter() - started)
+            return message
+        raise RuntimeError("No deployment available")
+
+
+class AsyncRoutingModelClient:
+    """
+    Async client that spreads completions over interchangeable deployments.
+
+    Behaves like RoutingModelClient, with AsyncDialModelClient per deployment, so
+    requests in flight on the event loop count towards each deployment's load.
+
+    Attributes:
+        pool (DeploymentPool): Deployment selection and statistics
+        _clients (Dict[str, AsyncDialModelClient]): Client of each deployment
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        deployments: Union[Sequence[str], Mapping[str, float]],
+        api_key: str,
+        strategy: RoutingStrategy = RoutingStrategy.LEAST_OUTSTANDING,
+        ewma_alpha: float = DEFAULT_EWMA_ALPHA,
+        cooldown: float = DEFAULT_FAILOVER_COOLDOWN,
+        deployment_kwargs: Optional[Mapping[str, Mapping[str, Any]]] = None,
+        **client_kwargs: Any,
+    ):
+        """
+        Initialize the async routing client.
+
+        Args:
+            endpoint (str): The API endpoint template for the models
+            deployments (Union[Sequence[str], Mapping[str, float]]): Deployment names, or names mapped to weights
+            api_key (str): API key for authentication
+            strategy (RoutingStrategy): How deployments are ranked
+            ewma_alpha (float): Weight of the newest latency sample, between 0 and 1
+            cooldown (float): Seconds a deployment is avoided after a failed request
+            deployment_kwargs (Optional[Mapping[str, Mapping[str, Any]]]): Arguments for the AsyncDialModelClient
+                of single deployments, such as their own context_window, applied over client_kwargs
+            **client_kwargs: Additional arguments for each AsyncDialModelClient
+
+        Raises:
+            ValueError: If the API key is empty, no deployment is given, a weight is not positive
+                or deployment_kwargs names an unknown deployment
+        """
+        self.pool = DeploymentPool(deployments, strategy, ewma_alpha, cooldown)
+        self._clients = {
+            name: AsyncDialModelClient(endpoint, name, api_key, **kwargs)
+            for name, kwargs in _deployment_client_kwargs(self.pool, client_kwargs, deployment_kwargs).items()
+        }
+
+    async def __aenter__(self):
+        """
+        Async context manager entry point. Opens the client of every deployment.
+
+        If a client fails to open, the clients already opened are closed before the
+        error is raised.
+
+        Returns:
+            AsyncRoutingModelClient: Self instance for use in context manager
+        """
+        async with AsyncExitStack() as stack:
+            for client in self._clients.values():
+                await stack.enter_async_context(client)
+            stack.pop_all()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Close the client of every deployment.
+        """
+        for client in self._clients.values():
+            await client.aclose()
+
+    async def get_completion(self, messages: ChatHistory, custom_fields: Optional[Dict[str, Any]] = None, **kwargs) -> Message:
+        """
+        Get a completion from the best available deployment without blocking the event loop.
+
+        Args:
+            messages (ChatHistory): List of messages, or a conversation, to send to the model
+            custom_fields (Optional[Dict[str, Any]]): Optional custom fields for the request
+            **kwargs: Additional parameters to pass to the model
+
+        Returns:
+            Message: The response message from the model
+
+        Raises:
+            RuntimeError: If the client is not initialized
+            ValueError: If no choices or message is present in the response
+            DialHTTPError: If the request fails on every deployment, or fails with a non-failover status
+        """
+        tried: Set[str] = set()
+        while (name := self.pool.acquire(tried)) is not None:
+            tried.add(name)
+            started = time.perf_counter()
+            try:
+                message = await self._clients[name].get_completion(messages, custom_fields, **kwargs)
+            except BaseException as e:
+                failover = is_failover_error(e)
+                self.pool.release(name, failed=failover)
+                if not failover or len(tried) == len(self._clients):
+                    raise
+                metrics.increment("routing.failovers", deployment=name)
+                continue
+            self.pool.release(name, latency=time.perf_counter() - started)
+            return message
+        raise RuntimeError("No deployment available")
@@ -0,0 +1,65 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, TypeVar
+
+from task._utils.metrics import metrics
+
+R = TypeVar("R")
+
+
+class SingleFlight(Generic[R]):
+    """
+    Coalesces concurrent calls that share a key into a single execution.
+
+    The first caller for a key starts the call; callers arriving while it is still
+    running wait for the same result instead of starting their own. Once the call
+    finishes the key is released, so later callers start a fresh call.
+
+    The shared call runs as its own task, so cancelling one waiter does not cancel
+    the call for the others.
+
+    Attributes:
+        name (str): Prefix of the metric counting coalesced calls
+    """
+
+    def __init__(self, name: str = "singleflight"):
+        """
+        Initialize the coalescing group.
+
+        Args:
+            name (str): Prefix of the metric counting coalesced calls
+        """
+        self.name = name
+        self._calls: Dict[str, "asyncio.Task[R]"] = {}
+
+    def in_flight(self) -> int:
+        """
+        Number of distinct calls currently running.
+
+        Returns:
+            int: Count of keys with a call in progress
+        """
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[R]], **labels) -> R:
+        """
+        Run `fn` for `key`, or join the call already running for it.
+
+        Args:
+            key (str): Identifies calls that may share a result
+            fn (Callable[[], Awaitable[R]]): Starts the call when no call for the key is running
+            **labels: Metric labels for the hit counter
+
+        Returns:
+            R: Result of the shared call
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        else:
+            metrics.increment(f"{self.name}.hits", **labels)
+        return await asyncio.shield(task)
@@ -0,0 +1,181 @@
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from task._models.custom_content import ATTACHMENT_FIELDS, Attachment, CustomContent
+from task._models.message import Message
+from task._models.role import Role
+from task._utils.codec import loads
+
+SSE_DATA_PREFIX = "data:"
+SSE_DONE_MARKER = "[DONE]"
+
+
+@dataclass
+class CompletionChunk:
+    """
+    Represents one incremental piece of a streamed completion.
+
+    Attributes:
+        content (str): Text delta received in this chunk
+        attachments (List[Attachment]): Attachments that received updates in this chunk
+    """
+    content: str = ""
+    attachments: List[Attachment] = field(default_factory=list)
+
+
+def parse_sse_line(line: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse one server-sent-event line into a JSON payload.
+
+    Args:
+        line (str): Raw line received from the event stream
+
+    Returns:
+        Optional[Dict[str, Any]]: Parsed payload, or None for blank lines, comments,
+        non-data fields and the terminating [DONE] marker
+    """
+    if not line or not line.startswith(SSE_DATA_PREFIX):
+        return None
+    payload = line[len(SSE_DATA_PREFIX):].strip()
+    if not payload or payload == SSE_DONE_MARKER:
+        return None
+    return loads(payload)
+
+
+class MessageAssembler:
+    """
+    Accumulates streamed completion deltas into a complete Message.
+
+    Text deltas are collected in a list and joined once, and attachment deltas are
+    merged by their index so that fields split across several events are combined.
+    Attachments without an index are given the next free one.
+    """
+
+    def __init__(self):
+        self._role = Role.AI
+        self._parts: List[str] = []
+        self._attachments: Dict[int, Attachment] = {}
+        self._next_index = 0
+
+    def feed(self, payload: Dict[str, Any]) -> CompletionChunk:
+        """
+        Apply one parsed stream event.
+
+        Args:
+            payload (Dict[str, Any]): Parsed event payload
+
+        Returns:
+            CompletionChunk: The text and attachment updates carried by the event
+        """
+        chunk = CompletionChunk()
+        choices = payload.get("choices") or []
+        if not choices:
+            return chunk
+        delta = choices[0].get("delta") or {}
+
+        if role := delta.get("role"):
+            self._role = Role(role)
+        if content := delta.get("content"):
+            self._parts.append(content)
+            chunk.content = content
+
+        custom_content = delta.get("custom_content") or {}
+        for attachment_delta in custom_content.get("attachments") or []:
+            index = attachment_delta.get("index")
+            if index is None:
+                index = self._next_index
+            self._next_index = max(self._next_index, index + 1)
+            attachment = self._attachments.setdefault(index, Attachment())
+            for key in ATTACHMENT_FIELDS:
+                if (value := attachment_delta.get(key)) is not None:
+                    setattr(attachment, key, value)
+            chunk.attachments.append(attachment)
+        return chunk
+
+    def message(self) -> Message:
+        """
+        Build the message assembled from all deltas fed so far.
+
+        Returns:
+            Message: The assembled message
+        """
+        custom_content = None
+        if self._attachments:
+            custom_content = CustomContent(
+                attachments=[self._attachments[index] for index in sorted(self._attachments)]
+            )
+        return Message(
+            role=self._role,
+            content="".join(self._parts),
+            custom_content=custom_content
+        )
+
+
+class CompletionStream:
+    """
+    Iterator over a streamed completion.
+
+    Iterating yields CompletionChunk objects as events arrive. Once the stream is
+    exhausted, get_message() returns the assembled Message.
+    """
+
+    def __init__(self, lines: Iterator[str]):
+        """
+        Initialize the completion stream.
+
+        Args:
+            lines (Iterator[str]): Decoded lines of the server-sent-event response
+        """
+        self._lines = lines
+        self._assembler = MessageAssembler()
+
+    def __iter__(self) -> Iterator[CompletionChunk]:
+        for line in self._lines:
+            if (payload := parse_sse_line(line)) is not None:
+                yield self._assembler.feed(payload)
+
+    def get_message(self) -> Message:
+        """
+        Consume any remaining events and return the assembled message.
+
+        Returns:
+            Message: The assembled message
+        """
+        for _ in self:
+            pass
+        return self._assembler.message()
+
+
+class AsyncCompletionStream:
+    """
+    Async iterator over a streamed completion.
+
+    Iterating with `async for` yields CompletionChunk objects as events arrive. Once
+    the stream is exhausted, get_message() returns the assembled Message.
+    """
+
+    def __init__(self, lines: AsyncIterator[str]):
+        """
+        Initialize the async completion stream.
+
+        Args:
+            lines (AsyncIterator[str]): Decoded lines of the server-sent-event response
+        """
+        self._lines = lines
+        self._assembler = MessageAssembler()
+
+    async def __aiter__(self) -> AsyncIterator[CompletionChunk]:
+        async for line in self._lines:
+            if (payload := parse_sse_line(line)) is not None:
+                yield self._assembler.feed(payload)
+
+    async def get_message(self) -> Message:
+        """
+        Consume any remaining events and return the assembled message.
+
+        Returns:
+            Message: The assembled message
+        """
+        async for _ in self:
+            pass
+        return self._assembler.message()
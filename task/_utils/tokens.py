@@ -0,0 +1,42 @@
+from typing import Any, Dict
+
+CHARS_PER_TOKEN = 4
+"""
+Average number of characters per token used for rough estimates.
+"""
+
+IMAGE_PART_TOKENS = 765
+"""
+Estimated prompt tokens for one image content part (a high-detail 1024x1024 image).
+"""
+
+
+def estimate_message_tokens(message: Dict[str, Any]) -> int:
+    """
+    Roughly estimate the prompt tokens of one message in request form.
+
+    Text is estimated from its length, and every image, whether an image content
+    part or an image attachment, adds a fixed amount.
+
+    Args:
+        message (Dict[str, Any]): Message as produced by to_dict()
+
+    Returns:
+        int: Estimated token count
+    """
+    chars = 0
+    images = 0
+    content = message.get("content")
+    if isinstance(content, str):
+        chars += len(content)
+    elif isinstance(content, list):
+        for part in content:
+            if part.get("type") == "text":
+                chars += len(part.get("text", ""))
+            else:
+                images += 1
+    if custom_content := message.get("custom_content"):
+        for attachment in custom_content.get("attachments", []):
+            if str(attachment.get("type") or "").startswith("image/"):
+                images += 1
+    return chars // CHARS_PER_TOKEN + images * IMAGE_PART_TOKENS
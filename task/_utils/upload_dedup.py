@@ -0,0 +1,186 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import aiofiles
+
+from task._utils.bucket_client import DEFAULT_CHUNK_SIZE, DialBucketClient
+from task._utils.metrics import metrics
+
+DEFAULT_CONTENT_PREFIX = "cas"
+"""
+Default bucket folder that content-addressed uploads are stored under.
+"""
+
+
+async def file_sha256(path: Union[str, os.PathLike], chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+    """
+    Hash a file on disk without reading it into memory at once.
+
+    Args:
+        path (Union[str, os.PathLike]): Path of the file
+        chunk_size (int): Size of the chunks read from disk
+
+    Returns:
+        str: Hex SHA-256 digest of the file content
+    """
+    digest = hashlib.sha256()
+    async with aiofiles.open(path, "rb") as file:
+        while chunk := await file.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class UploadIndex:
+    """
+    Local JSON index of uploaded files keyed by content hash.
+
+    The index is rewritten atomically after every change, so an interrupted run
+    never leaves a corrupt file behind. Writes run in a worker thread so they do
+    not block the event loop.
+
+    Attributes:
+        path (Path): Location of the JSON index file
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        """
+        Initialize the index, loading existing entries if the file exists.
+
+        Args:
+            path (Union[str, os.PathLike]): Location of the JSON index file
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            self._entries = json.loads(self.path.read_text(encoding="utf-8"))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an uploaded file.
+
+        Args:
+            key (str): Index key of the file, see DedupUploader.index_key
+
+        Returns:
+            Optional[Dict[str, Any]]: The stored entry with the file URL, or None
+        """
+        with self._lock:
+            return self._entries.get(key)
+
+    async def set(self, key: str, entry: Dict[str, Any]) -> None:
+        """
+        Record an uploaded file and persist the index.
+
+        Args:
+            key (str): Index key of the file, see DedupUploader.index_key
+            entry (Dict[str, Any]): Upload details, including the file URL
+        """
+        with self._lock:
+            self._entries[key] = entry
+        await asyncio.to_thread(self._save)
+
+    async def remove(self, key: str) -> None:
+        """
+        Forget an uploaded file and persist the index.
+
+        Args:
+            key (str): Index key of the file, see DedupUploader.index_key
+        """
+        with self._lock:
+            removed = self._entries.pop(key, None) is not None
+        if removed:
+            await asyncio.to_thread(self._save)
+
+    def _save(self) -> None:
+        # The snapshot is taken under the save lock, so the last write always holds the latest entries.
+        with self._save_lock:
+            with self._lock:
+                data = json.dumps(self._entries, indent=2)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self.path.with_name(self.path.name + ".tmp")
+            temporary.write_text(data, encoding="utf-8")
+            os.replace(temporary, self.path)
+
+
+class DedupUploader:
+    """
+    Uploads files to the DIAL bucket under content-addressed names, skipping
+    content that has been uploaded before.
+
+    It exposes the same put_file() signature as DialBucketClient for files on disk,
+    so it can be passed wherever a bucket client is used for uploads.
+
+    Attributes:
+        client (DialBucketClient): Open bucket client used for uploads
+        index (UploadIndex): Index of previously uploaded content
+        verify (bool): Whether to check with a HEAD request that an indexed file still exists
+        prefix (str): Bucket folder that uploads are stored under
+    """
+
+    def __init__(self, client: DialBucketClient, index: UploadIndex, verify: bool = False, prefix: str = DEFAULT_CONTENT_PREFIX):
+        """
+        Initialize the uploader.
+
+        Args:
+            client (DialBucketClient): Open bucket client used for uploads
+            index (UploadIndex): Index of previously uploaded content
+            verify (bool): Whether to check with a HEAD request that an indexed file still exists
+            prefix (str): Bucket folder that uploads are stored under
+        """
+        self.client = client
+        self.index = index
+        self.verify = verify
+        self.prefix = prefix
+
+    async def index_key(self, digest: str) -> str:
+        """
+        Build the index key of content uploaded through this client.
+
+        The key includes the service URL and bucket, so one index can be shared
+        between DIAL environments and API keys without returning URLs from
+        another bucket.
+
+        Args:
+            digest (str): SHA-256 of the file content
+
+        Returns:
+            str: Key of the content in the upload index
+        """
+        return f"{self.client.base_url}/{await self.client.get_bucket_id()}/{digest}"
+
+    async def put_file(self, name: str, mime_type: str, content: Union[str, os.PathLike]) -> Dict[str, Any]:
+        """
+        Upload a file unless identical content is already in the bucket.
+
+        The file is stored as `<prefix>/<sha256><extension>`; `name` only supplies the extension.
+
+        Args:
+            name (str): Original name of the file
+            mime_type (str): MIME type of the file
+            content (Union[str, os.PathLike]): Path of the file on disk
+
+        Returns:
+            Dict[str, Any]: Upload result with the file URL
+        """
+        digest = await file_sha256(content)
+        key = await self.index_key(digest)
+        if (entry := self.index.get(key)) is not None:
+            if not self.verify or await self.client.file_exists(entry["url"]):
+                metrics.increment("upload_dedup.hits")
+                return {"url": entry["url"]}
+            await self.index.remove(key)
+
+        metrics.increment("upload_dedup.misses")
+        result = await self.client.put_file(f"{self.prefix}/{digest}{Path(name).suffix}", mime_type, content)
+        await self.index.set(key, {"url": result.get("url"), "name": name, "mime_type": mime_type})
+        return result
@@ -3,6 +3,7 @@ from enum import StrEnum
 from typing import Any
 
 from task._models.role import Role
+from task._utils.data_url import DataUrl
 
 class ContentType(StrEnum):
     """
@@ -15,15 +16,15 @@ class ContentType(StrEnum):
     IMAGE = "image_url"
     TEXT = "text"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ImgUrl:
     """
     Represents an image URL with associated metadata.
     
     Attributes:
-        url (str): The URL of the image
+        url (str | DataUrl): The URL of the image, or a lazily encoded data URL
     """
-    url: str
+    url: str | DataUrl
 
     def to_dict(self) -> dict[str, Any]:
         """
@@ -36,7 +37,7 @@ class ImgUrl:
             "url": self.url
         }
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ImgContent:
     """
     Represents image content with an image URL and type.
@@ -61,7 +62,7 @@ class ImgContent:
         }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TxtContent:
     """
     Represents text content with associated type.
@@ -86,7 +87,7 @@ class TxtContent:
         }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ContentedMessage:
     """
     Represents a message with a role and a list of content items.
@@ -1,8 +1,9 @@
-import base64
 import logging
 from pathlib import Path
 
 from task._utils.constants import API_KEY, DEFAULT_IMAGE_URL, DIAL_CHAT_COMPLETIONS_ENDPOINT
+from task._utils.data_url import BytesDataUrl, FileDataUrl
+from task._utils.image_preprocess import ImageSettings, PreprocessedImageCache, prepare_image_bytes
 from task._utils.model_client import DialModelClient
 from task._models.role import Role
 from task.image_to_text.openai.message import ContentedMessage, TxtContent, ImgContent, ImgUrl
@@ -11,40 +12,48 @@ from task._models.message import Message
 
 def convert_contented_message_to_message(contented_message: ContentedMessage) -> Message:
     """
-    Convert a ContentedMessage to a standard Message object.
+    Convert a ContentedMessage to a text-only Message object.
+
+    Only the text parts are kept. DialModelClient accepts ContentedMessage directly,
+    which keeps images as image parts; use this only where plain text is required.
     
     Args:
         contented_message (ContentedMessage): The ContentedMessage to convert
         
     Returns:
-        Message: A standard Message object with combined content
+        Message: A standard Message object with the text parts joined
     """
-    text_content = ""
-    for content_item in contented_message.content:
-        if isinstance(content_item, TxtContent):
-            text_content += content_item.text
-        elif isinstance(content_item, ImgContent):
-            text_content += f"[Image: {content_item.image_url.url}] "
-    
     return Message(
         role=contented_message.role,
-        content=text_content
+        content="".join(item.text for item in contented_message.content if isinstance(item, TxtContent))
     )
 
 
-def start() -> None:
+def start(preprocess: bool = False) -> None:
     """
     Start the image analysis process using OpenAI's GPT-4 Vision model.
     
-    This function loads an image, converts it to base64, and sends it to the model
-    for analysis with a prompt asking what is visible in the image.
+    This function wraps the image in a base64 data URL that is memory-mapped and
+    encoded in chunks while the request is sent, and sends it to the model for
+    analysis with a prompt asking what is visible in the image.
+
+    Args:
+        preprocess (bool): Whether to downscale and recompress the image to the model's
+            maximum dimension before embedding it. Requires Pillow
     """
     project_root = Path(__file__).parent.parent.parent.parent
     image_path = project_root / "dialx-banner.png"
 
-    with open(image_path, "rb") as image_file:
-        image_bytes = image_file.read()
-    base64_image = base64.b64encode(image_bytes).decode('utf-8')
+    if preprocess:
+        with open(image_path, "rb") as image_file:
+            image_bytes, mime_type = image_file.read(), "image/png"
+        if image_bytes:
+            image_bytes, mime_type = prepare_image_bytes(
+                image_bytes, mime_type, ImageSettings.for_model('gpt-4o'), PreprocessedImageCache()
+            )
+        image = BytesDataUrl(image_bytes, mime_type)
+    else:
+        image = FileDataUrl(image_path, "image/png")
 
     client = DialModelClient(
         endpoint=DIAL_CHAT_COMPLETIONS_ENDPOINT,
@@ -52,10 +61,10 @@ def start() -> None:
         api_key=API_KEY
     )
 
-    if not base64_image:
+    if not image.size:
        img_url = ImgUrl(url=DEFAULT_IMAGE_URL)
     else:
-       img_url = ImgUrl(url=f"data:image/png;base64,{base64_image}")
+       img_url = ImgUrl(url=image)
     
     img_content = ImgContent(image_url=img_url)
     txt_content = TxtContent(text="What do you see on this picture?")
@@ -65,9 +74,7 @@ def start() -> None:
         content=[img_content, txt_content]
     )
     
-    message_as_message = convert_contented_message_to_message(message)
-    
-    result = client.get_completion([message_as_message])
+    result = client.get_completion([message])
     logging.info(result.content)
 
 
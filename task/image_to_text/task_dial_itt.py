@@ -1,64 +1,142 @@
 import asyncio
-from io import BytesIO
+import mimetypes
 from pathlib import Path
 import logging
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from task._models.custom_content import Attachment, CustomContent
 from task._utils.constants import API_KEY, DIAL_URL, DIAL_CHAT_COMPLETIONS_ENDPOINT
 from task._utils.bucket_client import DialBucketClient
-from task._utils.model_client import DialModelClient
+from task._utils.image_preprocess import ImageSettings, prepare_image_file
+from task._utils.model_client import AsyncDialModelClient
+from task._utils.upload_dedup import DedupUploader, UploadIndex
 from task._models.message import Message
 from task._models.role import Role
 
+DEFAULT_UPLOAD_CONCURRENCY = 8
+"""
+Default number of images uploaded to the DIAL bucket at the same time.
+"""
 
-async def _put_image(file_name: str = 'dialx-banner.png', mime_type: str = 'image/png') -> Attachment:
+
+async def _upload_image(
+    client: Union[DialBucketClient, DedupUploader],
+    file_name: str,
+    mime_type: str,
+    image_settings: Optional[ImageSettings] = None,
+) -> Attachment:
+    """
+    Upload an image file through an open bucket client.
+
+    The file is streamed from disk rather than read into memory. With image settings,
+    a downscaled and recompressed variant is uploaded instead of the original.
+
+    Args:
+        client (Union[DialBucketClient, DedupUploader]): Open bucket client or deduplicating uploader
+        file_name (str): Name of the image file to upload
+        mime_type (str): MIME type of the image
+        image_settings (Optional[ImageSettings]): Size and encoding to preprocess the image to
+
+    Returns:
+        Attachment: An attachment object containing the uploaded image information
+    """
+    image_path = Path(__file__).parent.parent.parent / file_name
+    upload_name = file_name
+
+    if image_settings is not None:
+        image_path, processed_type = await asyncio.to_thread(prepare_image_file, image_path, mime_type, image_settings)
+        if processed_type != mime_type:
+            upload_name = str(Path(file_name).with_suffix(image_settings.extension))
+            mime_type = processed_type
+
+    result = await client.put_file(upload_name, mime_type, image_path)
+
+    return Attachment(
+        title=file_name,
+        url=result.get("url"),
+        type=mime_type
+    )
+
+
+async def _put_image(
+    file_name: str = 'dialx-banner.png',
+    mime_type: str = 'image/png',
+    client: Optional[Union[DialBucketClient, DedupUploader]] = None,
+    image_settings: Optional[ImageSettings] = None,
+) -> Attachment:
     """
     Upload an image file to the DIAL bucket and return an attachment object.
     
     Args:
         file_name (str): Name of the image file to upload. Defaults to 'dialx-banner.png'
         mime_type (str): MIME type of the image. Defaults to 'image/png'
+        client (Optional[Union[DialBucketClient, DedupUploader]]): Open bucket client or
+            deduplicating uploader to reuse. A new client is opened for this upload when omitted
+        image_settings (Optional[ImageSettings]): Size and encoding to preprocess the image to
         
     Returns:
         Attachment: An attachment object containing the uploaded image information
     """
-    image_path = Path(__file__).parent.parent.parent / file_name
+    if client is not None:
+        return await _upload_image(client, file_name, mime_type, image_settings)
     async with DialBucketClient(api_key=API_KEY, base_url=DIAL_URL) as client:
-        with open(image_path, "rb") as image_file:
-            image_bytes = image_file.read()
-        
-        image_io = BytesIO(image_bytes)
-        
-        result = await client.put_file(file_name, mime_type, image_io)
+        return await _upload_image(client, file_name, mime_type, image_settings)
+
+
+async def _put_images(
+    filenames: List[str],
+    client: Union[DialBucketClient, DedupUploader],
+    concurrency: int = DEFAULT_UPLOAD_CONCURRENCY,
+    image_settings: Optional[ImageSettings] = None,
+) -> List[Attachment]:
+    """
+    Upload several image files concurrently through one bucket client.
+    
+    Args:
+        filenames (List[str]): Names of the image files to upload
+        client (Union[DialBucketClient, DedupUploader]): Open bucket client or deduplicating uploader shared by all uploads
+        concurrency (int): Maximum number of uploads running at the same time
+        image_settings (Optional[ImageSettings]): Size and encoding to preprocess the images to
         
-        return Attachment(
-            title=file_name,
-            url=result.get("url"),
-            type=mime_type
-        )
+    Returns:
+        List[Attachment]: Attachments in the same order as `filenames`
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def upload(filename: str) -> Attachment:
+        mime_type = mimetypes.guess_type(filename)[0] or 'image/png'
+        async with semaphore:
+            return await _put_image(filename, mime_type, client=client, image_settings=image_settings)
+
+    return await asyncio.gather(*(upload(filename) for filename in filenames))
 
 
-async def start_async(filenames: Optional[List[str]] = None, model: str = 'anthropic.claude-v3-haiku') -> None:
+async def start_async(
+    filenames: Optional[List[str]] = None,
+    model: str = 'anthropic.claude-v3-haiku',
+    upload_concurrency: int = DEFAULT_UPLOAD_CONCURRENCY,
+    dedup_index: Optional[str] = None,
+    preprocess: bool = False,
+) -> None:
     """
     Asynchronously analyze images using a specified model.
     
     Args:
         filenames (Optional[List[str]]): List of image filenames to analyze. Defaults to ['dialx-banner.png']
         model (str): Name of the model to use for analysis. Defaults to 'anthropic.claude-v3-haiku'
+        upload_concurrency (int): Maximum number of images uploaded at the same time
+        dedup_index (Optional[str]): Path of a JSON upload index. When set, images whose
+            content was uploaded before are not uploaded again
+        preprocess (bool): Whether to downscale and recompress images to the model's
+            maximum dimension before upload. Requires Pillow
     """
     if filenames is None:
         filenames = ['dialx-banner.png']
-        
-    client = DialModelClient(
-        endpoint=DIAL_CHAT_COMPLETIONS_ENDPOINT,
-        deployment_name=model,
-        api_key=API_KEY
-    )
-    
-    attachments = []
-    for filename in filenames:
-        attachments.append(await _put_image(filename))
+
+    async with DialBucketClient(api_key=API_KEY, base_url=DIAL_URL) as bucket_client:
+        uploader = DedupUploader(bucket_client, UploadIndex(dedup_index)) if dedup_index else bucket_client
+        image_settings = ImageSettings.for_model(model) if preprocess else None
+        attachments = await _put_images(filenames, uploader, upload_concurrency, image_settings)
     
     logging.info("Attachments: %s", attachments)
     
@@ -68,7 +146,12 @@ async def start_async(filenames: Optional[List[str]] = None, model: str = 'anthr
         custom_content=CustomContent(attachments=attachments)
     )
     
-    result = client.get_completion([message])
+    async with AsyncDialModelClient(
+        endpoint=DIAL_CHAT_COMPLETIONS_ENDPOINT,
+        deployment_name=model,
+        api_key=API_KEY
+    ) as client:
+        result = await client.get_completion([message])
     
     logging.info(f"Model {model}: {result.content}")
 
@@ -85,4 +168,4 @@ def start(filenames: Optional[List[str]] = None) -> None:
 
 if __name__ == "__main__":
     start()
-    
\ No newline at end of file
+    
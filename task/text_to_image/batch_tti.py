@@ -0,0 +1,306 @@
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from task._models.message import Message
+from task._models.role import Role
+from task._utils.batch import BatchReport, run_batch
+from task._utils.bucket_client import DialBucketClient
+from task._utils.constants import API_KEY, DIAL_URL, DIAL_CHAT_COMPLETIONS_ENDPOINT
+from task._utils.model_client import AsyncDialModelClient
+from task.text_to_image.task_tti import Quality, Size, Style
+
+ALL_SIZES = (Size.square, Size.height_rectangle, Size.width_rectangle)
+"""
+Every size option supported by the image generation deployment.
+"""
+
+ALL_QUALITIES = (Quality.standard, Quality.hd)
+"""
+Every quality option supported by the image generation deployment.
+"""
+
+ALL_STYLES = (Style.natural, Style.vivid)
+"""
+Every style option supported by the image generation deployment.
+"""
+
+DEFAULT_GENERATION_CONCURRENCY = 4
+"""
+Default number of image generations kept in flight at once.
+"""
+
+DEFAULT_REQUESTS_PER_MINUTE = 10
+"""
+Default request budget per minute for the image generation deployment.
+"""
+
+
+@dataclass(frozen=True)
+class GenerationJob:
+    """
+    One prompt rendered with one combination of generation parameters.
+
+    Attributes:
+        prompt (str): Text prompt to generate an image from
+        size (str): Image size option
+        quality (str): Image quality option
+        style (str): Image style option
+    """
+    prompt: str
+    size: str
+    quality: str
+    style: str
+
+    @property
+    def key(self) -> str:
+        """
+        Stable identifier of the (prompt, params) combination, used for resume and file names.
+        """
+        canonical = json.dumps([self.prompt, self.size, self.quality, self.style], ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+    def custom_fields(self) -> Dict[str, str]:
+        """
+        Build the custom fields sent with the completion request.
+
+        Returns:
+            Dict[str, str]: Size, quality and style of the generation
+        """
+        return {"size": self.size, "quality": self.quality, "style": self.style}
+
+
+class GenerationManifest:
+    """
+    Append-only JSON Lines record of finished generations.
+
+    Every job writes one line as soon as it finishes, so a crashed or interrupted run
+    loses at most the jobs that were in flight. Successful keys are skipped when the
+    same manifest is used again.
+
+    Attributes:
+        _path (Path): Location of the manifest file
+        _completed (Set[str]): Keys of jobs that completed successfully
+    """
+
+    def __init__(self, path: Path):
+        """
+        Open a manifest, loading the keys of already completed jobs.
+
+        Args:
+            path (Path): Location of the manifest file. It is created on the first append
+        """
+        self._path = Path(path)
+        self._completed: Set[str] = set()
+        if self._path.exists():
+            with open(self._path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if record.get("status") == "ok":
+                        self._completed.add(record["key"])
+
+    @property
+    def completed(self) -> Set[str]:
+        """
+        Keys of jobs that completed successfully.
+        """
+        return self._completed
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """
+        Write one finished job to the manifest.
+
+        Args:
+            record (Dict[str, Any]): Job record containing at least "key" and "status"
+        """
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        if record.get("status") == "ok":
+            self._completed.add(record["key"])
+
+
+def load_prompts(path: Path) -> List[str]:
+    """
+    Read prompts from a text file, one per line.
+
+    Blank lines and lines starting with "#" are ignored.
+
+    Args:
+        path (Path): Location of the prompts file
+
+    Returns:
+        List[str]: Prompts in file order
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+def build_jobs(
+    prompts: Iterable[str],
+    sizes: Sequence[str] = ALL_SIZES,
+    qualities: Sequence[str] = ALL_QUALITIES,
+    styles: Sequence[str] = ALL_STYLES,
+) -> List[GenerationJob]:
+    """
+    Expand prompts over the cartesian product of the parameter grid.
+
+    Args:
+        prompts (Iterable[str]): Prompts to render
+        sizes (Sequence[str]): Size options to render each prompt with
+        qualities (Sequence[str]): Quality options to render each prompt with
+        styles (Sequence[str]): Style options to render each prompt with
+
+    Returns:
+        List[GenerationJob]: One job per (prompt, size, quality, style) combination
+    """
+    return [
+        GenerationJob(prompt=prompt, size=size, quality=quality, style=style)
+        for prompt, size, quality, style in itertools.product(prompts, sizes, qualities, styles)
+    ]
+
+
+async def run_generation(
+    jobs: Sequence[GenerationJob],
+    manifest: GenerationManifest,
+    output_dir: Path,
+    model: str = 'dall-e-3',
+    concurrency: int = DEFAULT_GENERATION_CONCURRENCY,
+    requests_per_minute: Optional[int] = DEFAULT_REQUESTS_PER_MINUTE,
+) -> BatchReport[List[str]]:
+    """
+    Generate images for many jobs with bounded concurrency, skipping completed ones.
+
+    Images are written to the output directory and recorded in the manifest as each
+    job finishes. Failed jobs are recorded too, and are tried again on the next run.
+
+    Args:
+        jobs (Sequence[GenerationJob]): Jobs to run
+        manifest (GenerationManifest): Manifest used to skip and record jobs
+        output_dir (Path): Directory the generated images are written to
+        model (str): Image generation deployment name
+        concurrency (int): Maximum number of generations in flight at once
+        requests_per_minute (Optional[int]): Request budget per minute for the deployment
+
+    Returns:
+        BatchReport[List[str]]: Written image files per pending job and throughput statistics
+    """
+    pending = [job for job in jobs if job.key not in manifest.completed]
+    logging.info(f"Generating {len(pending)} images, skipping {len(jobs) - len(pending)} already completed")
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    async with AsyncDialModelClient(
+        endpoint=DIAL_CHAT_COMPLETIONS_ENDPOINT,
+        deployment_name=model,
+        api_key=API_KEY,
+        requests_per_minute=requests_per_minute,
+    ) as model_client, DialBucketClient(api_key=API_KEY, base_url=DIAL_URL) as bucket_client:
+
+        async def generate(job: GenerationJob) -> List[str]:
+            record: Dict[str, Any] = {"key": job.key, **asdict(job)}
+            started = time.perf_counter()
+            try:
+                result = await model_client.get_completion(
+                    messages=[Message(role=Role.USER, content=job.prompt)],
+                    custom_fields=job.custom_fields(),
+                )
+                attachments = result.custom_content.attachments if result.custom_content else None
+                files = []
+                for index, attachment in enumerate(attachments or []):
+                    if attachment.url:
+                        path = output_dir / f"{job.key}_{index}.png"
+                        await bucket_client.download_to(attachment.url, path)
+                        files.append(str(path))
+            except Exception as e:
+                manifest.append({**record, "status": "error", "error": str(e), "latency": round(time.perf_counter() - started, 3)})
+                raise
+            manifest.append({**record, "status": "ok", "files": files, "latency": round(time.perf_counter() - started, 3)})
+            return files
+
+        return await run_batch(pending, generate, concurrency)
+
+
+async def start_async(
+    prompts: Optional[Sequence[str]] = None,
+    prompts_file: Optional[Path] = None,
+    sizes: Sequence[str] = ALL_SIZES,
+    qualities: Sequence[str] = ALL_QUALITIES,
+    styles: Sequence[str] = ALL_STYLES,
+    output_dir: Path = Path("generated_images"),
+    concurrency: int = DEFAULT_GENERATION_CONCURRENCY,
+    requests_per_minute: Optional[int] = DEFAULT_REQUESTS_PER_MINUTE,
+) -> None:
+    """
+    Asynchronously generate images for every prompt over a parameter grid.
+
+    The manifest is kept in the output directory, so running again with the same
+    output directory resumes where the previous run stopped.
+
+    Args:
+        prompts (Optional[Sequence[str]]): Prompts to render
+        prompts_file (Optional[Path]): File with one prompt per line, used in addition to prompts
+        sizes (Sequence[str]): Size options to render each prompt with
+        qualities (Sequence[str]): Quality options to render each prompt with
+        styles (Sequence[str]): Style options to render each prompt with
+        output_dir (Path): Directory for the generated images and the manifest
+        concurrency (int): Maximum number of generations in flight at once
+        requests_per_minute (Optional[int]): Request budget per minute for the deployment
+    """
+    all_prompts = list(prompts or [])
+    if prompts_file is not None:
+        all_prompts.extend(load_prompts(prompts_file))
+
+    jobs = build_jobs(all_prompts, sizes, qualities, styles)
+    manifest = GenerationManifest(Path(output_dir) / "manifest.jsonl")
+    report = await run_generation(
+        jobs,
+        manifest,
+        output_dir,
+        concurrency=concurrency,
+        requests_per_minute=requests_per_minute,
+    )
+    logging.info(f"Batch generation finished: {report.succeeded} succeeded, {report.failed} failed")
+
+
+def start(prompts_file: Path, output_dir: Path = Path("generated_images")) -> None:
+    """
+    Synchronously generate images for every prompt in a file over the full parameter grid.
+
+    Args:
+        prompts_file (Path): File with one prompt per line
+        output_dir (Path): Directory for the generated images and the manifest
+    """
+    asyncio.run(start_async(prompts_file=prompts_file, output_dir=output_dir))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate images for many prompts over a parameter grid")
+    parser.add_argument("prompts_file", type=Path, help="File with one prompt per line")
+    parser.add_argument("--output-dir", type=Path, default=Path("generated_images"))
+    parser.add_argument("--size", action="append", choices=ALL_SIZES, help="Size option; repeat to select several")
+    parser.add_argument("--quality", action="append", choices=ALL_QUALITIES, help="Quality option; repeat to select several")
+    parser.add_argument("--style", action="append", choices=ALL_STYLES, help="Style option; repeat to select several")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_GENERATION_CONCURRENCY)
+    parser.add_argument("--rpm", type=int, default=DEFAULT_REQUESTS_PER_MINUTE, help="Requests per minute budget")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(start_async(
+        prompts_file=args.prompts_file,
+        sizes=args.size or ALL_SIZES,
+        qualities=args.quality or ALL_QUALITIES,
+        styles=args.style or ALL_STYLES,
+        output_dir=args.output_dir,
+        concurrency=args.concurrency,
+        requests_per_minute=args.rpm,
+    ))
@@ -1,12 +1,18 @@
 import asyncio
 from datetime import datetime
+import hashlib
+import json
 import logging
-from typing import List
+import time
+from typing import Any, Dict, List, Optional
+
+import aiofiles
+import aiofiles.os
 
 from task._models.custom_content import Attachment
 from task._utils.constants import API_KEY, DIAL_URL, DIAL_CHAT_COMPLETIONS_ENDPOINT
-from task._utils.bucket_client import DialBucketClient
-from task._utils.model_client import DialModelClient
+from task._utils.bucket_client import PARTIAL_SUFFIX, DialBucketClient
+from task._utils.model_client import AsyncDialModelClient
 from task._models.message import Message
 from task._models.role import Role
 
@@ -47,25 +53,111 @@ class Quality:
     standard: str = "standard"
     hd: str = "hd"
 
-async def _save_images(attachments: List[Attachment]):
+DEFAULT_DOWNLOAD_CONCURRENCY = 4
+"""
+Default maximum number of generated images downloaded at the same time.
+"""
+
+
+def _image_filename(timestamp: str, index: int, digest: str) -> str:
     """
-    Save image attachments locally with timestamped filenames.
-    
+    Build a collision-free local filename for a generated image.
+
+    Args:
+        timestamp (str): Timestamp shared by all images saved in one call
+        index (int): Position of the attachment in the response
+        digest (str): Hex SHA-256 of the downloaded image content
+
+    Returns:
+        str: Filename made of the timestamp, attachment index and a short content hash
+    """
+    return f"generated_image_{timestamp}_{index}_{digest[:8]}.png"
+
+
+async def _save_image(
+    client: DialBucketClient,
+    attachment: Attachment,
+    index: int,
+    timestamp: str,
+    semaphore: asyncio.Semaphore,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Download one image attachment and write it, with an optional metadata sidecar.
+
+    The image is streamed to a partial file and hashed chunk by chunk, then renamed
+    once its content hash is known, so it is never held in memory as a whole and no
+    blocking file I/O runs on the event loop.
+
+    Args:
+        client (DialBucketClient): Open bucket client to download with
+        attachment (Attachment): Image attachment to save
+        index (int): Position of the attachment in the response
+        timestamp (str): Timestamp shared by all images saved in one call
+        semaphore (asyncio.Semaphore): Semaphore bounding concurrent downloads
+        metadata (Optional[Dict[str, Any]]): Generation details written next to the image
+
+    Returns:
+        str: Name of the written image file
+    """
+    partial = f"generated_image_{timestamp}_{index}.png{PARTIAL_SUFFIX}"
+    digest = hashlib.sha256()
+    size = 0
+    async with semaphore:
+        started = time.perf_counter()
+        async with aiofiles.open(partial, "wb") as f:
+            async for chunk in client.iter_file(attachment.url):
+                digest.update(chunk)
+                size += len(chunk)
+                await f.write(chunk)
+        download_latency = time.perf_counter() - started
+
+    filename = _image_filename(timestamp, index, digest.hexdigest())
+    await aiofiles.os.replace(partial, filename)
+
+    if metadata is not None:
+        record = {
+            **metadata,
+            "file": filename,
+            "source_url": attachment.url,
+            "bytes": size,
+            "download_latency": round(download_latency, 3),
+        }
+        async with aiofiles.open(f"{filename}.json", "w") as f:
+            await f.write(json.dumps(record, indent=2))
+
+    logging.info(f"Image saved locally as {filename}")
+    return filename
+
+
+async def _save_images(
+    attachments: List[Attachment],
+    metadata: Optional[Dict[str, Any]] = None,
+    concurrency: int = DEFAULT_DOWNLOAD_CONCURRENCY,
+) -> List[str]:
+    """
+    Save image attachments locally, downloading them concurrently over one bucket client.
+
+    Filenames combine a timestamp, the attachment index and a content hash, so images
+    generated within the same second never overwrite each other.
+
     Args:
         attachments (List[Attachment]): List of image attachments to save
+        metadata (Optional[Dict[str, Any]]): Generation details (prompt, size, quality,
+            style, latency) written to a ``<image>.json`` sidecar. No sidecar is written when omitted
+        concurrency (int): Maximum number of images downloaded at the same time
+
+    Returns:
+        List[str]: Names of the written image files, in attachment order
     """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    semaphore = asyncio.Semaphore(concurrency)
     async with DialBucketClient(api_key=API_KEY, base_url=DIAL_URL) as client:
-        for attachment in attachments:
-            if attachment.url:
-                image_bytes = await client.get_file(attachment.url)
-                
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"generated_image_{timestamp}.png"
-                
-                with open(filename, "wb") as f:
-                    f.write(image_bytes)
-                
-                logging.info(f"Image saved locally as {filename}")
+        return list(await asyncio.gather(*(
+            _save_image(client, attachment, index, timestamp, semaphore, metadata)
+            for index, attachment in enumerate(attachments)
+            if attachment.url
+        )))
 
 
 async def start_async(prompt: str = "Sunny day on Bali") -> None:
@@ -76,12 +168,6 @@ async def start_async(prompt: str = "Sunny day on Bali") -> None:
         prompt (str): The text prompt to generate an image from. Defaults to "Sunny day on Bali"
     """
     try:
-        client = DialModelClient(
-            endpoint=DIAL_CHAT_COMPLETIONS_ENDPOINT,
-            deployment_name='dall-e-3',
-            api_key=API_KEY
-        )
-        
         message = Message(
             role=Role.USER,
             content=prompt
@@ -93,13 +179,21 @@ async def start_async(prompt: str = "Sunny day on Bali") -> None:
             "style": Style.vivid
         }
         
-        result = client.get_completion(
-            messages=[message],
-            custom_fields=custom_fields
-        )
+        async with AsyncDialModelClient(
+            endpoint=DIAL_CHAT_COMPLETIONS_ENDPOINT,
+            deployment_name='dall-e-3',
+            api_key=API_KEY
+        ) as client:
+            started = time.perf_counter()
+            result = await client.get_completion(
+                messages=[message],
+                custom_fields=custom_fields
+            )
+            latency = time.perf_counter() - started
         
         if result.custom_content and result.custom_content.attachments:
-            await _save_images(result.custom_content.attachments)
+            metadata = {"prompt": prompt, **custom_fields, "latency": round(latency, 3)}
+            await _save_images(result.custom_content.attachments, metadata=metadata)
             logging.info("Image generation completed successfully!")
         else:
             logging.info("No attachments found in the response.")
@@ -9,6 +9,14 @@ from tests.test_data import TEST_API_KEY, TEST_ATTACHMENT_TITLE, TEST_ATTACHMENT
 os.environ['DIAL_API_KEY'] = TEST_API_KEY
 
 
+@pytest.fixture(autouse=True)
+def clear_bucket_id_cache():
+    from task._utils.bucket_client import bucket_id_cache
+    bucket_id_cache.clear()
+    yield
+    bucket_id_cache.clear()
+
+
 @pytest.fixture
 def CHOICES_DATA():
     from tests.test_data import CHOICES_DATA
@@ -38,6 +38,7 @@ class MockDialBucketClient:
 
         self._client = AsyncMock()
         self._bucket_id = "mock_bucket_id"
+        self.base_url = kwargs.get("base_url", "https://mock-dial")
 
     async def __aenter__(self):
         return self
@@ -46,4 +47,10 @@ class MockDialBucketClient:
         pass
 
     async def _get_bucket(self):
-        return self._bucket_id
\ No newline at end of file
+        return self._bucket_id
+
+    async def get_bucket_id(self):
+        return self._bucket_id
+
+    async def iter_file(self, url, chunk_size=None):
+        yield await self.get_file(url)
\ No newline at end of file
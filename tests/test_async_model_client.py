@@ -0,0 +1,84 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from task._models.message import Message
+from task._models.role import Role
+from task._utils.model_client import AsyncDialModelClient
+from tests.test_data import API_KEY_ERROR_MESSAGE, TEST_API_KEY, TEST_CONTENT, TEST_ENDPOINT, TEST_MODEL_NAME
+
+
+def make_client(**kwargs):
+    return AsyncDialModelClient(
+        endpoint=TEST_ENDPOINT,
+        deployment_name=TEST_MODEL_NAME,
+        api_key=TEST_API_KEY,
+        **kwargs
+    )
+
+
+def make_response(status_code=200, json_data=None, text=""):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = json_data
+    response.text = text
+    return response
+
+
+def test_empty_api_key_rejected():
+    with pytest.raises(ValueError, match=API_KEY_ERROR_MESSAGE):
+        AsyncDialModelClient(endpoint=TEST_ENDPOINT, deployment_name=TEST_MODEL_NAME, api_key=" ")
+
+
+@pytest.mark.asyncio
+async def test_get_completion_requires_context_manager():
+    client = make_client()
+    with pytest.raises(RuntimeError):
+        await client.get_completion([Message(role=Role.USER, content=TEST_CONTENT)])
+
+
+@pytest.mark.asyncio
+async def test_pool_limits_passed_to_httpx(CHOICES_DATA):
+    with patch('task._utils.model_client.httpx.AsyncClient') as mock_httpx_client:
+        mock_httpx_client.return_value = AsyncMock()
+
+        async with make_client(max_connections=7, max_keepalive_connections=3, timeout=5.0):
+            pass
+
+        kwargs = mock_httpx_client.call_args.kwargs
+        assert kwargs["limits"].max_connections == 7
+        assert kwargs["limits"].max_keepalive_connections == 3
+        assert kwargs["timeout"] == 5.0
+        assert kwargs["headers"]["api-key"] == TEST_API_KEY
+        mock_httpx_client.return_value.aclose.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_completion_success(CHOICES_DATA):
+    with patch('task._utils.model_client.httpx.AsyncClient') as mock_httpx_client:
+        mock_http_instance = AsyncMock()
+        mock_http_instance.post.return_value = make_response(json_data=CHOICES_DATA)
+        mock_httpx_client.return_value = mock_http_instance
+
+        async with make_client() as client:
+            result = await client.get_completion(
+                [Message(role=Role.USER, content=TEST_CONTENT)],
+                custom_fields={"temperature": 0.5},
+            )
+
+        assert result.role == Role.AI
+        assert result.content == "Test response"
+        args, kwargs = mock_http_instance.post.call_args
+        assert args[0] == TEST_ENDPOINT
+        assert kwargs["json"]["custom_fields"]["configuration"]["temperature"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_get_completion_error_response():
+    with patch('task._utils.model_client.httpx.AsyncClient') as mock_httpx_client:
+        mock_http_instance = AsyncMock()
+        mock_http_instance.post.return_value = make_response(status_code=401, text="Unauthorized")
+        mock_httpx_client.return_value = mock_http_instance
+
+        async with make_client() as client:
+            with pytest.raises(Exception, match="HTTP 401: Unauthorized"):
+                await client.get_completion([Message(role=Role.USER, content=TEST_CONTENT)])
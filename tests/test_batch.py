@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from task._models.message import Message
+from task._models.role import Role
+from task._utils.batch import run_batch
+from task._utils.model_client import AsyncDialModelClient
+from task._utils.retry import NO_RETRY
+from tests.test_data import CHOICES_DATA, TEST_API_KEY, TEST_ENDPOINT, TEST_MODEL_NAME
+
+
+@pytest.mark.asyncio
+async def test_run_batch_preserves_order_and_bounds_concurrency():
+    in_flight = 0
+    peak = 0
+
+    async def worker(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01 * (item % 3))
+        in_flight -= 1
+        return item * 2
+
+    report = await run_batch(list(range(20)), worker, concurrency=4)
+
+    assert [item.result for item in report.results] == [i * 2 for i in range(20)]
+    assert peak <= 4
+    assert report.succeeded == 20
+    assert report.throughput > 0
+
+
+@pytest.mark.asyncio
+async def test_run_batch_records_errors_per_item():
+    async def worker(item):
+        if item == 1:
+            raise ValueError("bad item")
+        return item
+
+    report = await run_batch([0, 1, 2], worker, concurrency=2)
+
+    assert [item.ok for item in report.results] == [True, False, True]
+    assert isinstance(report.results[1].error, ValueError)
+    assert report.failed == 1
+
+
+@pytest.mark.asyncio
+async def test_run_batch_rejects_invalid_concurrency():
+    with pytest.raises(ValueError):
+        await run_batch([1], AsyncMock(), concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_batch_complete():
+    with patch('task._utils.model_client.httpx.AsyncClient') as mock_httpx_client:
+        ok_response = MagicMock(status_code=200)
+        ok_response.json.return_value = CHOICES_DATA
+        error_response = MagicMock(status_code=500, text="Internal Server Error")
+        mock_http_instance = AsyncMock()
+        mock_http_instance.post.side_effect = [ok_response, error_response, ok_response]
+        mock_httpx_client.return_value = mock_http_instance
+
+        message_lists = [[Message(role=Role.USER, content=f"prompt {i}")] for i in range(3)]
+        async with AsyncDialModelClient(endpoint=TEST_ENDPOINT, deployment_name=TEST_MODEL_NAME, api_key=TEST_API_KEY, retry_policy=NO_RETRY) as client:
+            report = await client.batch_complete(message_lists, concurrency=1)
+
+        assert report.results[0].result.content == "Test response"
+        assert "HTTP 500" in str(report.results[1].error)
+        assert report.results[2].ok
@@ -0,0 +1,108 @@
+import json
+from pathlib import Path
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from task._models.custom_content import Attachment, CustomContent
+from task._models.message import Message
+from task._models.role import Role
+from task.text_to_image.batch_tti import (
+    ALL_QUALITIES, ALL_SIZES, ALL_STYLES, GenerationManifest, build_jobs, load_prompts, run_generation
+)
+from tests.mock_client import MockDialBucketClient
+
+
+class FakeAsyncModelClient:
+    def __init__(self, *args, **kwargs):
+        self.init_kwargs = kwargs
+        self.get_completion = AsyncMock(side_effect=self._complete)
+        self.fail_prompts = set()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        pass
+
+    async def _complete(self, messages, custom_fields):
+        prompt = messages[0].content
+        if prompt in self.fail_prompts:
+            raise RuntimeError("generation failed")
+        url = f"files/{prompt}_{custom_fields['size']}.png"
+        return Message(
+            role=Role.AI,
+            content="Generated image",
+            custom_content=CustomContent(attachments=[Attachment(title="image.png", url=url, type="image/png")]),
+        )
+
+
+@pytest.fixture
+def model_client():
+    return FakeAsyncModelClient()
+
+
+@pytest.fixture
+def bucket_client():
+    async def download_to(url, path):
+        Path(path).write_bytes(url.encode())
+
+    client = MockDialBucketClient()
+    client.download_to = AsyncMock(side_effect=download_to)
+    return client
+
+
+@pytest.fixture
+def patched_clients(model_client, bucket_client):
+    with patch('task.text_to_image.batch_tti.AsyncDialModelClient', return_value=model_client) as model_class, \
+         patch('task.text_to_image.batch_tti.DialBucketClient', return_value=bucket_client):
+        yield model_class
+
+
+def test_build_jobs_expands_full_grid():
+    jobs = build_jobs(["a", "b"])
+
+    assert len(jobs) == 2 * len(ALL_SIZES) * len(ALL_QUALITIES) * len(ALL_STYLES)
+    assert len({job.key for job in jobs}) == len(jobs)
+
+
+def test_load_prompts_skips_blank_and_comment_lines(tmp_path):
+    path = tmp_path / "prompts.txt"
+    path.write_text("Sunny day on Bali\n\n# skipped\n  Forest in autumn  \n")
+
+    assert load_prompts(path) == ["Sunny day on Bali", "Forest in autumn"]
+
+
+@pytest.mark.asyncio
+async def test_run_generation_writes_images_and_manifest(tmp_path, patched_clients, model_client):
+    jobs = build_jobs(["bali", "forest"], sizes=ALL_SIZES[:2], qualities=ALL_QUALITIES[:1], styles=ALL_STYLES[:1])
+    manifest = GenerationManifest(tmp_path / "manifest.jsonl")
+
+    report = await run_generation(jobs, manifest, tmp_path / "images", concurrency=2, requests_per_minute=60)
+
+    assert report.succeeded == 4
+    assert patched_clients.call_args.kwargs['requests_per_minute'] == 60
+    records = [json.loads(line) for line in (tmp_path / "manifest.jsonl").read_text().splitlines()]
+    assert {record["key"] for record in records} == {job.key for job in jobs}
+    for record in records:
+        assert record["status"] == "ok"
+        image = tmp_path / "images" / f"{record['key']}_0.png"
+        assert record["files"] == [str(image)]
+        assert image.read_bytes() == f"files/{record['prompt']}_{record['size']}.png".encode()
+
+
+@pytest.mark.asyncio
+async def test_run_generation_resumes_skipping_completed_jobs(tmp_path, patched_clients, model_client):
+    jobs = build_jobs(["bali", "forest"], sizes=ALL_SIZES[:1], qualities=ALL_QUALITIES[:1], styles=ALL_STYLES[:1])
+    model_client.fail_prompts.add("forest")
+
+    first = await run_generation(jobs, GenerationManifest(tmp_path / "manifest.jsonl"), tmp_path)
+    assert (first.succeeded, first.failed) == (1, 1)
+
+    model_client.fail_prompts.clear()
+    model_client.get_completion.reset_mock()
+    second = await run_generation(jobs, GenerationManifest(tmp_path / "manifest.jsonl"), tmp_path)
+
+    assert second.succeeded == 1
+    model_client.get_completion.assert_called_once()
+    assert model_client.get_completion.call_args.kwargs['messages'][0].content == "forest"
@@ -0,0 +1,285 @@
+import email
+import email.policy
+import hashlib
+from io import BytesIO
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from task._utils.bucket_client import BucketIdCache, DialBucketClient, bucket_id_cache
+from tests.test_data import TEST_API_KEY
+
+BUCKET = "test_bucket"
+BASE_URL = "https://dial.test"
+
+
+class BrokenStream(httpx.AsyncByteStream):
+    """
+    Response body that sends some bytes and then drops the connection.
+    """
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def __aiter__(self):
+        yield self.data
+        raise httpx.ReadError("connection reset")
+
+
+def etag(data: bytes) -> str:
+    return f'"{hashlib.md5(data).hexdigest()}"'
+
+
+class FakeDial(httpx.AsyncBaseTransport):
+    """
+    Minimal in-memory DIAL bucket API served as an httpx transport.
+
+    Unlike httpx.MockTransport, response bodies are not read ahead, so a body can
+    break while the client is consuming it.
+    """
+
+    def __init__(self):
+        self.files = {}
+        self.requests = []
+        self.break_after = None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        return self.handler(request)
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path
+        if path == "/v1/bucket":
+            return httpx.Response(200, json={"bucket": BUCKET})
+        if request.method == "PUT":
+            body = request.read()
+            message = email.message_from_bytes(
+                b"Content-Type: " + request.headers["content-type"].encode() + b"\r\n\r\n" + body,
+                policy=email.policy.HTTP,
+            )
+            part = next(message.iter_parts())
+            name = path[len(f"/v1/files/{BUCKET}/"):]
+            self.files[f"files/{BUCKET}/{name}"] = part.get_payload(decode=True)
+            return httpx.Response(200, json={"url": f"files/{BUCKET}/{name}"})
+        if request.method == "GET" and (data := self.files.get(path[len("/v1/"):])) is not None:
+            return self._serve(request, data)
+        return httpx.Response(404)
+
+    def _serve(self, request: httpx.Request, data: bytes) -> httpx.Response:
+        status, start = 200, 0
+        headers = {"etag": etag(data)}
+        range_header = request.headers.get("range")
+        if range_header and request.headers.get("if-range", headers["etag"]) == headers["etag"]:
+            start = int(range_header[len("bytes="):].rstrip("-"))
+            if start >= len(data):
+                return httpx.Response(416, headers={"content-range": f"bytes */{len(data)}"})
+            status = 206
+            headers["content-range"] = f"bytes {start}-{len(data) - 1}/{len(data)}"
+        body = data[start:]
+        if self.break_after is not None:
+            limit, self.break_after = self.break_after, None
+            return httpx.Response(status, headers=headers, stream=BrokenStream(body[:limit]))
+        return httpx.Response(status, headers=headers, content=body)
+
+    def patch_client(self):
+        real_async_client = httpx.AsyncClient
+        return patch(
+            'task._utils.bucket_client.httpx.AsyncClient',
+            side_effect=lambda **kwargs: real_async_client(transport=self, **kwargs),
+        )
+
+
+@pytest.fixture
+def fake_dial():
+    return FakeDial()
+
+
+@pytest.mark.asyncio
+async def test_put_file_streams_from_path(fake_dial, tmp_path):
+    file_path = tmp_path / "scan.png"
+    payload = bytes(range(256)) * 1000
+    file_path.write_bytes(payload)
+
+    with fake_dial.patch_client():
+        async with DialBucketClient(api_key=TEST_API_KEY, base_url=BASE_URL) as client:
+            result = await client.put_file("scan.png", "image/png", file_path, chunk_size=4096)
+
+    assert fake_dial.files[result["url"]] == payload
+    put_request = fake_dial.requests[-1]
+    assert int(put_request.headers["content-length"]) == len(put_request.content)
+    assert "chunked" not in put_request.headers.get("transfer-encoding", "")
+
+
+@pytest.mark.asyncio
+async def test_put_file_streams_from_async_iterator(fake_dial):
+    async def chunks():
+        for i in range(5):
+            yield bytes([i]) * 10
+
+    with fake_dial.patch_client():
+        async with DialBucketClient(api_key=TEST_API_KEY, base_url=BASE_URL) as client:
+            result = await client.put_file("generated.bin", "application/octet-stream", chunks())
+
+    assert fake_dial.files[result["url"]] == b"".join(bytes([i]) * 10 for i in range(5))
+
+
+IMAGE_URL = f"files/{BUCKET}/image.png"
+IMAGE_BYTES = bytes(range(256)) * 400
+
+
+@pytest.mark.asyncio
+async def test_iter_file_streams_chunks(fake_dial):
+    fake_dial.files[IMAGE_URL] = IMAGE_BYTES
+
+    with fake_dial.patch_client():
+        async with DialBucketClient(api_key=TEST_API_KEY, base_url=BASE_URL) as client:
+            chunks = [chunk async for chunk in client.iter_file(IMAGE_URL, chunk_size=1024)]
+
+    assert b"".join(chunks) == IMAGE_BYTES
+    assert max(len(chunk) for chunk in chunks) <= 1024
+
+
+@pytest.mark.asyncio
+async def test_download_to_writes_file(fake_dial, tmp_path):
+    fake_dial.files[IMAGE_URL] = IMAGE_BYTES
+    destination = tmp_path / "image.png"
+
+    with fake_dial.patch_client():
+        async with DialBucketClient(api_key=TEST_API_KEY, base_url=BASE_URL) as client:
+            result = await client.download_to(IMAGE_URL, destination)
+
+    assert destination.read_bytes() == IMAGE_BYTES
+    assert result.size == result.bytes_written == len(IMAGE_BYTES)
+    assert result.resumes == 0
+    assert result.bytes_per_second > 0
+    assert not (tmp_path / "image.png.part").exists()
+
+
+@pytest.mark.asyncio
+async def test_download_to_resumes_broken_transfer(fake_dial, tmp_path):
+    fake_dial.files[IMAGE_URL] = IMAGE_BYTES
+    fake_dial.break_after = 5000
+    destination = tmp_path / "image.png"
+
+    with fake_dial.patch_client():
+        async with DialBucketClient(api_key=TEST_API_KEY, base_url=BASE_URL) as client:
+            result = await client.download_to(IMAGE_URL, destination)
+
+    assert destination.read_bytes() == IMAGE_BYTES
+    assert result.resumes == 1
+    assert fake_dial.requests[-1].headers["range"] == "bytes=5000-"
+
+
+@pytest.mark.asyncio
+async def test_download_to_continues_partial_file(fake_dial, tmp_path):
+    fake_dial.files[IMAGE_URL] = IMAGE_BYTES
+    destination = tmp_path / "image.png"
+    (tmp_path / "image.png.part").write_bytes(IMAGE_BYTES[:1000])
+    (tmp_path / "image.png.part.validator").write_text(etag(IMAGE_BYTES))
+
+    with fake_dial.patch_client():
+        async with DialBucketClient(api_key=TEST_API_KEY, base_url=BASE_URL) as client:
+            result = await client.download_to(IMAGE_URL, destination)
+
+    assert destination.read_bytes() == IMAGE_BYTES
+    assert result.bytes_written == len(IMAGE_BYTES) - 1000
+    assert fake_dial.requests[-1].headers["if-range"] == etag(IMAGE_BYTES)
+    assert not (tmp_path / "image.png.part.validator").exists()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("validator", [None, etag(b"older version")])
+async def test_download_to_restarts_partial_file_of_unknown_version(fake_dial, tmp_path, validator):
+    fake_dial.files[IMAGE_URL] = IMAGE_BYTES
+    destination = tmp_path / "image.png"
+    (tmp_path / "image.png.part").write_bytes(b"x" * 1000)
+    if validator:
+        (tmp_path / "image.png.part.validator").write_text(validator)
+
+    with fake_dial.patch_client():
+        async with DialBucketClient(api_key=TEST_API_KEY, base_url=BASE_URL) as client:
+            result = await client.download_to(IMAGE_URL, destination)
+
+    assert destination.read_bytes() == IMAGE_BYTES
+    assert result.bytes_written == len(IMAGE_BYTES)
+
+
+@pytest.mark.asyncio
+async def test_download_to_restarts_when_partial_file_is_too_long(fake_dial, tmp_path):
+    fake_dial.files[IMAGE_URL] = IMAGE_BYTES
+    destination = tmp_path / "image.png"
+    (tmp_path / "image.png.part").write_bytes(IMAGE_BYTES + b"trailing")
+    (tmp_path / "image.png.part.validator").write_text(etag(IMAGE_BYTES))
+
+    with fake_dial.patch_client():
+        async with DialBucketClient(api_key=TEST_API_KEY, base_url=BASE_URL) as client:
+            result = await client.download_to(IMAGE_URL, destination)
+
+    assert destination.read_bytes() == IMAGE_BYTES
+    assert result.resumes == 1
+    assert "range" not in fake_dial.requests[-1].headers
+
+
+@pytest.mark.asyncio
+async def test_download_to_gives_up_after_max_resumes(fake_dial, tmp_path):
+    fake_dial.files[IMAGE_URL] = IMAGE_BYTES
+    fake_dial.break_after = 10
+
+    with fake_dial.patch_client():
+        async with DialBucketClient(api_key=TEST_API_KEY, base_url=BASE_URL) as client:
+            with pytest.raises(httpx.ReadError):
+                await client.download_to(IMAGE_URL, tmp_path / "image.png", max_resumes=0)
+
+    assert (tmp_path / "image.png.part").read_bytes() == IMAGE_BYTES[:10]
+
+
+def bucket_lookups(fake_dial):
+    return sum(1 for request in fake_dial.requests if request.url.path == "/v1/bucket")
+
+
+@pytest.mark.asyncio
+async def test_bucket_id_is_shared_between_clients(fake_dial):
+    with fake_dial.patch_client():
+        for _ in range(3):
+            async with DialBucketClient(api_key=TEST_API_KEY, base_url=BASE_URL) as client:
+                assert await client.get_bucket_id() == BUCKET
+        async with DialBucketClient(api_key="another_key", base_url=BASE_URL) as client:
+            await client.get_bucket_id()
+
+    assert bucket_lookups(fake_dial) == 2
+
+
+@pytest.mark.asyncio
+async def test_bucket_id_expires(fake_dial, monkeypatch):
+    monkeypatch.setattr(bucket_id_cache, "ttl", -1)
+
+    with fake_dial.patch_client():
+        for _ in range(2):
+            async with DialBucketClient(api_key=TEST_API_KEY, base_url=BASE_URL) as client:
+                await client._get_bucket()
+
+    assert bucket_lookups(fake_dial) == 2
+
+
+@pytest.mark.asyncio
+async def test_forbidden_upload_invalidates_bucket_id(fake_dial):
+    real_handler = fake_dial.handler
+    fake_dial.handler = lambda request: httpx.Response(403) if request.method == "PUT" else real_handler(request)
+
+    with fake_dial.patch_client():
+        async with DialBucketClient(api_key=TEST_API_KEY, base_url=BASE_URL) as client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.put_file("image.png", "image/png", BytesIO(b"data"))
+        async with DialBucketClient(api_key=TEST_API_KEY, base_url=BASE_URL) as client:
+            await client._get_bucket()
+
+    assert bucket_lookups(fake_dial) == 2
+
+
+def test_bucket_id_cache_key_hides_api_key():
+    key = BucketIdCache.key(BASE_URL, TEST_API_KEY)
+
+    assert key[0] == BASE_URL
+    assert TEST_API_KEY not in key[1]
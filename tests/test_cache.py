@@ -0,0 +1,100 @@
+import json
+
+import pytest
+from unittest.mock import Mock, patch
+
+from task._models.custom_content import Attachment, CustomContent
+from task._models.message import Message
+from task._models.role import Role
+from task._utils.cache import MemoryCompletionCache, SQLiteCompletionCache, completion_cache_key
+from task._utils.metrics import metrics
+from task._utils.model_client import DialModelClient
+from tests.test_data import CHOICES_DATA, TEST_API_KEY, TEST_ATTACHMENT_URL, TEST_CONTENT, TEST_ENDPOINT, TEST_MODEL_NAME
+
+RESPONSE_MESSAGE = Message(
+    role=Role.AI,
+    content="Cached response",
+    custom_content=CustomContent(attachments=[Attachment(title="image.png", url=TEST_ATTACHMENT_URL, type="image/png")])
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cache_factory(request, tmp_path):
+    def create(**kwargs):
+        if request.param == "memory":
+            return MemoryCompletionCache(**kwargs)
+        return SQLiteCompletionCache(tmp_path / "completions.sqlite", **kwargs)
+    return create
+
+
+def test_cache_key_is_canonical():
+    first = completion_cache_key(TEST_ENDPOINT, {"messages": [], "temperature": 0.1, "custom_fields": {"a": 1}})
+    second = completion_cache_key(TEST_ENDPOINT, {"custom_fields": {"a": 1}, "temperature": 0.1, "messages": []})
+
+    assert first == second
+    assert first != completion_cache_key(TEST_ENDPOINT, {"messages": [], "temperature": 0.2})
+    assert first != completion_cache_key("https://other-endpoint.com", {"messages": [], "temperature": 0.1, "custom_fields": {"a": 1}})
+
+
+def test_cache_round_trip(cache_factory):
+    cache = cache_factory()
+
+    assert cache.get("key") is None
+    cache.set("key", RESPONSE_MESSAGE)
+
+    assert cache.get("key") == RESPONSE_MESSAGE
+
+
+def test_cache_expires_entries(cache_factory):
+    cache = cache_factory(ttl=-1)
+
+    cache.set("key", RESPONSE_MESSAGE)
+
+    assert cache.get("key") is None
+
+
+def test_cache_evicts_by_size(cache_factory):
+    entry_size = len(json.dumps(RESPONSE_MESSAGE.to_dict()))
+    cache = cache_factory(max_bytes=entry_size * 2 + 10)
+
+    for key in ("first", "second", "third"):
+        cache.set(key, RESPONSE_MESSAGE)
+
+    assert cache.get("first") is None
+    assert cache.get("third") == RESPONSE_MESSAGE
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCompletionCache(max_entries=2)
+    cache.set("first", RESPONSE_MESSAGE)
+    cache.set("second", RESPONSE_MESSAGE)
+    cache.get("first")
+    cache.set("third", RESPONSE_MESSAGE)
+
+    assert cache.get("second") is None
+    assert cache.get("first") == RESPONSE_MESSAGE
+    assert len(cache) == 2
+
+
+def test_client_answers_repeated_requests_from_cache():
+    metrics.reset()
+    client = DialModelClient(
+        endpoint=TEST_ENDPOINT,
+        deployment_name=TEST_MODEL_NAME,
+        api_key=TEST_API_KEY,
+        cache=MemoryCompletionCache()
+    )
+    message = Message(role=Role.USER, content=TEST_CONTENT)
+
+    with patch('task._utils.model_client.requests.Session.post') as mock_post:
+        response = Mock(status_code=200, headers={})
+        response.json.return_value = CHOICES_DATA
+        mock_post.return_value = response
+
+        first = client.get_completion([message], custom_fields={"temperature": 0})
+        second = client.get_completion([message], custom_fields={"temperature": 0})
+        client.get_completion([message], custom_fields={"temperature": 1})
+
+        assert first == second
+        assert mock_post.call_count == 2
+        assert metrics.get("completion_cache.hits", deployment=TEST_MODEL_NAME) == 1
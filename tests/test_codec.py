@@ -0,0 +1,50 @@
+import dataclasses
+
+import pytest
+from unittest.mock import patch
+
+from task._models.custom_content import Attachment, CustomContent
+from task._models.message import Message
+from task._models.role import Role
+from task._utils import codec
+from task.image_to_text.openai.message import TxtContent
+
+MESSAGES = [
+    Message(role=Role.USER, content="Describe the picture ✓"),
+    Message(role=Role.AI, content="A banner", custom_content=CustomContent(attachments=[
+        Attachment(title="image.png", type="image/png", url="files/bucket/image.png")
+    ])),
+]
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_messages_round_trip(fast):
+    with patch.object(codec, "orjson", codec.orjson if fast else None):
+        encoded = codec.encode_messages(MESSAGES)
+
+        assert codec.loads(encoded) == [message.to_dict() for message in MESSAGES]
+        assert codec.decode_messages(encoded) == MESSAGES
+        assert b" " not in codec.dumps({"a": [1, 2]})
+
+
+@pytest.mark.skipif(not codec.FAST_JSON, reason="orjson is not installed")
+def test_fast_encoder_matches_fallback():
+    fast = codec.encode_messages(MESSAGES)
+    with patch.object(codec, "orjson", None):
+        fallback = codec.encode_messages(MESSAGES)
+
+    assert fast == fallback
+    assert b"custom_content" not in codec.dumps(MESSAGES[0])
+
+
+def test_models_are_slotted():
+    assert not hasattr(MESSAGES[0], "__dict__")
+    assert not hasattr(Attachment(), "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        TxtContent(text="hi").text = "changed"
+
+
+def test_custom_content_from_dict_ignores_unknown_keys():
+    content = CustomContent.from_dict({"attachments": [{"title": "a.png", "index": 0, "unknown": True}]})
+
+    assert content.attachments == [Attachment(title="a.png")]
@@ -0,0 +1,222 @@
+import threading
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+
+from task._models.conversation import Conversation
+from task._models.message import Message
+from task._models.role import Role
+from task._utils.context_window import (
+    DEFAULT_CONTEXT_WINDOW,
+    DEPLOYMENT_CONTEXT_WINDOWS,
+    MESSAGE_OVERHEAD_TOKENS,
+    ContextWindow,
+    context_window,
+)
+from task._utils.model_client import AsyncDialModelClient, DialModelClient
+from task._utils.retry import NO_RETRY
+from tests.test_data import CHOICES_DATA, TEST_API_KEY, TEST_ENDPOINT, TEST_MODEL_NAME
+
+TURN_TOKENS = 25
+"""
+Estimated tokens of each 100-character message below, excluding the per-message overhead.
+"""
+
+
+def make_conversation(turns=4):
+    conversation = Conversation()
+    conversation.add_message(Message(role=Role.SYSTEM, content="s" * 100))
+    for i in range(turns):
+        conversation.add_message(Message(role=Role.USER, content=f"{i}" * 100))
+        conversation.add_message(Message(role=Role.AI, content=f"{i}" * 100))
+    conversation.add_message(Message(role=Role.USER, content="q" * 100))
+    return conversation
+
+
+def budget_for(messages):
+    return messages * (TURN_TOKENS + MESSAGE_OVERHEAD_TOKENS)
+
+
+def test_every_available_model_has_a_window():
+    models = Path(__file__).parent.parent.joinpath("available_models.txt").read_text().split()
+
+    assert sorted(models) == sorted(DEPLOYMENT_CONTEXT_WINDOWS)
+    assert context_window("unknown-model") == DEFAULT_CONTEXT_WINDOW
+
+
+def test_everything_is_kept_within_budget():
+    conversation = make_conversation()
+    window = ContextWindow(TEST_MODEL_NAME, max_context_tokens=budget_for(10), response_tokens=0)
+
+    assert window.encoded_messages(conversation) == conversation.encoded_messages()
+
+
+def test_oldest_turns_are_dropped_and_system_and_latest_user_kept():
+    conversation = make_conversation()
+    window = ContextWindow(TEST_MODEL_NAME, max_context_tokens=budget_for(4), response_tokens=0)
+
+    kept, dropped = window.select(conversation)
+
+    assert kept == [0, 7, 8, 9]
+    assert dropped == [1, 2, 3, 4, 5, 6]
+
+
+def test_required_messages_are_kept_over_budget():
+    conversation = make_conversation()
+    window = ContextWindow(TEST_MODEL_NAME, max_context_tokens=budget_for(1), response_tokens=0)
+
+    kept, _ = window.select(conversation)
+
+    assert kept == [0, 9]
+
+
+def test_dropped_turns_are_summarized_once():
+    conversation = make_conversation()
+    summarizer = Mock(return_value=Message(role=Role.SYSTEM, content="summary"))
+    window = ContextWindow(
+        TEST_MODEL_NAME, max_context_tokens=budget_for(4) + 10, response_tokens=0, summarizer=summarizer, summary_tokens=10
+    )
+
+    first = window.encoded_messages(conversation)
+    second = window.encoded_messages(conversation)
+
+    assert [message["content"] for message in first] == ["s" * 100, "summary", "3" * 100, "3" * 100, "q" * 100]
+    assert first == second
+    summarizer.assert_called_once_with(conversation.messages[1:7])
+
+
+def test_least_recently_used_summary_is_evicted():
+    conversations = [make_conversation() for _ in range(3)]
+    summarizer = Mock(return_value=Message(role=Role.SYSTEM, content="summary"))
+    window = ContextWindow(
+        TEST_MODEL_NAME, max_context_tokens=budget_for(4) + 10, response_tokens=0,
+        summarizer=summarizer, summary_tokens=10, max_summaries=2,
+    )
+
+    for conversation in conversations + conversations[-1:]:
+        window.encoded_messages(conversation)
+
+    assert list(window._summaries) == [conversations[1].id, conversations[2].id]
+    assert summarizer.call_count == 3
+
+
+def test_summary_is_rebuilt_when_a_dropped_message_changes():
+    conversation = make_conversation()
+    summarizer = Mock(return_value=Message(role=Role.SYSTEM, content="summary"))
+    window = ContextWindow(
+        TEST_MODEL_NAME, max_context_tokens=budget_for(4) + 10, response_tokens=0, summarizer=summarizer, summary_tokens=10
+    )
+
+    window.encoded_messages(conversation)
+    conversation.messages[1] = Message(role=Role.USER, content="0" * 100)
+    window.encoded_messages(conversation)
+    conversation.messages[1] = Message(role=Role.USER, content="x" * 100)
+    window.encoded_messages(conversation)
+
+    assert summarizer.call_count == 2
+
+
+def test_tokens_count_the_reserved_summary_without_summarizing():
+    conversation = make_conversation()
+    summarizer = Mock(return_value=Message(role=Role.SYSTEM, content="summary"))
+    window = ContextWindow(
+        TEST_MODEL_NAME, max_context_tokens=budget_for(4) + 10, response_tokens=0, summarizer=summarizer, summary_tokens=10
+    )
+
+    assert window.tokens(conversation) == budget_for(4) + 10 + MESSAGE_OVERHEAD_TOKENS
+    summarizer.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_async_summarizer_is_awaited():
+    conversation = make_conversation()
+    summarizer = AsyncMock(return_value=Message(role=Role.SYSTEM, content="summary"))
+    window = ContextWindow(
+        TEST_MODEL_NAME, max_context_tokens=budget_for(4) + 10, response_tokens=0, summarizer=summarizer, summary_tokens=10
+    )
+
+    with pytest.raises(TypeError):
+        window.encoded_messages(conversation)
+    encoded = await window.encoded_messages_async(conversation)
+
+    assert [message["content"] for message in encoded][:2] == ["s" * 100, "summary"]
+    summarizer.assert_awaited_once_with(conversation.messages[1:7])
+    assert window.encoded_messages(conversation) == encoded
+
+
+@pytest.mark.asyncio
+async def test_async_client_runs_sync_summarizer_off_the_event_loop():
+    conversation = make_conversation()
+    threads = []
+
+    def summarizer(messages):
+        threads.append(threading.get_ident())
+        return Message(role=Role.SYSTEM, content="summary")
+
+    window = ContextWindow(
+        TEST_MODEL_NAME, max_context_tokens=budget_for(4) + 10, response_tokens=0, summarizer=summarizer, summary_tokens=10
+    )
+
+    with patch('task._utils.model_client.httpx.AsyncClient') as mock_httpx_client:
+        response = MagicMock(status_code=200)
+        response.json.return_value = CHOICES_DATA
+        mock_http_instance = AsyncMock()
+        mock_http_instance.post.return_value = response
+        mock_httpx_client.return_value = mock_http_instance
+
+        async with AsyncDialModelClient(
+            TEST_ENDPOINT, TEST_MODEL_NAME, TEST_API_KEY, retry_policy=NO_RETRY, context_window=window
+        ) as client:
+            await client.get_completion(conversation)
+
+    sent = mock_http_instance.post.call_args.kwargs['json']['messages']
+    assert sent[1]["content"] == "summary"
+    assert threads and threads[0] != threading.get_ident()
+
+
+def test_max_tokens_is_reserved_for_the_response():
+    conversation = make_conversation()
+    window = ContextWindow(TEST_MODEL_NAME, max_context_tokens=budget_for(6), response_tokens=0)
+
+    assert len(window.select(conversation)[0]) == 6
+    assert len(window.select(conversation, max_tokens=budget_for(2))[0]) == 4
+
+
+def test_token_estimates_are_cached_per_message():
+    conversation = make_conversation(turns=1)
+    window = ContextWindow(TEST_MODEL_NAME)
+    window.select(conversation)
+
+    with patch("task._models.conversation.estimate_message_tokens", return_value=TURN_TOKENS) as estimate:
+        conversation.invalidate(1)
+        window.select(conversation)
+        window.select(conversation)
+
+    assert estimate.call_count == 1
+
+
+def test_client_sends_trimmed_conversation():
+    conversation = make_conversation()
+    window = ContextWindow(TEST_MODEL_NAME, max_context_tokens=budget_for(2), response_tokens=0)
+    client = DialModelClient(TEST_ENDPOINT, TEST_MODEL_NAME, TEST_API_KEY, context_window=window)
+
+    with patch('task._utils.model_client.requests.Session.post') as mock_post:
+        mock_post.return_value = Mock(status_code=200, json=Mock(return_value=CHOICES_DATA))
+        client.get_completion(conversation)
+
+    sent = mock_post.call_args.kwargs['json']['messages']
+    assert [message["role"] for message in sent] == ["system", "user"]
+    assert len(conversation.messages) == 10
+
+
+def test_client_reserves_requested_max_tokens():
+    conversation = make_conversation()
+    window = ContextWindow(TEST_MODEL_NAME, max_context_tokens=budget_for(4), response_tokens=budget_for(2))
+    client = DialModelClient(TEST_ENDPOINT, TEST_MODEL_NAME, TEST_API_KEY, context_window=window)
+
+    with patch('task._utils.model_client.requests.Session.post') as mock_post:
+        mock_post.return_value = Mock(status_code=200, json=Mock(return_value=CHOICES_DATA))
+        client.get_completion(conversation, max_tokens=0)
+
+    assert len(mock_post.call_args.kwargs['json']['messages']) == 4
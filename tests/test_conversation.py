@@ -1,3 +1,5 @@
+from unittest.mock import Mock, patch
+
 from task._models.conversation import Conversation
 from task._models.message import Message
 from task._models.role import Role
@@ -158,4 +160,46 @@ class TestConversationModel:
         
         assert len(messages) == 10
         for i, message in enumerate(messages):
-            assert message.content == f"Message {i}"
\ No newline at end of file
+            assert message.content == f"Message {i}"
+
+class TestConversationEncodingCache:
+
+    def test_only_new_messages_are_encoded(self):
+        conversation = Conversation()
+        conversation.add_message(Message(role=Role.USER, content="first"))
+        first = conversation.encoded_messages()
+
+        conversation.add_message(Message(role=Role.AI, content="second"))
+        with patch.object(Message, "to_dict", autospec=True, side_effect=lambda m: {"content": m.content}) as to_dict:
+            second = conversation.encoded_messages()
+
+        to_dict.assert_called_once()
+        assert second[0] is first[0]
+        assert second == [{"role": "user", "content": "first"}, {"content": "second"}]
+
+    def test_replaced_and_invalidated_messages_are_re_encoded(self):
+        conversation = Conversation(messages=[Message(role=Role.USER, content=str(i)) for i in range(3)])
+        conversation.encoded_messages()
+
+        conversation.messages[0] = Message(role=Role.USER, content="replaced")
+        conversation.messages[2].content = "changed"
+        conversation.invalidate(2)
+
+        assert [entry["content"] for entry in conversation.encoded_messages()] == ["replaced", "1", "changed"]
+
+        conversation.messages.pop()
+        assert [entry["content"] for entry in conversation.encoded_messages()] == ["replaced", "1"]
+
+    def test_get_completion_accepts_conversation(self):
+        from task._utils.model_client import DialModelClient
+        from tests.test_data import CHOICES_DATA, TEST_API_KEY, TEST_ENDPOINT, TEST_MODEL_NAME
+
+        conversation = Conversation()
+        conversation.add_message(Message(role=Role.USER, content=TEST_CONTENT))
+        client = DialModelClient(TEST_ENDPOINT, TEST_MODEL_NAME, TEST_API_KEY)
+
+        with patch('task._utils.model_client.requests.Session.post') as mock_post:
+            mock_post.return_value = Mock(status_code=200, json=Mock(return_value=CHOICES_DATA))
+            client.get_completion(conversation)
+
+        assert mock_post.call_args.kwargs['json']['messages'] == [{"role": "user", "content": TEST_CONTENT}]
@@ -0,0 +1,208 @@
+import os
+import threading
+import time
+
+from task._models.conversation import Conversation
+from task._models.custom_content import Attachment, CustomContent
+from task._models.message import Message
+from task._models.role import Role
+from task._utils.conversation_store import INDEX_FILE_NAME, SEGMENT_SUFFIX, ConversationStore
+
+
+def make_conversation(turns=2):
+    conversation = Conversation()
+    for i in range(turns):
+        conversation.add_message(Message(role=Role.USER, content=f"question {i}"))
+        conversation.add_message(Message(role=Role.AI, content=f"answer {i}", custom_content=CustomContent(attachments=[
+            Attachment(title="image.png", type="image/png", url=f"files/bucket/{i}.png")
+        ])))
+    return conversation
+
+
+def segment_files(directory):
+    return sorted(path.name for path in directory.iterdir() if path.suffix == SEGMENT_SUFFIX)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    conversation = make_conversation()
+
+    with ConversationStore(tmp_path) as store:
+        store.save(conversation)
+        loaded = store.load(conversation.id)
+
+        assert loaded.id == conversation.id
+        assert loaded.messages == conversation.messages
+        assert store.load("unknown") is None
+
+
+def test_save_appends_only_new_messages(tmp_path):
+    conversation = make_conversation(turns=1)
+
+    with ConversationStore(tmp_path) as store:
+        store.save(conversation)
+        size = os.path.getsize(next(tmp_path.glob(f"*{SEGMENT_SUFFIX}")))
+        store.save(conversation)
+        assert os.path.getsize(next(tmp_path.glob(f"*{SEGMENT_SUFFIX}"))) == size
+
+        conversation.add_message(Message(role=Role.USER, content="follow-up"))
+        store.save(conversation)
+
+        assert store.message_count(conversation.id) == 3
+        assert store.load(conversation.id).messages == conversation.messages
+
+
+def test_concurrent_saves_store_each_message_once(tmp_path):
+    conversation = make_conversation(turns=1)
+
+    with ConversationStore(tmp_path) as store:
+        original_append = store.append
+
+        def slow_append(conversation_id, messages):
+            time.sleep(0.05)
+            original_append(conversation_id, messages)
+
+        store.append = slow_append
+        threads = [threading.Thread(target=store.save, args=(conversation,)) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert store.message_count(conversation.id) == len(conversation.messages)
+
+
+def test_delete_removes_conversation(tmp_path):
+    conversation = make_conversation()
+
+    with ConversationStore(tmp_path) as store:
+        store.save(conversation)
+
+        assert store.delete(conversation.id) is True
+        assert store.delete(conversation.id) is False
+        assert conversation.id not in store
+
+    with ConversationStore(tmp_path) as store:
+        assert store.load(conversation.id) is None
+
+
+def test_reopen_uses_snapshot_and_scans_newer_records(tmp_path):
+    first, second = make_conversation(), make_conversation()
+
+    with ConversationStore(tmp_path) as store:
+        store.save(first)
+
+    store = ConversationStore(tmp_path)
+    store.save(second)
+    store.delete(first.id)
+
+    reopened = ConversationStore(tmp_path)
+
+    assert reopened.load(first.id) is None
+    assert reopened.load(second.id).messages == second.messages
+    reopened.close()
+    store.close()
+
+
+def test_index_is_rebuilt_without_snapshot_and_partial_record_truncated(tmp_path):
+    conversation = make_conversation()
+    store = ConversationStore(tmp_path)
+    store.save(conversation)
+    store.close()
+    (tmp_path / INDEX_FILE_NAME).unlink()
+    segment = next(tmp_path.glob(f"*{SEGMENT_SUFFIX}"))
+    size = segment.stat().st_size
+    with open(segment, "ab") as f:
+        f.write(b'{"seq":9,"id":"x","mess')
+
+    with ConversationStore(tmp_path) as store:
+        assert store.load(conversation.id).messages == conversation.messages
+        assert "x" not in store
+        assert segment.stat().st_size == size
+
+
+def test_compaction_merges_records_and_drops_deleted(tmp_path):
+    kept, deleted = Conversation(), make_conversation()
+
+    with ConversationStore(tmp_path, segment_bytes=256) as store:
+        store.save(deleted)
+        for i in range(10):
+            kept.add_message(Message(role=Role.USER, content=f"message {i}"))
+            store.save(kept)
+        store.delete(deleted.id)
+        segments_before = len(segment_files(tmp_path))
+
+        assert store.garbage_ratio() > 0.5
+        assert store.compact() > 0
+        assert len(segment_files(tmp_path)) < segments_before
+        assert store.load(kept.id).messages == kept.messages
+        assert len(store._index[kept.id]) == 1
+
+        kept.add_message(Message(role=Role.AI, content="after compaction"))
+        store.save(kept)
+
+    with ConversationStore(tmp_path) as store:
+        assert store.load(kept.id).messages == kept.messages
+        assert store.load(deleted.id) is None
+
+
+def test_compaction_keeps_concurrent_delete(tmp_path):
+    conversation = make_conversation()
+
+    with ConversationStore(tmp_path) as store:
+        store.save(conversation)
+        original_read = store._segments[store._active.number].read
+
+        def read_then_delete(offset, length):
+            data = original_read(offset, length)
+            if conversation.id in store:
+                store.delete(conversation.id)
+            return data
+
+        store._segments[store._active.number].read = read_then_delete
+        store.compact()
+
+        assert store.load(conversation.id) is None
+
+    (tmp_path / INDEX_FILE_NAME).unlink()
+    with ConversationStore(tmp_path) as store:
+        assert store.load(conversation.id) is None
+
+
+class SlowSegmentAllocationStore(ConversationStore):
+    """Store whose segment counter is slow to read, widening any allocation race."""
+
+    @property
+    def _next_segment(self):
+        number = self._next_segment_number
+        time.sleep(0.02)
+        return number
+
+    @_next_segment.setter
+    def _next_segment(self, number):
+        self._next_segment_number = number
+
+
+def test_compaction_concurrent_with_rolling_appends(tmp_path):
+    compacted, written = make_conversation(), Conversation()
+
+    with SlowSegmentAllocationStore(tmp_path, segment_bytes=64) as store:
+        store.save(compacted)
+
+        def write():
+            for i in range(5):
+                written.add_message(Message(role=Role.USER, content=f"message {i}"))
+                store.save(written)
+
+        threads = [threading.Thread(target=store.compact), threading.Thread(target=write)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(segment_files(tmp_path)) == len(store._segments)
+        assert store.load(compacted.id).messages == compacted.messages
+        assert store.load(written.id).messages == written.messages
+
+    with ConversationStore(tmp_path) as store:
+        assert store.load(compacted.id).messages == compacted.messages
+        assert store.load(written.id).messages == written.messages
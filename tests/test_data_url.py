@@ -0,0 +1,119 @@
+import base64
+import json
+
+import httpx
+import pytest
+from unittest.mock import Mock, patch
+
+from task._models.role import Role
+from task._utils.cache import completion_cache_key
+from task._utils.data_url import BytesDataUrl, DataUrl, FileDataUrl, JsonBody, has_data_urls
+from task._utils.model_client import AsyncDialModelClient, DialModelClient
+from task._utils.retry import NO_RETRY
+from task.image_to_text.openai.message import ContentedMessage, ImgContent, ImgUrl, TxtContent
+from tests.test_data import CHOICES_DATA, TEST_API_KEY, TEST_ENDPOINT, TEST_MODEL_NAME
+
+IMAGE_BYTES = bytes(range(256)) * 41
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    path = tmp_path / "image.png"
+    path.write_bytes(IMAGE_BYTES)
+    return path
+
+
+def expected_url(data=IMAGE_BYTES):
+    return "data:image/png;base64," + base64.b64encode(data).decode()
+
+
+def image_message(image_path):
+    return ContentedMessage(
+        role=Role.USER,
+        content=[ImgContent(image_url=ImgUrl(url=FileDataUrl(image_path))), TxtContent(text="What is this?")],
+    )
+
+
+def plain_request(image_path):
+    return {"messages": [{"role": "user", "content": [
+        {"image_url": {"url": expected_url()}, "type": "image_url"},
+        {"text": "What is this?", "type": "text"},
+    ]}]}
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 100, len(IMAGE_BYTES)])
+def test_file_data_url_encodes_in_chunks(tmp_path, size):
+    path = tmp_path / "image.png"
+    path.write_bytes(IMAGE_BYTES[:size])
+    data_url = FileDataUrl(path)
+
+    assert "".join(data_url.iter_chunks(chunk_size=10)) == expected_url(IMAGE_BYTES[:size])
+    assert len(data_url) == len(expected_url(IMAGE_BYTES[:size]))
+    assert str(data_url) == expected_url(IMAGE_BYTES[:size])
+
+
+@pytest.mark.parametrize("size", [0, 1, 100, len(IMAGE_BYTES)])
+def test_bytes_data_url_encodes_in_chunks(size):
+    data_url = BytesDataUrl(IMAGE_BYTES[:size], "image/png")
+
+    assert "".join(data_url.iter_chunks(chunk_size=10)) == expected_url(IMAGE_BYTES[:size])
+    assert len(data_url) == len(expected_url(IMAGE_BYTES[:size]))
+
+
+def test_data_url_requires_payload_source():
+    with pytest.raises(TypeError):
+        DataUrl("image/png", 0)
+
+
+def test_json_body_matches_json_dumps(image_path):
+    request_data = {"messages": [image_message(image_path).to_dict()], "temperature": 0.5, "name": "ünïcode"}
+    body = JsonBody(request_data, chunk_size=1000)
+
+    encoded = b"".join(body)
+
+    assert has_data_urls(request_data)
+    assert json.loads(encoded) == {**plain_request(image_path), "temperature": 0.5, "name": "ünïcode"}
+    assert len(body) == len(encoded)
+    assert b"".join(body) == encoded
+
+
+def test_cache_key_uses_content(image_path):
+    key = completion_cache_key(TEST_ENDPOINT, {"messages": [image_message(image_path).to_dict()]})
+    in_memory = ContentedMessage(role=Role.USER, content=[
+        ImgContent(image_url=ImgUrl(url=BytesDataUrl(IMAGE_BYTES, "image/png"))), TxtContent(text="What is this?")
+    ])
+
+    assert key == completion_cache_key(TEST_ENDPOINT, {"messages": [in_memory.to_dict()]})
+
+
+def test_sync_client_streams_body_with_file_data_url(image_path):
+    client = DialModelClient(TEST_ENDPOINT, TEST_MODEL_NAME, TEST_API_KEY, retry_policy=NO_RETRY)
+
+    with patch('task._utils.model_client.requests.Session.post') as mock_post:
+        mock_post.return_value = Mock(status_code=200, json=Mock(return_value=CHOICES_DATA))
+        client.get_completion([image_message(image_path)])
+
+    kwargs = mock_post.call_args.kwargs
+    assert "json" not in kwargs
+    assert isinstance(kwargs["data"], JsonBody)
+    assert json.loads(b"".join(kwargs["data"])) == plain_request(image_path)
+
+
+@pytest.mark.asyncio
+async def test_async_client_streams_body_with_content_length(image_path):
+    received = {}
+
+    async def handler(request):
+        received["body"] = await request.aread()
+        received["headers"] = request.headers
+        return httpx.Response(200, json=CHOICES_DATA)
+
+    real_async_client = httpx.AsyncClient
+    with patch('task._utils.model_client.httpx.AsyncClient',
+               side_effect=lambda **kwargs: real_async_client(transport=httpx.MockTransport(handler), **kwargs)):
+        async with AsyncDialModelClient(TEST_ENDPOINT, TEST_MODEL_NAME, TEST_API_KEY, retry_policy=NO_RETRY) as client:
+            await client.get_completion([image_message(image_path)])
+
+    assert json.loads(received["body"]) == plain_request(image_path)
+    assert int(received["headers"]["content-length"]) == len(received["body"])
+    assert "transfer-encoding" not in received["headers"]
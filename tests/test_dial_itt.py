@@ -55,7 +55,7 @@ async def test_put_image_creates_attachment():
 
 def test_start_function_with_mocked_dependencies():
     
-    with patch('task.image_to_text.task_dial_itt.DialModelClient') as mock_model_client_class, \
+    with patch('task.image_to_text.task_dial_itt.AsyncDialModelClient') as mock_model_client_class, \
          patch('task.image_to_text.task_dial_itt.start_async', new_callable=AsyncMock) as mock_start_async, \
          patch('builtins.print') as mock_print, \
          patch('asyncio.run') as mock_asyncio_run:
@@ -110,7 +110,7 @@ async def test_put_image_with_different_mime_types():
 
 def test_start_function_multiple_images():
     
-    with patch('task.image_to_text.task_dial_itt.DialModelClient') as mock_model_client_class, \
+    with patch('task.image_to_text.task_dial_itt.AsyncDialModelClient') as mock_model_client_class, \
          patch('task.image_to_text.task_dial_itt.start_async', new_callable=AsyncMock) as mock_start_async, \
          patch('builtins.print') as mock_print, \
          patch('asyncio.run') as mock_asyncio_run:
@@ -140,4 +140,19 @@ def test_start_function_multiple_images():
         mock_asyncio_run.return_value = mock_attachments
         
 
-        start()
\ No newline at end of file
+        start()
+
+@pytest.mark.asyncio
+async def test_bucket_lookup_happens_once_for_concurrent_uploads():
+    with patch('task._utils.bucket_client.httpx.AsyncClient') as mock_httpx_client:
+        mock_http_instance = AsyncMock()
+        mock_response_get = MagicMock()
+        mock_response_get.json.return_value = {"bucket": "test_bucket"}
+        mock_http_instance.get.return_value = mock_response_get
+        mock_httpx_client.return_value = mock_http_instance
+
+        async with DialBucketClient(api_key="test_key", base_url="https://dial") as client:
+            buckets = await asyncio.gather(*(client._get_bucket() for _ in range(5)))
+
+        assert buckets == ["test_bucket"] * 5
+        mock_http_instance.get.assert_called_once_with('/v1/bucket')
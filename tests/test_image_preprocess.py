@@ -0,0 +1,128 @@
+import io
+import sys
+import tempfile
+
+import pytest
+from unittest.mock import patch
+
+from task._utils.image_preprocess import (
+    DEFAULT_MAX_DIMENSION, ImageFormat, ImageSettings, PreprocessedImageCache,
+    max_dimension_for_model, prepare_image_bytes, prepare_image_file, preprocess_image
+)
+
+ORIGINAL = b"original image bytes" * 10
+
+
+@pytest.mark.parametrize("model, expected", [
+    ("gpt-4o", 2048),
+    ("gpt-4o-mini-2024-07-18", 2048),
+    ("anthropic.claude-v3-haiku", 1568),
+    ("gemini-1.5-pro", 3072),
+    ("unknown-model", DEFAULT_MAX_DIMENSION),
+])
+def test_max_dimension_for_model(model, expected):
+    assert max_dimension_for_model(model) == expected
+
+
+def test_settings_for_model():
+    settings = ImageSettings.for_model("gpt-4o", format=ImageFormat.WEBP, quality=70)
+
+    assert settings == ImageSettings(max_dimension=2048, format=ImageFormat.WEBP, quality=70, model="gpt-4o")
+    assert settings.mime_type == "image/webp"
+    assert settings.extension == ".webp"
+    assert ImageSettings().extension == ".jpg"
+    assert settings.cache_key("abc") != ImageSettings.for_model("gemini-1.5-pro", ImageFormat.WEBP, 70).cache_key("abc")
+
+
+def test_missing_pillow_raises_helpful_import_error():
+    with patch.dict(sys.modules, {"PIL": None}):
+        with pytest.raises(ImportError, match="pip install Pillow"):
+            preprocess_image(ORIGINAL, ImageSettings())
+
+
+def test_prepare_image_file_caches_variant(tmp_path):
+    image_path = tmp_path / "banner.png"
+    image_path.write_bytes(ORIGINAL)
+    cache = PreprocessedImageCache(tmp_path / "cache")
+    settings = ImageSettings.for_model("gpt-4o")
+
+    with patch("task._utils.image_preprocess.preprocess_image", return_value=b"small") as mock_preprocess:
+        first = prepare_image_file(image_path, "image/png", settings, cache)
+        second = prepare_image_file(image_path, "image/png", settings, cache)
+
+    mock_preprocess.assert_called_once()
+    assert first == second
+    assert first[0].read_bytes() == b"small"
+    assert first[1] == "image/jpeg"
+
+
+def test_prepare_keeps_original_when_not_smaller(tmp_path):
+    image_path = tmp_path / "banner.png"
+    image_path.write_bytes(ORIGINAL)
+    cache = PreprocessedImageCache(tmp_path / "cache")
+
+    with patch("task._utils.image_preprocess.preprocess_image", return_value=ORIGINAL * 2):
+        assert prepare_image_file(image_path, "image/png", ImageSettings(), cache) == (image_path, "image/png")
+        assert prepare_image_bytes(ORIGINAL, "image/png", ImageSettings(), cache) == (ORIGINAL, "image/png")
+
+
+def test_preprocess_image_downscales_and_recompresses():
+    Image = pytest.importorskip("PIL.Image")
+    source = io.BytesIO()
+    Image.new("RGBA", (4000, 1000), (255, 0, 0, 128)).save(source, format="PNG")
+
+    processed = preprocess_image(source.getvalue(), ImageSettings(max_dimension=1000, format=ImageFormat.JPEG))
+
+    with Image.open(io.BytesIO(processed)) as image:
+        assert image.format == "JPEG"
+        assert image.size == (1000, 250)
+
+
+@pytest.mark.asyncio
+async def test_dial_upload_sends_preprocessed_variant(tmp_path):
+    from task.image_to_text import task_dial_itt
+    from tests.mock_client import MockDialBucketClient
+
+    variant = tmp_path / "variant.jpg"
+    client = MockDialBucketClient()
+    client.put_file.return_value = {"url": "files/mock_bucket_id/banner.jpg"}
+
+    with patch("task.image_to_text.task_dial_itt.prepare_image_file", return_value=(variant, "image/jpeg")):
+        attachment = await task_dial_itt._put_image("banner.png", "image/png", client=client,
+                                                    image_settings=ImageSettings.for_model("gpt-4o"))
+
+    client.put_file.assert_called_once_with("banner.jpg", "image/jpeg", variant)
+    assert (attachment.title, attachment.type) == ("banner.png", "image/jpeg")
+
+
+def test_preprocess_image_applies_exif_orientation():
+    Image = pytest.importorskip("PIL.Image")
+    source = io.BytesIO()
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    Image.new("RGB", (400, 100), (0, 128, 255)).save(source, format="JPEG", exif=exif)
+
+    processed = preprocess_image(source.getvalue(), ImageSettings(max_dimension=200, format=ImageFormat.JPEG))
+
+    with Image.open(io.BytesIO(processed)) as image:
+        assert image.size == (50, 200)
+
+
+def test_cache_store_uses_unique_temporary_files(tmp_path):
+    cache = PreprocessedImageCache(tmp_path)
+    path = cache.path_for("abc", ImageSettings())
+    temporary = []
+    original = tempfile.NamedTemporaryFile
+
+    def recording_temporary_file(*args, **kwargs):
+        file = original(*args, **kwargs)
+        temporary.append(file.name)
+        return file
+
+    with patch("task._utils.image_preprocess.tempfile.NamedTemporaryFile", side_effect=recording_temporary_file):
+        cache.store(path, b"first")
+        cache.store(path, b"second")
+
+    assert len(set(temporary)) == 2
+    assert path.read_bytes() == b"second"
+    assert list(tmp_path.iterdir()) == [path]
@@ -36,7 +36,7 @@ class TestImageToText:
         start_openai_itt = task_module.start
 
 
-        with patch('task._utils.model_client.requests.post') as mock_post:
+        with patch('task._utils.model_client.requests.Session.post') as mock_post:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = {
@@ -56,7 +56,7 @@ class TestImageToText:
         start_openai_itt = task_module.start
 
 
-        with patch('task._utils.model_client.requests.post') as mock_post:
+        with patch('task._utils.model_client.requests.Session.post') as mock_post:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = {
@@ -150,8 +150,7 @@ class TestImageToText:
         start_dial_itt = task_module.start
 
 
-        with patch('task._utils.bucket_client.httpx.AsyncClient') as mock_httpx_client, \
-             patch('task._utils.model_client.requests.post') as mock_requests_post:
+        with patch('task._utils.bucket_client.httpx.AsyncClient') as mock_httpx_client:
 
 
             mock_http_instance = AsyncMock()
@@ -171,11 +170,11 @@ class TestImageToText:
             mock_response.json.return_value = {
                 "choices": [{"message": {"role": "assistant", "content": "Test DIAL analysis result"}}]
             }
-            mock_requests_post.return_value = mock_response
+            mock_http_instance.post.return_value = mock_response
 
             start_dial_itt()
 
-            mock_requests_post.assert_called_once()
+            mock_http_instance.post.assert_called_once()
 
     def test_dial_itt_message_with_attachment(self):
         
@@ -249,7 +248,6 @@ class TestImageToText:
         start_async = task_module.start_async
 
         with patch('task._utils.bucket_client.httpx.AsyncClient') as mock_httpx_client, \
-             patch('task._utils.model_client.requests.post') as mock_requests_post, \
              patch('task.image_to_text.task_dial_itt.Path') as mock_path, \
              patch('builtins.open', create=True) as mock_file, \
              patch('task.image_to_text.task_dial_itt._put_image') as mock_put_image:
@@ -286,11 +284,11 @@ class TestImageToText:
             mock_response.json.return_value = {
                 "choices": [{"message": {"role": "assistant", "content": "Complete workflow analysis result"}}]
             }
-            mock_requests_post.return_value = mock_response
+            mock_http_instance.post.return_value = mock_response
 
             asyncio.run(start_async())
 
-            mock_requests_post.assert_called_once()
+            mock_http_instance.post.assert_called_once()
             
     @pytest.mark.parametrize("filenames,model", [
         (["dialx-banner.png"], "gpt-4o"),
@@ -305,7 +303,6 @@ class TestImageToText:
         start_async = task_module.start_async
 
         with patch('task._utils.bucket_client.httpx.AsyncClient') as mock_httpx_client, \
-             patch('task._utils.model_client.requests.post') as mock_requests_post, \
              patch('task.image_to_text.task_dial_itt.Path') as mock_path, \
              patch('builtins.open', create=True) as mock_file, \
              patch('task.image_to_text.task_dial_itt._put_image') as mock_put_image:
@@ -340,12 +337,12 @@ class TestImageToText:
             mock_response.json.return_value = {
                 "choices": [{"message": {"role": "assistant", "content": f"Analysis result for {model} with {len(filenames)} images"}}]
             }
-            mock_requests_post.return_value = mock_response
+            mock_http_instance.post.return_value = mock_response
 
             asyncio.run(start_async(filenames, model))
 
-            mock_requests_post.assert_called_once()
-            assert model in str(mock_requests_post.call_args)
+            mock_http_instance.post.assert_called_once()
+            assert model in str(mock_http_instance.post.call_args)
             
     @pytest.mark.parametrize("filenames", [
         (["dialx-banner.png"]),
@@ -357,7 +354,6 @@ class TestImageToText:
         start_async = task_module.start_async
 
         with patch('task._utils.bucket_client.httpx.AsyncClient') as mock_httpx_client, \
-             patch('task._utils.model_client.requests.post') as mock_requests_post, \
              patch('task.image_to_text.task_dial_itt.Path') as mock_path, \
              patch('builtins.open', create=True) as mock_file, \
              patch('task.image_to_text.task_dial_itt._put_image') as mock_put_image:
@@ -392,19 +388,18 @@ class TestImageToText:
             mock_response.json.return_value = {
                 "choices": [{"message": {"role": "assistant", "content": f"Analysis result for gpt-4o with {len(filenames)} images"}}]
             }
-            mock_requests_post.return_value = mock_response
+            mock_http_instance.post.return_value = mock_response
 
             asyncio.run(start_async(filenames, "gpt-4o"))
 
-            mock_requests_post.assert_called_once()
-            assert "gpt-4o" in str(mock_requests_post.call_args)
+            mock_http_instance.post.assert_called_once()
+            assert "gpt-4o" in str(mock_http_instance.post.call_args)
             
     def test_single_image_with_anthropic_model(self):
         task_module = load_task_module("task/image_to_text/task_dial_itt.py", "task_dial_itt")
         start_async = task_module.start_async
 
         with patch('task._utils.bucket_client.httpx.AsyncClient') as mock_httpx_client, \
-             patch('task._utils.model_client.requests.post') as mock_requests_post, \
              patch('task.image_to_text.task_dial_itt.Path') as mock_path, \
              patch('builtins.open', create=True) as mock_file, \
              patch('task.image_to_text.task_dial_itt._put_image') as mock_put_image:
@@ -438,9 +433,9 @@ class TestImageToText:
             mock_response.json.return_value = {
                 "choices": [{"message": {"role": "assistant", "content": "Analysis result for anthropic.claude-v3-haiku with 1 image"}}]
             }
-            mock_requests_post.return_value = mock_response
+            mock_http_instance.post.return_value = mock_response
 
             asyncio.run(start_async(["dialx-banner.png"], "anthropic.claude-v3-haiku"))
 
-            mock_requests_post.assert_called_once()
-            assert "anthropic.claude-v3-haiku" in str(mock_requests_post.call_args)
\ No newline at end of file
+            mock_http_instance.post.assert_called_once()
+            assert "anthropic.claude-v3-haiku" in str(mock_http_instance.post.call_args)
\ No newline at end of file
@@ -0,0 +1,164 @@
+import asyncio
+import json
+
+import pytest
+from unittest.mock import patch
+
+from task._models.message import Message
+from task._models.role import Role
+from task._utils.jsonl_executor import LatencyStats, execute_jsonl, load_checkpoint, parse_request
+
+
+class FakeAsyncModelClient:
+    calls = []
+    parameters = []
+
+    def __init__(self, *args, **kwargs):
+        self.deployment_name = kwargs["deployment_name"]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        pass
+
+    async def get_completion(self, messages, custom_fields=None, **kwargs):
+        prompt = messages[-1].content
+        FakeAsyncModelClient.calls.append(prompt)
+        FakeAsyncModelClient.parameters.append(kwargs)
+        if prompt == "fail":
+            raise RuntimeError("boom")
+        await asyncio.sleep(0.02 if prompt == "slow" else 0)
+        return Message(role=Role.AI, content=f"{self.deployment_name}:{prompt}")
+
+
+@pytest.fixture(autouse=True)
+def fake_client():
+    FakeAsyncModelClient.calls = []
+    FakeAsyncModelClient.parameters = []
+    with patch('task._utils.jsonl_executor.AsyncDialModelClient', FakeAsyncModelClient):
+        yield
+
+
+def write_requests(path, prompts):
+    with open(path, "w") as f:
+        for prompt in prompts:
+            f.write(json.dumps({"messages": [{"role": "user", "content": prompt}]}) + "\n")
+    return path
+
+
+def read_results(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_parse_request_splits_parameters_and_custom_fields():
+    messages, parameters, custom_fields = parse_request({
+        "messages": [{"role": "user", "content": "hi"}], "temperature": 0.2, "max_tokens": 50, "size": "1024x1024", "id": "a",
+    })
+    assert messages[0].content == "hi"
+    assert parameters == {"temperature": 0.2, "max_tokens": 50}
+    assert custom_fields == {"size": "1024x1024"}
+
+    messages, _, _ = parse_request({"request_id": "user-001", "body": "Do it"}, prompt_field="body")
+    assert messages == [Message(role=Role.USER, content="Do it")]
+
+    with pytest.raises(ValueError):
+        parse_request({"body": "Do it"})
+
+
+def test_latency_stats_percentiles():
+    stats = LatencyStats()
+    for latency in range(1, 101):
+        stats.record(latency / 100, ok=latency != 100)
+
+    assert stats.percentile(50) == 0.5
+    assert stats.percentile(99) == 0.99
+    assert (stats.succeeded, stats.failed) == (99, 1)
+
+
+def test_latency_stats_keep_a_bounded_sample():
+    stats = LatencyStats(max_samples=100)
+    for latency in range(1, 10_001):
+        stats.record(latency / 10_000, ok=True)
+
+    assert len(stats.latencies) == 100
+    assert stats.finished == 10_000
+    assert 0.3 < stats.percentile(50) < 0.7
+    assert stats.percentiles(50, 99) == [stats.percentile(50), stats.percentile(99)]
+
+
+@pytest.mark.asyncio
+async def test_input_error_stops_consumers(tmp_path):
+    async def failing_lines(input_path, skip):
+        yield 0, json.dumps({"messages": [{"role": "user", "content": "a"}]})
+        raise UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+
+    with patch('task._utils.jsonl_executor._read_lines', failing_lines):
+        with pytest.raises(UnicodeDecodeError):
+            await asyncio.wait_for(execute_jsonl(tmp_path / "in.jsonl", tmp_path / "out.jsonl", model="m", concurrency=2), timeout=5)
+
+    await asyncio.sleep(0)
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+@pytest.mark.asyncio
+async def test_results_are_written_in_input_order(tmp_path):
+    input_path = write_requests(tmp_path / "in.jsonl", ["slow", "a", "fail", "b"])
+    output_path = tmp_path / "out.jsonl"
+
+    stats = await execute_jsonl(input_path, output_path, model="m", concurrency=3)
+
+    results = read_results(output_path)
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert [result["status"] for result in results] == ["ok", "ok", "error", "ok"]
+    assert results[0]["response"]["content"] == "m:slow"
+    assert (stats.succeeded, stats.failed) == (3, 1)
+
+
+@pytest.mark.asyncio
+async def test_completion_order_writes_fast_results_first(tmp_path):
+    input_path = write_requests(tmp_path / "in.jsonl", ["slow", "a", "b"])
+    output_path = tmp_path / "out.jsonl"
+
+    await execute_jsonl(input_path, output_path, concurrency=3, ordered=False)
+
+    assert [result["index"] for result in read_results(output_path)][-1] == 0
+
+
+@pytest.mark.asyncio
+async def test_resume_skips_checkpointed_requests_and_drops_partial_line(tmp_path):
+    input_path = write_requests(tmp_path / "in.jsonl", ["a", "b", "c"])
+    output_path = tmp_path / "out.jsonl"
+    output_path.write_text(json.dumps({"index": 0, "status": "ok"}) + "\n" + '{"index": 1, "sta')
+
+    assert load_checkpoint(output_path) == {0}
+
+    await execute_jsonl(input_path, output_path, concurrency=2)
+
+    assert FakeAsyncModelClient.calls == ["b", "c"]
+    assert [result["index"] for result in read_results(output_path)] == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_resume_retries_failed_requests(tmp_path):
+    input_path = write_requests(tmp_path / "in.jsonl", ["a", "b"])
+    output_path = tmp_path / "out.jsonl"
+    output_path.write_text(
+        json.dumps({"index": 0, "status": "ok"}) + "\n" + json.dumps({"index": 1, "status": "error", "error": "boom"}) + "\n"
+    )
+
+    await execute_jsonl(input_path, output_path)
+
+    assert FakeAsyncModelClient.calls == ["b"]
+    assert read_results(output_path)[-1]["status"] == "ok"
+    assert load_checkpoint(output_path) == {0, 1}
+
+
+@pytest.mark.asyncio
+async def test_standard_parameters_are_passed_as_arguments(tmp_path):
+    input_path = tmp_path / "in.jsonl"
+    input_path.write_text(json.dumps({"messages": [{"role": "user", "content": "a"}], "temperature": 0.5}) + "\n")
+
+    await execute_jsonl(input_path, tmp_path / "out.jsonl")
+
+    assert FakeAsyncModelClient.parameters == [{"temperature": 0.5}]
@@ -0,0 +1,76 @@
+from unittest.mock import Mock, patch
+
+from task._models.message import Message
+from task._models.role import Role
+from task._utils.model_client import DialModelClient
+from tests.test_data import CHOICES_DATA, TEST_API_KEY, TEST_CONTENT, TEST_ENDPOINT, TEST_MODEL_NAME
+
+
+def make_client(**kwargs):
+    return DialModelClient(
+        endpoint=TEST_ENDPOINT,
+        deployment_name=TEST_MODEL_NAME,
+        api_key=TEST_API_KEY,
+        **kwargs
+    )
+
+
+def make_response(status_code=200, json_data=None, text=""):
+    response = Mock()
+    response.status_code = status_code
+    response.json.return_value = json_data
+    response.text = text
+    return response
+
+
+def test_session_adapter_uses_pool_settings():
+    client = make_client(pool_connections=4, pool_maxsize=16, max_retries=2)
+
+    adapter = client._session.get_adapter(TEST_ENDPOINT)
+
+    assert adapter._pool_connections == 4
+    assert adapter._pool_maxsize == 16
+    assert adapter.max_retries.total == 2
+
+
+def test_session_is_reused_between_calls():
+    client = make_client()
+    message = Message(role=Role.USER, content=TEST_CONTENT)
+
+    with patch('task._utils.model_client.requests.Session.post') as mock_post:
+        mock_post.return_value = make_response(json_data=CHOICES_DATA)
+
+        client.get_completion([message])
+        client.get_completion([message])
+
+        assert mock_post.call_count == 2
+
+
+def test_context_manager_closes_session():
+    with patch('task._utils.model_client.requests.Session.close') as mock_close:
+        with make_client() as client:
+            assert isinstance(client, DialModelClient)
+
+        mock_close.assert_called_once()
+
+
+def test_contented_message_is_sent_as_content_parts():
+    from task.image_to_text.openai.message import ContentedMessage, ImgContent, ImgUrl, TxtContent
+
+    message = ContentedMessage(role=Role.USER, content=[
+        ImgContent(image_url=ImgUrl(url="data:image/png;base64,AAAA")),
+        TxtContent(text="What do you see?"),
+    ])
+    client = DialModelClient(TEST_ENDPOINT, TEST_MODEL_NAME, TEST_API_KEY)
+
+    with patch('task._utils.model_client.requests.Session.post') as mock_post:
+        mock_post.return_value = Mock(status_code=200, json=Mock(return_value=CHOICES_DATA))
+        client.get_completion([message])
+
+    assert mock_post.call_args.kwargs['json']['messages'] == [{
+        "role": "user",
+        "content": [
+            {"image_url": {"url": "data:image/png;base64,AAAA"}, "type": "image_url"},
+            {"text": "What do you see?", "type": "text"},
+        ],
+    }]
@@ -2,6 +2,7 @@ import base64
 from unittest.mock import MagicMock, patch
 
 from task.image_to_text.openai.task_openai_itt import start
+from task._utils.data_url import BytesDataUrl, FileDataUrl
 from task._utils.model_client import DialModelClient
 from task._models.role import Role
 from task.image_to_text.openai.message import ContentedMessage, TxtContent, ImgContent
@@ -9,21 +10,14 @@ from task.image_to_text.openai.message import ContentedMessage, TxtContent, ImgC
 
 def test_start_function_with_mocked_dependencies():
     
-    with patch('task.image_to_text.openai.task_openai_itt.Path') as mock_path, \
-         patch('builtins.open', create=True) as mock_open, \
+    with patch('task.image_to_text.openai.task_openai_itt.FileDataUrl') as mock_file_data_url, \
          patch('task.image_to_text.openai.task_openai_itt.DialModelClient') as mock_model_client_class, \
          patch('builtins.print') as mock_print:
         
 
-        mock_path_instance = MagicMock()
-        mock_path_instance.__truediv__ = lambda self, other: mock_path_instance
-        mock_path.return_value = mock_path_instance
-        mock_path_instance.__str__ = MagicMock(return_value='dialx-banner.png')
         
 
-        mock_file = MagicMock()
-        mock_file.read.return_value = b'test_image_data'
-        mock_open.return_value.__enter__.return_value = mock_file
+        mock_file_data_url.return_value = BytesDataUrl(b'test_image_data', 'image/png')
         
 
         mock_model_instance = MagicMock()
@@ -41,24 +35,17 @@ def test_start_function_with_mocked_dependencies():
 
 def test_start_function_base64_encoding():
     
-    with patch('task.image_to_text.openai.task_openai_itt.Path') as mock_path, \
-         patch('builtins.open', create=True) as mock_open, \
+    with patch('task.image_to_text.openai.task_openai_itt.FileDataUrl') as mock_file_data_url, \
          patch('task.image_to_text.openai.task_openai_itt.DialModelClient') as mock_model_client_class, \
          patch('builtins.print') as mock_print:
         
 
-        mock_path_instance = MagicMock()
-        mock_path_instance.__truediv__ = lambda self, other: mock_path_instance
-        mock_path.return_value = mock_path_instance
-        mock_path_instance.__str__ = MagicMock(return_value='dialx-banner.png')
         
 
         test_image_data = b'test_image_bytes'
         expected_base64 = base64.b64encode(test_image_data).decode('utf-8')
         
-        mock_file = MagicMock()
-        mock_file.read.return_value = test_image_data
-        mock_open.return_value.__enter__.return_value = mock_file
+        mock_file_data_url.return_value = BytesDataUrl(test_image_data, 'image/png')
         
 
         mock_model_instance = MagicMock()
@@ -76,21 +63,14 @@ def test_start_function_base64_encoding():
 
 def test_start_function_with_different_models():
     
-    with patch('task.image_to_text.openai.task_openai_itt.Path') as mock_path, \
-         patch('builtins.open', create=True) as mock_open, \
+    with patch('task.image_to_text.openai.task_openai_itt.FileDataUrl') as mock_file_data_url, \
          patch('task.image_to_text.openai.task_openai_itt.DialModelClient') as mock_model_client_class, \
          patch('builtins.print') as mock_print:
         
 
-        mock_path_instance = MagicMock()
-        mock_path_instance.__truediv__ = lambda self, other: mock_path_instance
-        mock_path.return_value = mock_path_instance
-        mock_path_instance.__str__ = MagicMock(return_value='dialx-banner.png')
         
 
-        mock_file = MagicMock()
-        mock_file.read.return_value = b'test_image_data'
-        mock_open.return_value.__enter__.return_value = mock_file
+        mock_file_data_url.return_value = BytesDataUrl(b'test_image_data', 'image/png')
         
 
         mock_model_instance = MagicMock()
@@ -108,21 +88,14 @@ def test_start_function_with_different_models():
 
 def test_start_function_with_downloadable_image():
     
-    with patch('task.image_to_text.openai.task_openai_itt.Path') as mock_path, \
-         patch('builtins.open', create=True) as mock_open, \
+    with patch('task.image_to_text.openai.task_openai_itt.FileDataUrl') as mock_file_data_url, \
          patch('task.image_to_text.openai.task_openai_itt.DialModelClient') as mock_model_client_class, \
          patch('builtins.print') as mock_print:
         
 
-        mock_path_instance = MagicMock()
-        mock_path_instance.__truediv__ = lambda self, other: mock_path_instance
-        mock_path.return_value = mock_path_instance
-        mock_path_instance.__str__ = MagicMock(return_value='dialx-banner.png')
         
 
-        mock_file = MagicMock()
-        mock_file.read.return_value = b'test_image_data'
-        mock_open.return_value.__enter__.return_value = mock_file
+        mock_file_data_url.return_value = BytesDataUrl(b'test_image_data', 'image/png')
         
 
         mock_model_instance = MagicMock()
@@ -135,4 +108,30 @@ def test_start_function_with_downloadable_image():
         mock_model_client_class.return_value = mock_model_instance
         
 
-        start()
\ No newline at end of file
+        start()
+
+def test_start_sends_image_as_content_part():
+    with patch('task.image_to_text.openai.task_openai_itt.DialModelClient') as mock_model_client_class:
+        mock_model_instance = MagicMock()
+        mock_model_client_class.return_value = mock_model_instance
+
+        start()
+
+    sent = mock_model_instance.get_completion.call_args.args[0][0]
+    assert isinstance(sent, ContentedMessage)
+    assert isinstance(sent.content[0], ImgContent)
+    data_url = sent.content[0].image_url.url
+    assert isinstance(data_url, FileDataUrl)
+    assert data_url.path.name == "dialx-banner.png"
+    assert str(data_url) == "data:image/png;base64," + base64.b64encode(data_url.path.read_bytes()).decode()
+
+
+def test_convert_contented_message_keeps_text_parts():
+    from task.image_to_text.openai.message import ImgUrl
+    from task.image_to_text.openai.task_openai_itt import convert_contented_message_to_message
+
+    message = ContentedMessage(role=Role.USER, content=[
+        TxtContent(text="Hello, "), ImgContent(image_url=ImgUrl(url="data:image/png;base64,AAAA")), TxtContent(text="world")
+    ])
+
+    assert convert_contented_message_to_message(message).content == "Hello, world"
@@ -38,7 +38,7 @@ class TestParameterSpecific:
             content=TEST_MESSAGE_CONTENT
         )
         
-        with patch('requests.post') as mock_post:
+        with patch('requests.Session.post') as mock_post:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = CHOICES_DATA
@@ -69,7 +69,7 @@ class TestParameterSpecific:
             content=TEST_MESSAGE_CONTENT
         )
         
-        with patch('requests.post') as mock_post:
+        with patch('requests.Session.post') as mock_post:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = CHOICES_DATA
@@ -100,7 +100,7 @@ class TestParameterSpecific:
             content=TEST_MESSAGE_CONTENT
         )
         
-        with patch('requests.post') as mock_post:
+        with patch('requests.Session.post') as mock_post:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = CHOICES_DATA
@@ -131,7 +131,7 @@ class TestParameterSpecific:
             content=TEST_MESSAGE_CONTENT
         )
         
-        with patch('requests.post') as mock_post:
+        with patch('requests.Session.post') as mock_post:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = CHOICES_DATA
@@ -161,7 +161,7 @@ class TestParameterSpecific:
             content=TEST_MESSAGE_CONTENT
         )
         
-        with patch('requests.post') as mock_post:
+        with patch('requests.Session.post') as mock_post:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = CHOICES_DATA
@@ -191,7 +191,7 @@ class TestParameterSpecific:
             content=TEST_MESSAGE_CONTENT
         )
         
-        with patch('requests.post') as mock_post:
+        with patch('requests.Session.post') as mock_post:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = CHOICES_DATA
@@ -234,7 +234,7 @@ class TestParameterSpecific:
             content=TEST_MESSAGE_CONTENT
         )
         
-        with patch('requests.post') as mock_post:
+        with patch('requests.Session.post') as mock_post:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = CHOICES_DATA
@@ -264,7 +264,7 @@ class TestParameterSpecific:
             content=TEST_MESSAGE_CONTENT
         )
         
-        with patch('requests.post') as mock_post:
+        with patch('requests.Session.post') as mock_post:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = CHOICES_DATA
@@ -294,7 +294,7 @@ class TestParameterSpecific:
             content=TEST_MESSAGE_CONTENT
         )
         
-        with patch('requests.post') as mock_post:
+        with patch('requests.Session.post') as mock_post:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = CHOICES_DATA
@@ -336,7 +336,7 @@ class TestParameterSpecific:
             content=TEST_MESSAGE_CONTENT
         )
         
-        with patch('requests.post') as mock_post:
+        with patch('requests.Session.post') as mock_post:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = CHOICES_DATA
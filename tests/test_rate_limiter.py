@@ -0,0 +1,123 @@
+import pytest
+from unittest.mock import Mock, patch
+
+from task._models.message import Message
+from task._models.role import Role
+from task._utils.model_client import DialModelClient
+from task._utils.rate_limiter import DeploymentRateLimiter, TokenBucket, estimate_request_tokens, get_rate_limiter
+from task._utils.tokens import IMAGE_PART_TOKENS
+from tests.test_data import CHOICES_DATA, TEST_API_KEY, TEST_ENDPOINT
+
+
+def test_token_bucket_reports_wait_when_exhausted():
+    bucket = TokenBucket(capacity=2, rate=1.0)
+
+    assert bucket.reserve(1, now=bucket._updated) == 0.0
+    assert bucket.reserve(1, now=bucket._updated) == 0.0
+    assert bucket.reserve(1, now=bucket._updated) == pytest.approx(1.0)
+
+
+def test_limiter_without_budgets_never_waits():
+    limiter = DeploymentRateLimiter()
+
+    assert all(limiter.reserve(tokens=10_000) == 0.0 for _ in range(100))
+
+
+def test_limiter_enforces_requests_per_minute():
+    limiter = DeploymentRateLimiter(requests_per_minute=60)
+
+    delays = [limiter.reserve() for _ in range(61)]
+
+    assert delays[:60] == [0.0] * 60
+    assert delays[60] == pytest.approx(1.0, abs=0.05)
+
+
+def test_limiter_enforces_tokens_per_minute():
+    limiter = DeploymentRateLimiter(tokens_per_minute=600)
+
+    assert limiter.reserve(tokens=600) == 0.0
+    assert limiter.reserve(tokens=100) == pytest.approx(10.0, abs=0.05)
+
+
+def test_retry_after_pauses_callers():
+    limiter = DeploymentRateLimiter(requests_per_minute=1000)
+
+    limiter.update_from_headers({"Retry-After": "5"}, status_code=429)
+
+    assert limiter.reserve() == pytest.approx(5.0, abs=0.05)
+
+
+def test_headers_adapt_budgets():
+    limiter = DeploymentRateLimiter(requests_per_minute=1000, tokens_per_minute=100_000)
+
+    limiter.update_from_headers({
+        "x-ratelimit-limit-requests": "100",
+        "x-ratelimit-remaining-requests": "0",
+        "x-ratelimit-limit-tokens": "1000",
+    }, status_code=200)
+
+    assert limiter._requests.capacity == pytest.approx(95)
+    assert limiter._tokens.capacity == pytest.approx(950)
+    assert limiter.reserve() > 0
+
+
+def test_non_mapping_headers_are_ignored():
+    limiter = DeploymentRateLimiter(requests_per_minute=10)
+
+    limiter.update_from_headers(Mock(), status_code=200)
+
+    assert limiter.reserve() == 0.0
+
+
+def test_estimate_request_tokens():
+    request_data = {"messages": [{"role": "user", "content": "x" * 40}], "max_tokens": 10}
+
+    assert estimate_request_tokens(request_data) == 20
+
+
+def test_estimate_request_tokens_counts_content_parts():
+    request_data = {"messages": [{"role": "user", "content": [
+        {"type": "image_url", "image_url": {"url": "data:image/png;base64," + "A" * 4000}},
+        {"type": "text", "text": "x" * 40},
+    ]}]}
+
+    assert estimate_request_tokens(request_data) == 10 + IMAGE_PART_TOKENS
+
+
+def test_limiter_is_shared_per_deployment():
+    first = get_rate_limiter("shared-deployment", requests_per_minute=10)
+    second = get_rate_limiter("shared-deployment", requests_per_minute=10)
+
+    assert first is second
+    assert get_rate_limiter("other-deployment") is not first
+
+
+def test_limiter_is_reconfigured_when_budget_differs():
+    limiter = get_rate_limiter("reconfigured-deployment", requests_per_minute=10)
+
+    assert get_rate_limiter("reconfigured-deployment", requests_per_minute=99, tokens_per_minute=1000) is limiter
+    assert limiter.requests_per_minute == 99
+    assert limiter._requests.capacity == 99
+    assert limiter._tokens.capacity == 1000
+
+
+def test_client_waits_for_capacity():
+    client = DialModelClient(
+        endpoint=TEST_ENDPOINT,
+        deployment_name="rate-limited-test-model",
+        api_key=TEST_API_KEY,
+        requests_per_minute=1
+    )
+    message = Message(role=Role.USER, content="Test")
+
+    with patch('task._utils.model_client.requests.Session.post') as mock_post, \
+         patch('task._utils.rate_limiter.time.sleep') as mock_sleep:
+        response = Mock(status_code=200, headers={})
+        response.json.return_value = CHOICES_DATA
+        mock_post.return_value = response
+
+        client.get_completion([message])
+        client.get_completion([message])
+
+        mock_sleep.assert_called_once()
+        assert mock_sleep.call_args.args[0] > 0
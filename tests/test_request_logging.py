@@ -0,0 +1,94 @@
+import itertools
+import logging
+
+import pytest
+
+from task._utils import request
+from task._utils.request import configure_request_logging, log_response, print_request
+
+REQUEST_DATA = {
+    "messages": [
+        {"role": "user", "content": "x" * 500},
+        {"role": "user", "content": [
+            {"type": "image_url", "image_url": {"url": "data:image/png;base64," + "A" * 10_000}},
+            {"type": "text", "text": "What is on the picture?"},
+        ]},
+    ],
+    "temperature": 0.2,
+}
+HEADERS = {"api-key": "abcdefghijklmnopqrstuvwxyz", "Content-Type": "application/json"}
+
+
+@pytest.fixture(autouse=True)
+def restore_settings():
+    yield
+    configure_request_logging()
+
+
+def test_nothing_is_formatted_when_info_is_disabled(caplog, monkeypatch):
+    monkeypatch.setattr(request, "_preview_content", lambda content: pytest.fail("content was formatted"))
+
+    with caplog.at_level(logging.WARNING, logger=request.logger.name):
+        print_request("https://endpoint", REQUEST_DATA, HEADERS)
+
+    assert caplog.records == []
+
+
+def test_request_is_logged_with_masked_key_and_without_base64(caplog):
+    with caplog.at_level(logging.INFO, logger=request.logger.name):
+        print_request("https://endpoint", REQUEST_DATA, HEADERS)
+
+    assert len(caplog.records) == 1
+    text = caplog.records[0].getMessage()
+    assert "abcdefgh...wxyz" in text
+    assert "[image] What is on the picture?" in text
+    assert "AAAA" not in text
+    assert "temperature: 0.2" in text
+
+
+def test_sampling_logs_one_in_n(caplog):
+    configure_request_logging(sample_rate=3)
+
+    with caplog.at_level(logging.INFO, logger=request.logger.name):
+        for _ in range(9):
+            print_request("https://endpoint", REQUEST_DATA, HEADERS)
+
+    assert len(caplog.records) == 3
+
+
+def test_output_is_capped(caplog):
+    configure_request_logging(max_chars=50)
+
+    with caplog.at_level(logging.DEBUG, logger=request.logger.name):
+        print_request("https://endpoint", REQUEST_DATA, HEADERS)
+        log_response({"choices": [{"message": {"content": "y" * 1000}}]})
+
+    assert all(len(record.getMessage()) <= 53 for record in caplog.records)
+    assert len(caplog.records) == 2
+
+
+def test_response_is_only_logged_at_debug(caplog):
+    with caplog.at_level(logging.INFO, logger=request.logger.name):
+        log_response({"choices": []})
+
+    assert caplog.records == []
+
+
+def test_invalid_settings_rejected():
+    with pytest.raises(ValueError):
+        configure_request_logging(sample_rate=0)
+
+
+def test_request_and_response_are_sampled_together(caplog, monkeypatch):
+    monkeypatch.setattr(request, "_counter", itertools.count())
+    configure_request_logging(sample_rate=2)
+
+    with caplog.at_level(logging.DEBUG, logger=request.logger.name):
+        for i in range(4):
+            print_request("https://endpoint", REQUEST_DATA, HEADERS)
+            log_response({"choices": [{"message": {"content": f"response {i}"}}]})
+
+    levels = [record.levelno for record in caplog.records]
+    assert levels == [logging.INFO, logging.DEBUG] * 2
+    assert "response 0" in caplog.records[1].getMessage()
+    assert "response 2" in caplog.records[3].getMessage()
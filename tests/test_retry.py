@@ -0,0 +1,187 @@
+import httpx
+import pytest
+import requests
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+from task._models.message import Message
+from task._models.role import Role
+from task._utils.metrics import metrics
+from task._utils.model_client import AsyncDialModelClient, DialHTTPError, DialModelClient
+from task._utils.retry import RetryBudget, RetryPolicy, parse_retry_after
+from tests.test_data import CHOICES_DATA, TEST_API_KEY, TEST_CONTENT, TEST_ENDPOINT
+
+RETRY_DEPLOYMENT = "retry-test-model"
+
+
+def make_response(status_code=200, json_data=None, text="", headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.json.return_value = json_data
+    response.text = text
+    response.headers = headers or {}
+    return response
+
+
+def make_client(policy):
+    return DialModelClient(
+        endpoint=TEST_ENDPOINT,
+        deployment_name=RETRY_DEPLOYMENT,
+        api_key=TEST_API_KEY,
+        retry_policy=policy
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_backoff_grows_exponentially_and_is_capped():
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0, jitter=False)
+
+    assert [policy.backoff(attempt) for attempt in range(1, 6)] == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+
+def test_backoff_honours_retry_after():
+    policy = RetryPolicy(base_delay=0.1, jitter=False)
+
+    assert policy.backoff(1, retry_after=3.0) == 3.0
+
+
+def test_jitter_stays_within_bounds():
+    policy = RetryPolicy(base_delay=1.0, max_delay=2.0)
+
+    assert all(0.0 <= policy.backoff(3) <= 2.0 for _ in range(50))
+
+
+def test_next_delay_respects_max_elapsed():
+    policy = RetryPolicy(base_delay=10.0, jitter=False, max_elapsed=5.0, budget=RetryBudget())
+
+    assert policy.next_delay(1, started=0.0) is None
+
+
+def test_retry_budget_limits_retries():
+    budget = RetryBudget(ratio=0.5, max_tokens=2.0, min_tokens=1.0)
+
+    assert budget.try_withdraw()
+    assert not budget.try_withdraw()
+    budget.record_request()
+    budget.record_request()
+    assert budget.try_withdraw()
+
+
+@pytest.mark.parametrize("headers, expected", [
+    ({"Retry-After": "2"}, 2.0),
+    ({"retry-after": "0.5"}, 0.5),
+    ({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}, None),
+    ({}, None),
+])
+def test_parse_retry_after(headers, expected):
+    assert parse_retry_after(headers) == expected
+
+
+def test_transient_status_is_retried():
+    client = make_client(RetryPolicy(jitter=False, base_delay=0.01, budget=RetryBudget()))
+
+    with patch('task._utils.model_client.requests.Session.post') as mock_post, \
+         patch('task._utils.retry.time.sleep') as mock_sleep:
+        mock_post.side_effect = [
+            make_response(status_code=503, text="Service Unavailable"),
+            make_response(status_code=502, text="Bad Gateway", headers={"Retry-After": "1"}),
+            make_response(json_data=CHOICES_DATA),
+        ]
+
+        result = client.get_completion([Message(role=Role.USER, content=TEST_CONTENT)])
+
+        assert result.content == "Test response"
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [0.01, 1.0]
+        assert metrics.get("model_client.attempts", deployment=RETRY_DEPLOYMENT) == 3
+        assert metrics.get("model_client.retries", deployment=RETRY_DEPLOYMENT) == 2
+
+
+def test_gives_up_after_max_attempts():
+    client = make_client(RetryPolicy(max_attempts=2, jitter=False, base_delay=0.01, budget=RetryBudget()))
+
+    with patch('task._utils.model_client.requests.Session.post') as mock_post, \
+         patch('task._utils.retry.time.sleep'):
+        mock_post.return_value = make_response(status_code=503, text="Service Unavailable")
+
+        with pytest.raises(DialHTTPError, match="HTTP 503") as error:
+            client.get_completion([Message(role=Role.USER, content=TEST_CONTENT)])
+
+        assert error.value.status_code == 503
+        assert mock_post.call_count == 2
+
+
+def test_client_errors_are_not_retried():
+    client = make_client(RetryPolicy(budget=RetryBudget()))
+
+    with patch('task._utils.model_client.requests.Session.post') as mock_post:
+        mock_post.return_value = make_response(status_code=400, text="Bad Request")
+
+        with pytest.raises(DialHTTPError):
+            client.get_completion([Message(role=Role.USER, content=TEST_CONTENT)])
+
+        mock_post.assert_called_once()
+
+
+def test_connection_errors_are_retried():
+    client = make_client(RetryPolicy(jitter=False, base_delay=0.01, budget=RetryBudget()))
+
+    with patch('task._utils.model_client.requests.Session.post') as mock_post, \
+         patch('task._utils.retry.time.sleep'):
+        mock_post.side_effect = [requests.ConnectionError("reset"), make_response(json_data=CHOICES_DATA)]
+
+        result = client.get_completion([Message(role=Role.USER, content=TEST_CONTENT)])
+
+        assert result.content == "Test response"
+        assert mock_post.call_count == 2
+
+
+def test_unlisted_exceptions_are_not_retried():
+    client = make_client(RetryPolicy(budget=RetryBudget()))
+
+    with patch('task._utils.model_client.requests.Session.post') as mock_post:
+        mock_post.side_effect = ValueError("boom")
+
+        with pytest.raises(ValueError):
+            client.get_completion([Message(role=Role.USER, content=TEST_CONTENT)])
+
+        mock_post.assert_called_once()
+
+
+def test_exhausted_budget_stops_retries():
+    client = make_client(RetryPolicy(jitter=False, base_delay=0.01, budget=RetryBudget(ratio=0.0, min_tokens=0.0)))
+
+    with patch('task._utils.model_client.requests.Session.post') as mock_post:
+        mock_post.return_value = make_response(status_code=503, text="Service Unavailable")
+
+        with pytest.raises(DialHTTPError):
+            client.get_completion([Message(role=Role.USER, content=TEST_CONTENT)])
+
+        mock_post.assert_called_once()
+        assert metrics.get("retry.budget_exhausted") == 1
+
+
+@pytest.mark.asyncio
+async def test_async_client_retries_transport_errors():
+    with patch('task._utils.model_client.httpx.AsyncClient') as mock_httpx_client, \
+         patch('task._utils.retry.asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+        ok_response = MagicMock(status_code=200)
+        ok_response.json.return_value = CHOICES_DATA
+        mock_http_instance = AsyncMock()
+        mock_http_instance.post.side_effect = [httpx.ConnectError("refused"), ok_response]
+        mock_httpx_client.return_value = mock_http_instance
+
+        async with AsyncDialModelClient(
+            endpoint=TEST_ENDPOINT,
+            deployment_name=RETRY_DEPLOYMENT,
+            api_key=TEST_API_KEY,
+            retry_policy=RetryPolicy(budget=RetryBudget())
+        ) as client:
+            result = await client.get_completion([Message(role=Role.USER, content=TEST_CONTENT)])
+
+        assert result.content == "Test response"
+        mock_sleep.assert_awaited_once()
@@ -0,0 +1,156 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from task._models.message import Message
+from task._models.role import Role
+from task._utils.context_window import ContextWindow
+from task._utils.model_client import AsyncDialModelClient, DialHTTPError
+from task._utils.routing_client import (
+    AsyncRoutingModelClient,
+    DeploymentPool,
+    RoutingModelClient,
+    RoutingStrategy,
+)
+from tests.test_data import CHOICES_DATA, TEST_API_KEY, TEST_CONTENT
+
+ENDPOINT_TEMPLATE = "https://test-endpoint.com/deployments/{model}/chat/completions"
+MESSAGES = [Message(role=Role.USER, content=TEST_CONTENT)]
+
+
+def endpoint(deployment):
+    return ENDPOINT_TEMPLATE.format(model=deployment)
+
+
+def make_response(status_code=200, json_data=None, text=""):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = json_data
+    response.text = text
+    return response
+
+
+def test_least_outstanding_respects_weights():
+    pool = DeploymentPool({"a": 1.0, "b": 3.0})
+
+    picked = [pool.acquire(set()) for _ in range(4)]
+
+    assert picked.count("b") == 3
+    assert picked.count("a") == 1
+
+
+def test_latency_ewma_prefers_faster_deployment():
+    pool = DeploymentPool(["fast", "slow"], strategy=RoutingStrategy.LATENCY_EWMA, ewma_alpha=0.5)
+    for name, latency in (("fast", 0.1), ("slow", 1.0), ("slow", 3.0)):
+        pool.acquire({"fast", "slow"} - {name})
+        pool.release(name, latency=latency)
+
+    assert pool.deployments["slow"].latency == pytest.approx(2.0)
+    assert pool.acquire(set()) == "fast"
+
+
+def test_failed_deployment_cools_down():
+    pool = DeploymentPool({"a": 10.0, "b": 1.0})
+
+    assert pool.acquire(set()) == "a"
+    pool.release("a", failed=True)
+
+    assert pool.acquire(set()) == "b"
+    assert pool.acquire({"b"}) == "a"
+    assert pool.acquire({"a", "b"}) is None
+
+
+def test_rejects_empty_pool_and_invalid_weight():
+    with pytest.raises(ValueError):
+        DeploymentPool([])
+    with pytest.raises(ValueError):
+        DeploymentPool({"a": 0})
+
+
+def test_fails_over_on_rate_limit():
+    client = RoutingModelClient(ENDPOINT_TEMPLATE, {"primary": 10.0, "secondary": 1.0}, TEST_API_KEY)
+    responses = {
+        endpoint("primary"): make_response(status_code=429, text="Too Many Requests"),
+        endpoint("secondary"): make_response(json_data=CHOICES_DATA),
+    }
+
+    with patch('task._utils.model_client.requests.Session.post') as mock_post:
+        mock_post.side_effect = lambda url, **kwargs: responses[url]
+        result = client.get_completion(MESSAGES)
+
+    assert result.content == "Test response"
+    assert [call.kwargs["url"] for call in mock_post.call_args_list] == [endpoint("primary"), endpoint("secondary")]
+    assert client.pool.deployments["secondary"].latency is not None
+    assert all(state.outstanding == 0 for state in client.pool.deployments.values())
+
+
+def test_client_error_is_not_failed_over():
+    client = RoutingModelClient(ENDPOINT_TEMPLATE, ["a", "b"], TEST_API_KEY)
+
+    with patch('task._utils.model_client.requests.Session.post') as mock_post:
+        mock_post.return_value = make_response(status_code=400, text="Bad Request")
+        with pytest.raises(DialHTTPError, match="HTTP 400"):
+            client.get_completion(MESSAGES)
+
+    assert mock_post.call_count == 1
+
+
+def test_raises_last_error_when_all_deployments_fail():
+    client = RoutingModelClient(ENDPOINT_TEMPLATE, ["a", "b"], TEST_API_KEY)
+
+    with patch('task._utils.model_client.requests.Session.post') as mock_post:
+        mock_post.return_value = make_response(status_code=503, text="Unavailable")
+        with pytest.raises(DialHTTPError) as error:
+            client.get_completion(MESSAGES)
+
+    assert error.value.status_code == 503
+    assert mock_post.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_async_fails_over_on_server_error():
+    with patch('task._utils.model_client.httpx.AsyncClient') as mock_httpx_client:
+        mock_http_instance = AsyncMock()
+        mock_http_instance.post.side_effect = [
+            make_response(status_code=502, text="Bad Gateway"),
+            make_response(json_data=CHOICES_DATA),
+        ]
+        mock_httpx_client.return_value = mock_http_instance
+
+        async with AsyncRoutingModelClient(ENDPOINT_TEMPLATE, {"primary": 10.0, "secondary": 1.0}, TEST_API_KEY) as client:
+            result = await client.get_completion(MESSAGES)
+
+        assert result.content == "Test response"
+        assert [call.args[0] for call in mock_http_instance.post.call_args_list] == [endpoint("primary"), endpoint("secondary")]
+        assert client.pool.deployments["primary"].cooldown_until > 0
+
+
+def test_deployment_kwargs_override_shared_client_kwargs():
+    small, large = ContextWindow("gpt-4"), ContextWindow("gpt-4o")
+    client = RoutingModelClient(
+        ENDPOINT_TEMPLATE, ["gpt-4", "gpt-4o"], TEST_API_KEY,
+        deployment_kwargs={"gpt-4": {"context_window": small}}, context_window=large,
+    )
+
+    assert client._clients["gpt-4"]._context_window is small
+    assert client._clients["gpt-4o"]._context_window is large
+    with pytest.raises(ValueError, match="unknown"):
+        RoutingModelClient(ENDPOINT_TEMPLATE, ["a"], TEST_API_KEY, deployment_kwargs={"b": {}})
+
+
+@pytest.mark.asyncio
+async def test_opened_clients_are_closed_when_one_fails_to_open():
+    client = AsyncRoutingModelClient(ENDPOINT_TEMPLATE, ["a", "b"], TEST_API_KEY)
+    first = client._clients["a"]
+    original_enter = AsyncDialModelClient.__aenter__
+
+    async def enter(self):
+        if self is client._clients["b"]:
+            raise RuntimeError("cannot open")
+        return await original_enter(self)
+
+    with patch.object(AsyncDialModelClient, "__aenter__", enter):
+        with pytest.raises(RuntimeError, match="cannot open"):
+            async with client:
+                pass
+
+    assert first._client is None
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from task._models.message import Message
+from task._models.role import Role
+from task._utils.metrics import metrics
+from task._utils.model_client import AsyncDialModelClient
+from task._utils.singleflight import SingleFlight
+from tests.test_data import CHOICES_DATA, TEST_API_KEY, TEST_CONTENT, TEST_ENDPOINT, TEST_MODEL_NAME
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    metrics.reset()
+    group = SingleFlight("test_flight")
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return object()
+
+    results = await asyncio.gather(*(group.do("key", work) for _ in range(5)))
+
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+    assert metrics.get("test_flight.hits") == 4
+    assert group.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_and_key_is_released():
+    group = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise ValueError("upstream failed")
+
+    results = await asyncio.gather(group.do("key", fail), group.do("key", fail), return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert await group.do("key", AsyncMock(return_value="fresh")) == "fresh"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_call():
+    group = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.01)
+        return "done"
+
+    first = asyncio.ensure_future(group.do("key", work))
+    second = asyncio.ensure_future(group.do("key", work))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "done"
+
+
+@pytest.mark.asyncio
+async def test_client_coalesces_identical_requests():
+    with patch('task._utils.model_client.httpx.AsyncClient') as mock_httpx_client:
+        async def slow_post(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            response = MagicMock(status_code=200)
+            response.json.return_value = CHOICES_DATA
+            return response
+
+        mock_http_instance = AsyncMock()
+        mock_http_instance.post.side_effect = slow_post
+        mock_httpx_client.return_value = mock_http_instance
+
+        message = Message(role=Role.USER, content=TEST_CONTENT)
+        async with AsyncDialModelClient(
+            endpoint=TEST_ENDPOINT,
+            deployment_name=TEST_MODEL_NAME,
+            api_key=TEST_API_KEY,
+            coalesce_requests=True
+        ) as client:
+            results = await asyncio.gather(
+                client.get_completion([message]),
+                client.get_completion([message]),
+                client.get_completion([Message(role=Role.USER, content="different")]),
+            )
+
+        assert results[0] is results[1]
+        assert mock_http_instance.post.call_count == 2
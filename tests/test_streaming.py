@@ -0,0 +1,113 @@
+import json
+
+import httpx
+import pytest
+from unittest.mock import Mock, patch
+
+from task._models.message import Message
+from task._models.role import Role
+from task._utils.model_client import AsyncDialModelClient, DialModelClient
+from task._utils.retry import NO_RETRY
+from task._utils.streaming import MessageAssembler, parse_sse_line
+from tests.test_data import TEST_API_KEY, TEST_CONTENT, TEST_ENDPOINT, TEST_MODEL_NAME
+
+STREAM_EVENTS = [
+    {"choices": [{"delta": {"role": "assistant"}}]},
+    {"choices": [{"delta": {"content": "A banner "}}]},
+    {"choices": [{"delta": {"content": "with a logo"}}]},
+    {"choices": [{"delta": {"custom_content": {"attachments": [{"index": 0, "title": "image.png"}]}}}]},
+    {"choices": [{"delta": {"custom_content": {"attachments": [{"index": 0, "url": "files/abc/image.png", "type": "image/png"}]}}}]},
+]
+
+STREAM_LINES = [f"data: {json.dumps(event)}" for event in STREAM_EVENTS] + ["", "data: [DONE]"]
+
+
+def assert_assembled(message):
+    assert message.role == Role.AI
+    assert message.content == "A banner with a logo"
+    attachment = message.custom_content.attachments[0]
+    assert attachment.title == "image.png"
+    assert attachment.url == "files/abc/image.png"
+    assert attachment.type == "image/png"
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("", None),
+    (": keep-alive", None),
+    ("data: [DONE]", None),
+    ('data: {"choices": []}', {"choices": []}),
+])
+def test_parse_sse_line(line, expected):
+    assert parse_sse_line(line) == expected
+
+
+def test_assembler_merges_attachment_deltas():
+    assembler = MessageAssembler()
+    chunks = [assembler.feed(event) for event in STREAM_EVENTS]
+
+    assert [chunk.content for chunk in chunks] == ["", "A banner ", "with a logo", "", ""]
+    assert len(chunks[3].attachments) == 1
+    assert_assembled(assembler.message())
+
+
+def test_assembler_numbers_unindexed_attachments_in_order():
+    assembler = MessageAssembler()
+    assembler.feed({"choices": [{"delta": {"custom_content": {"attachments": [{"title": "a"}, {"title": "b"}, {"title": "c"}]}}}]})
+    assembler.feed({"choices": [{"delta": {"custom_content": {"attachments": [{"title": "d"}]}}}]})
+
+    assert [attachment.title for attachment in assembler.message().custom_content.attachments] == ["a", "b", "c", "d"]
+
+
+def test_sync_stream_completion():
+    client = DialModelClient(endpoint=TEST_ENDPOINT, deployment_name=TEST_MODEL_NAME, api_key=TEST_API_KEY)
+
+    with patch('task._utils.model_client.requests.Session.post') as mock_post:
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.iter_lines.return_value = iter(STREAM_LINES)
+        mock_post.return_value = mock_response
+
+        stream = client.stream_completion([Message(role=Role.USER, content=TEST_CONTENT)])
+        texts = [chunk.content for chunk in stream if chunk.content]
+
+        assert texts == ["A banner ", "with a logo"]
+        assert_assembled(stream.get_message())
+        assert mock_post.call_args.kwargs["json"]["stream"] is True
+        assert mock_post.call_args.kwargs["stream"] is True
+        mock_response.close.assert_called()
+
+
+def test_sync_stream_completion_error():
+    client = DialModelClient(endpoint=TEST_ENDPOINT, deployment_name=TEST_MODEL_NAME, api_key=TEST_API_KEY, retry_policy=NO_RETRY)
+
+    with patch('task._utils.model_client.requests.Session.post') as mock_post:
+        mock_response = Mock()
+        mock_response.status_code = 500
+        mock_response.text = "Internal Server Error"
+        mock_post.return_value = mock_response
+
+        with pytest.raises(Exception, match="HTTP 500"):
+            client.stream_completion([Message(role=Role.USER, content=TEST_CONTENT)])
+        mock_response.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_async_stream_completion():
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(json.loads(request.content))
+        return httpx.Response(200, text="\n".join(STREAM_LINES))
+
+    real_async_client = httpx.AsyncClient
+    with patch('task._utils.model_client.httpx.AsyncClient') as mock_httpx_client:
+        mock_httpx_client.side_effect = lambda **kwargs: real_async_client(transport=httpx.MockTransport(handler), **kwargs)
+
+        async with AsyncDialModelClient(endpoint=TEST_ENDPOINT, deployment_name=TEST_MODEL_NAME, api_key=TEST_API_KEY) as client:
+            stream = client.stream_completion([Message(role=Role.USER, content=TEST_CONTENT)])
+            texts = [chunk.content async for chunk in stream if chunk.content]
+            message = await stream.get_message()
+
+    assert texts == ["A banner ", "with a logo"]
+    assert_assembled(message)
+    assert requests_seen[0]["stream"] is True
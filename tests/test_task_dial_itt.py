@@ -19,11 +19,7 @@ async def test_put_image_function(image_title, image_type, mock_image_bytes):
     _put_image = task_dial_itt._put_image
     
     with patch("task.image_to_text.task_dial_itt.DialBucketClient") as mock_client_class, \
-         patch("task.image_to_text.task_dial_itt.Path") as mock_path, \
-         patch("builtins.open", create=True) as mock_file, \
-         patch("task.image_to_text.task_dial_itt.BytesIO") as mock_bytes_io:
-     
-         mock_file.return_value.__enter__.return_value.read.return_value = mock_image_bytes
+         patch("task.image_to_text.task_dial_itt.Path") as mock_path:
          
          mock_path.return_value.parent = Path(".")
          mock_path.return_value.__truediv__.return_value = image_title
@@ -34,8 +30,6 @@ async def test_put_image_function(image_title, image_type, mock_image_bytes):
          mock_client_class.return_value.__aenter__.return_value = mock_client_instance
          mock_client_class.return_value.__aexit__.return_value = None
 
-         mock_bytes_io.return_value = "fake_bytes_io"
-
          result = await _put_image(image_title, image_type)
 
          assert isinstance(result, Attachment)
@@ -43,7 +37,7 @@ async def test_put_image_function(image_title, image_type, mock_image_bytes):
          assert result.url == TEST_ATTACHMENT_URL
          assert result.type == image_type
 
-         mock_client_instance.put_file.assert_called_once_with(image_title, image_type, "fake_bytes_io")
+         mock_client_instance.put_file.assert_called_once_with(image_title, image_type, Path(image_title))
 
 
 @pytest.mark.asyncio
@@ -54,7 +48,7 @@ async def test_start_async_with_multiple_images(mock_image_bytes):
     This tests the core functionality mentioned in the original.
     """
     with patch('task.image_to_text.task_dial_itt._put_image') as mock_put_image, \
-         patch('task._utils.model_client.requests.post') as mock_requests_post:
+         patch('task._utils.model_client.httpx.AsyncClient') as mock_httpx_client:
         
         from task.image_to_text import task_dial_itt
 
@@ -76,7 +70,9 @@ async def test_start_async_with_multiple_images(mock_image_bytes):
                 }
             }]
         }
-        mock_requests_post.return_value = mock_response
+        mock_http_instance = AsyncMock()
+        mock_http_instance.post.return_value = mock_response
+        mock_httpx_client.return_value = mock_http_instance
 
 
         test_images = ['img1.png', 'img2.png', 'img3.jpg']
@@ -85,7 +81,7 @@ async def test_start_async_with_multiple_images(mock_image_bytes):
 
         assert mock_put_image.call_count == 3
 
-        mock_requests_post.assert_called_once()
+        mock_http_instance.post.assert_awaited_once()
 
 
 @pytest.mark.parametrize("model_name", [
@@ -102,7 +98,6 @@ async def test_start_async_with_different_models(model_name, mock_image_bytes):
     This addresses the original about trying this approach with different models.
     """
     with patch('task._utils.bucket_client.httpx.AsyncClient') as mock_httpx_client, \
-         patch('task._utils.model_client.requests.post') as mock_requests_post, \
          patch('task._utils.constants.DEFAULT_MODEL', model_name):
         
         from task.image_to_text import task_dial_itt
@@ -130,13 +125,13 @@ async def test_start_async_with_different_models(model_name, mock_image_bytes):
                 }
             }]
         }
-        mock_requests_post.return_value = mock_response
+        mock_http_instance.post.return_value = mock_response
 
 
         await task_dial_itt.start_async(['dialx-banner.png'])
 
 
-        mock_requests_post.assert_called_once()
+        mock_http_instance.post.assert_awaited_once()
 
 
 
@@ -146,8 +141,7 @@ async def test_start_async_error_handling_multiple_images():
     Test error handling when processing multiple images, including
     scenarios with invalid image formats, missing files, etc.
     """
-    with patch('task._utils.bucket_client.httpx.AsyncClient') as mock_httpx_client, \
-         patch('task._utils.model_client.requests.post') as mock_requests_post:
+    with patch('task._utils.bucket_client.httpx.AsyncClient') as mock_httpx_client:
         
         from task.image_to_text import task_dial_itt
 
@@ -175,7 +169,7 @@ async def test_start_async_error_handling_multiple_images():
                 }
             }]
         }
-        mock_requests_post.return_value = mock_response
+        mock_http_instance.post.return_value = mock_response
 
 
         test_images = ['valid_img1.png', 'valid_img2.jpg', 'invalid_img.gif']
@@ -191,8 +185,7 @@ async def test_start_async_error_handling_multiple_images():
 @pytest.mark.asyncio
 async def test_start_async_function(mock_image_bytes):
  
-    with patch('task._utils.bucket_client.httpx.AsyncClient') as mock_httpx_client, \
-         patch('task._utils.model_client.requests.post') as mock_requests_post:
+    with patch('task._utils.bucket_client.httpx.AsyncClient') as mock_httpx_client:
 
         from task.image_to_text import task_dial_itt
 
@@ -213,12 +206,12 @@ async def test_start_async_function(mock_image_bytes):
         mock_response.json.return_value = {
             "choices": [{"message": {"role": "assistant", "content": "This is a test description of the image"}}]
         }
-        mock_requests_post.return_value = mock_response
+        mock_http_instance.post.return_value = mock_response
 
 
         await task_dial_itt.start_async()
 
-        mock_requests_post.assert_called_once()
+        mock_http_instance.post.assert_awaited_once()
 
 
 def test_start_function():
@@ -231,4 +224,46 @@ def test_start_function():
 
         call_args = mock_async_run.call_args[0][0]
 
-        assert call_args.__name__ == "start_async"
\ No newline at end of file
+        assert call_args.__name__ == "start_async"
+
+@pytest.mark.asyncio
+async def test_put_images_uploads_concurrently_in_input_order():
+    import asyncio
+    from task.image_to_text import task_dial_itt
+
+    client = MockDialBucketClient()
+    in_flight = 0
+    peak = 0
+
+    async def fake_put_image(file_name, mime_type, client=None, image_settings=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01 if file_name.startswith('slow') else 0)
+        in_flight -= 1
+        return Attachment(title=file_name, url=f"files/{file_name}", type=mime_type)
+
+    filenames = ['slow1.png', 'fast2.jpg', 'slow3.gif', 'fast4.png']
+    with patch('task.image_to_text.task_dial_itt._put_image', side_effect=fake_put_image) as mock_put_image:
+        attachments = await task_dial_itt._put_images(filenames, client, concurrency=2)
+
+    assert [attachment.title for attachment in attachments] == filenames
+    assert [attachment.type for attachment in attachments] == ['image/png', 'image/jpeg', 'image/gif', 'image/png']
+    assert peak == 2
+    assert all(call.kwargs['client'] is client for call in mock_put_image.call_args_list)
+
+
+@pytest.mark.asyncio
+async def test_start_async_shares_one_bucket_client():
+    from task.image_to_text import task_dial_itt
+
+    with patch('task.image_to_text.task_dial_itt.DialBucketClient') as mock_bucket_client_class, \
+         patch('task.image_to_text.task_dial_itt._put_image') as mock_put_image, \
+         patch('task.image_to_text.task_dial_itt.AsyncDialModelClient'):
+        mock_bucket_client_class.return_value = MockDialBucketClient()
+        mock_put_image.return_value = Attachment(title='img.png', url=TEST_ATTACHMENT_URL, type='image/png')
+
+        await task_dial_itt.start_async(['img1.png', 'img2.png', 'img3.png'])
+
+        mock_bucket_client_class.assert_called_once()
+        assert mock_put_image.call_count == 3
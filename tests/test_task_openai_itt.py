@@ -1,7 +1,6 @@
 import pytest
 import importlib.util
 from unittest.mock import patch, MagicMock
-from pathlib import Path
 from tests.test_data import IMAGES
 from task.image_to_text.openai.message import ContentedMessage, TxtContent, ImgContent, ImgUrl
 from task._models.role import Role
@@ -50,13 +49,7 @@ def test_start_function_with_various_image_urls(image_url, mock_base64_image=Mag
         mock_client_instance.get_completion.return_value = mock_result
         mock_client_class.return_value = mock_client_instance
 
-        with patch("task.image_to_text.openai.task_openai_itt.Path") as mock_path, \
-             patch("builtins.open", create=True) as mock_file, \
-             patch("task.image_to_text.openai.task_openai_itt.print") as mock_print:
-
-            mock_file.return_value.__enter__.return_value.read.return_value = b"fake_image_bytes"
-            mock_path.return_value.parent = Path(".")
-            mock_path.return_value.__truediv__.return_value = "fake_path"
+        with patch("task.image_to_text.openai.task_openai_itt.print") as mock_print:
 
             start()
 
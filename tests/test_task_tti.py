@@ -4,8 +4,9 @@ from unittest.mock import patch, MagicMock, AsyncMock
 import importlib.util
 
 from task._models.custom_content import Attachment
+from task._utils.bucket_client import DialBucketClient
 from tests.mock_client import MockDialModelClient
-from tests.test_data import IMAGES, TEST_ENDPOINT
+from tests.test_data import IMAGES
 
 
 def load_task_module(task_path, module_name):
@@ -77,10 +78,11 @@ def setup_mock_responses(status_code=200, has_attachments=True):
 
 @pytest.mark.parametrize("url", IMAGES)
 @pytest.mark.asyncio
-async def test_save_images_function(url, mock_image_bytes):
+async def test_save_images_function(url, mock_image_bytes, tmp_path, monkeypatch):
 
     task_module = load_task_module("task/text_to_image/task_tti.py", "task_tti")
     _save_images = task_module._save_images
+    monkeypatch.chdir(tmp_path)
     
     
     attachments = [
@@ -90,33 +92,22 @@ async def test_save_images_function(url, mock_image_bytes):
             type='image/png'
         )
     ]
-    with patch('task._utils.bucket_client.httpx.AsyncClient') as mock_httpx_client, \
-         patch("builtins.open", create=True) as mock_open, \
-         patch("task.text_to_image.task_tti.datetime") as mock_datetime:
+    requested = []
 
+    async def fake_iter_file(self, file_url, chunk_size=None):
+        requested.append(file_url)
+        yield mock_image_bytes
 
-         mock_http_instance = AsyncMock()
-         mock_response_get = MagicMock()
-         mock_response_get.content = mock_image_bytes
-         mock_response_get.raise_for_status.return_value = None
-         mock_http_instance.get.return_value = mock_response_get
-         mock_httpx_client.return_value = mock_http_instance
-    
-
-         mock_file_instance = MagicMock()
-         mock_open.return_value.__enter__.return_value = mock_file_instance
-    
+    with patch.object(DialBucketClient, "iter_file", fake_iter_file), \
+         patch.object(task_module, "datetime") as mock_datetime:
 
          mock_datetime.now.return_value.strftime.return_value = "test_time"
     
-         await _save_images(attachments)
+         filenames = await _save_images(attachments)
 
-
-         mock_http_instance.get.assert_called()
-         assert mock_http_instance.get.call_count == len(attachments)
-         for i, attachment in enumerate(attachments):
-             mock_http_instance.get.assert_any_call(f"/v1/{attachment.url}")
-         mock_file_instance.write.assert_called_with(mock_image_bytes)
+    assert requested == [attachment.url for attachment in attachments]
+    assert [(tmp_path / filename).read_bytes() for filename in filenames] == [mock_image_bytes]
+    assert not list(tmp_path.glob("*.part"))
 
 
 def test_size_class():
@@ -161,20 +152,8 @@ def test_start_function_success(prompt):
     task_module = load_task_module("task/text_to_image/task_tti.py", "task_tti")
     start = task_module.start
 
-
-    attachment = Attachment(
-        title="generated_image.png",
-        url="https://example.com/fake.png",
-        type="image/png"
-    )
-
-    with patch('task.text_to_image.task_tti.DialModelClient') as mock_client_class, \
-     patch('task._utils.model_client.requests.post') as mock_requests_post, \
-     patch('task._utils.bucket_client.httpx.AsyncClient') as mock_httpx_client, \
-     patch(
-         "task.text_to_image.task_tti._save_images",
-         new_callable=MagicMock
-     ) as mock_save_images, \
+    with patch('task._utils.model_client.httpx.AsyncClient') as mock_httpx_client, \
+     patch.object(task_module, "_save_images", new_callable=AsyncMock) as mock_save_images, \
      patch(
          "task.text_to_image.task_tti.print"
      ) as mock_print, \
@@ -183,14 +162,8 @@ def test_start_function_success(prompt):
      ) as mock_asyncio_run:
 
 
-       mock_result, attachment = create_mock_result_with_attachment()
-       setup_mock_client(mock_client_class, mock_result)
-
-
-       mock_response_with_attachments = setup_mock_responses(status_code=200, has_attachments=True)
-       mock_requests_post.return_value = mock_response_with_attachments
-
        mock_http_instance = AsyncMock()
+       mock_http_instance.post.return_value = setup_mock_responses(status_code=200, has_attachments=True)
        mock_httpx_client.return_value = mock_http_instance
 
        def run_sync_function(coro):
@@ -221,7 +194,8 @@ def test_start_function_success(prompt):
 
        start()
 
-       mock_requests_post.assert_called_once()
+       mock_http_instance.post.assert_awaited_once()
+       mock_save_images.assert_awaited_once()
         
 
 def test_start_function_no_attachments():
@@ -229,32 +203,17 @@ def test_start_function_no_attachments():
 
     task_module = load_task_module("task/text_to_image/task_tti.py", "task_tti")
     start = task_module.start
-    with patch("task.text_to_image.task_tti.DialModelClient") as mock_client_class, \
-         patch('task._utils.model_client.requests.post') as mock_requests_post, \
+    with patch('task._utils.model_client.httpx.AsyncClient') as mock_httpx_client, \
          patch("task.text_to_image.task_tti.print") as mock_print:
 
-         mock_client_instance = MockDialModelClient(
-             endpoint=TEST_ENDPOINT,
-             deployment_name="imagegeneration@005",
-             api_key="test_key"
-         )
-         mock_result = MagicMock()
-         mock_result.custom_content = None
-         mock_client_instance.get_completion.return_value = mock_result
-         mock_client_class.return_value = mock_client_instance
-
-
-         mock_response = MagicMock()
-         mock_response.status_code = 200
-         mock_response.json.return_value = {
-             "choices": [{"message": {"role": "assistant", "content": "Generated image"}}]
-         }
-         mock_requests_post.return_value = mock_response
-
-          
+         mock_http_instance = AsyncMock()
+         mock_http_instance.post.return_value = setup_mock_responses(status_code=200, has_attachments=False)
+         mock_httpx_client.return_value = mock_http_instance
 
          start("Sunny day on Bali")
 
+         mock_http_instance.post.assert_awaited_once()
+
 
 
 
@@ -263,13 +222,72 @@ def test_start_function_exception():
 
     task_module = load_task_module("task/text_to_image/task_tti.py", "task_tti")
     start = task_module.start
-    with patch('task._utils.model_client.requests.post') as mock_requests_post, \
+    with patch('task._utils.model_client.httpx.AsyncClient') as mock_httpx_client, \
          patch("task.text_to_image.task_tti.print") as mock_print:
 
-
-         mock_requests_post.side_effect = Exception("Test error")
+         mock_http_instance = AsyncMock()
+         mock_http_instance.post.side_effect = Exception("Test error")
+         mock_httpx_client.return_value = mock_http_instance
 
          start("Sunny day on Bali")
 
 
-         
\ No newline at end of file
+         
+
+@pytest.mark.asyncio
+async def test_save_images_downloads_concurrently_with_unique_names(tmp_path, monkeypatch):
+    import json
+    from task.text_to_image import task_tti
+    from tests.mock_client import MockDialBucketClient
+
+    monkeypatch.chdir(tmp_path)
+    in_flight = 0
+    peak = 0
+
+    async def fake_get_file(url):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return url.encode()
+
+    client = MockDialBucketClient()
+    client.get_file.side_effect = fake_get_file
+    attachments = [
+        Attachment(title='generated_image.png', url=f"files/image_{i}.png", type='image/png')
+        for i in range(4)
+    ]
+    metadata = {"prompt": "Sunny day on Bali", "size": "1024x1024", "quality": "hd", "style": "vivid", "latency": 1.5}
+
+    with patch('task.text_to_image.task_tti.DialBucketClient', return_value=client), \
+         patch('task.text_to_image.task_tti.datetime') as mock_datetime:
+        mock_datetime.now.return_value.strftime.return_value = "test_time"
+        filenames = await task_tti._save_images(attachments, metadata=metadata, concurrency=2)
+
+    assert peak == 2
+    assert len(set(filenames)) == len(attachments)
+    for index, (filename, attachment) in enumerate(zip(filenames, attachments)):
+        assert filename.startswith(f"generated_image_test_time_{index}_")
+        assert (tmp_path / filename).read_bytes() == attachment.url.encode()
+        sidecar = json.loads((tmp_path / f"{filename}.json").read_text())
+        assert sidecar["prompt"] == "Sunny day on Bali"
+        assert sidecar["style"] == "vivid"
+        assert sidecar["source_url"] == attachment.url
+
+
+@pytest.mark.asyncio
+async def test_save_images_without_metadata_writes_no_sidecar(tmp_path, monkeypatch):
+    from task.text_to_image import task_tti
+    from tests.mock_client import MockDialBucketClient
+
+    monkeypatch.chdir(tmp_path)
+    client = MockDialBucketClient()
+    client.get_file.return_value = b"image"
+
+    with patch('task.text_to_image.task_tti.DialBucketClient', return_value=client):
+        filenames = await task_tti._save_images([
+            Attachment(title='generated_image.png', url="files/image.png", type='image/png')
+        ])
+
+    assert [path.name for path in tmp_path.iterdir()] == filenames
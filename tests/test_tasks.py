@@ -8,6 +8,7 @@ from task._models.message import Message
 from task._models.role import Role
 from task.image_to_text.openai.message import ContentedMessage, TxtContent, ImgContent, ImgUrl
 from task._models.custom_content import Attachment, CustomContent
+from task._utils.bucket_client import DialBucketClient
 from tests.mock_client import MockDialModelClient
 from tests.test_data import TEST_ATTACHMENT_URL
 
@@ -38,7 +39,7 @@ class TestOpenAITask:
         start_openai_itt = task_module.start
 
         with patch('task.image_to_text.openai.task_openai_itt.DialModelClient') as mock_client_class, \
-             patch('task._utils.model_client.requests.post') as mock_requests_post:
+             patch('task._utils.model_client.requests.Session.post') as mock_requests_post:
 
             mock_client_instance = MockDialModelClient()
             mock_client_instance.get_completion.return_value = Mock(
@@ -96,9 +97,8 @@ class TestDialTask:
 
 
 
-        with patch('task.image_to_text.task_dial_itt.DialModelClient') as mock_client_class, \
-             patch('task._utils.bucket_client.httpx.AsyncClient') as mock_httpx_client, \
-             patch('task._utils.model_client.requests.post') as mock_requests_post:
+        with patch('task.image_to_text.task_dial_itt.AsyncDialModelClient') as mock_client_class, \
+             patch('task._utils.bucket_client.httpx.AsyncClient') as mock_httpx_client:
 
             mock_client_instance = MockDialModelClient()
             mock_client_instance.get_completion.return_value = Mock(
@@ -124,21 +124,22 @@ class TestDialTask:
             mock_response.json.return_value = {
                 "choices": [{"message": {"role": "assistant", "content": "Test DIAL analysis result"}}]
             }
-            mock_requests_post.return_value = mock_response
+            mock_http_instance.post.return_value = mock_response
 
             start_dial_itt()
 
-            mock_requests_post.assert_called_once()
+            mock_http_instance.post.assert_called_once()
 
 
 class TestTextToImageTask:
     
     
-    def test_tti_save(self):
+    def test_tti_save(self, tmp_path, monkeypatch):
         
         
         task_module = load_task_module("task/text_to_image/task_tti.py", "task_tti")
         _save_images = task_module._save_images
+        monkeypatch.chdir(tmp_path)
         
         TEST_IMAGE_TITLE = "test_image.png"
         TEST_ATTACHMENT_URL = "https://example.com/test_image.png"
@@ -148,29 +149,24 @@ class TestTextToImageTask:
             url=TEST_ATTACHMENT_URL,
             type=TEST_IMAGE_TYPE
         )
+        requested = []
+
+        async def fake_iter_file(self, url, chunk_size=None):
+            requested.append(url)
+            yield b"fake_image"
+            yield b"_data"
         
         
-        with patch('task._utils.bucket_client.httpx.AsyncClient') as mock_httpx_client, \
-             patch('builtins.open', create=True) as mock_open, \
-             patch('task.text_to_image.task_tti.datetime') as mock_datetime:
-
-            mock_http_instance = AsyncMock()
-            mock_response_get = MagicMock()
-            mock_response_get.content = b"fake_image_data"
-            mock_response_get.raise_for_status.return_value = None
-            mock_http_instance.get.return_value = mock_response_get
-            mock_httpx_client.return_value = mock_http_instance
+        with patch.object(DialBucketClient, "iter_file", fake_iter_file), \
+             patch.object(task_module, "datetime") as mock_datetime:
 
             mock_datetime.now.return_value.strftime.return_value = "20231224_12000"
 
-            mock_file = Mock()
-            mock_open.return_value.__enter__.return_value = mock_file
-
-            asyncio.run(_save_images([mock_attachment]))
-
-            mock_http_instance.get.assert_called_once_with(f"/v1/{TEST_ATTACHMENT_URL}")
-            mock_file.write.assert_called_once_with(b"fake_image_data")
+            filenames = asyncio.run(_save_images([mock_attachment]))
 
+            assert requested == [TEST_ATTACHMENT_URL]
+            assert (tmp_path / filenames[0]).read_bytes() == b"fake_image_data"
+            assert filenames[0].startswith("generated_image_20231224_12000_0_")
 
     def test_tti(self):
         
@@ -179,8 +175,8 @@ class TestTextToImageTask:
         start_tti = task_module.start
         
 
-        with patch('task.text_to_image.task_tti.DialModelClient') as mock_client_class, \
-             patch('task._utils.model_client.requests.post') as mock_requests_post:
+        with patch('task.text_to_image.task_tti.AsyncDialModelClient') as mock_client_class, \
+             patch('task._utils.model_client.httpx.AsyncClient') as mock_httpx_client:
 
             mock_client_instance = MockDialModelClient()
             mock_client_instance.get_completion.return_value = Mock(
@@ -194,11 +190,13 @@ class TestTextToImageTask:
             mock_response.json.return_value = {
                 "choices": [{"message": {"role": "assistant", "content": "Generated image"}}]
             }
-            mock_requests_post.return_value = mock_response
+            mock_http_instance = AsyncMock()
+            mock_http_instance.post.return_value = mock_response
+            mock_httpx_client.return_value = mock_http_instance
 
             start_tti()
 
-            mock_requests_post.assert_called_once()
+            mock_http_instance.post.assert_called_once()
     
     PROMPTS = [
         "Sunny day on Bali",
@@ -215,8 +213,8 @@ class TestTextToImageTask:
         start_tti = task_module.start
         
 
-        with patch('task.text_to_image.task_tti.DialModelClient') as mock_client_class, \
-             patch('task._utils.model_client.requests.post') as mock_requests_post:
+        with patch('task.text_to_image.task_tti.AsyncDialModelClient') as mock_client_class, \
+             patch('task._utils.model_client.httpx.AsyncClient') as mock_httpx_client:
 
             mock_client_instance = MockDialModelClient()
             mock_client_instance.get_completion.return_value = Mock(
@@ -230,11 +228,13 @@ class TestTextToImageTask:
             mock_response.json.return_value = {
                 "choices": [{"message": {"role": "assistant", "content": "Generated image"}}]
             }
-            mock_requests_post.return_value = mock_response
+            mock_http_instance = AsyncMock()
+            mock_http_instance.post.return_value = mock_response
+            mock_httpx_client.return_value = mock_http_instance
 
             start_tti()
 
-            mock_requests_post.assert_called_once()
+            mock_http_instance.post.assert_called_once()
 
 
 def test_temperature_parameter():
@@ -285,7 +285,7 @@ def test_api_error_handling():
     )
 
 
-    with patch('task._utils.model_client.requests.post') as mock_requests_post:
+    with patch('task._utils.model_client.requests.Session.post') as mock_requests_post:
 
         error_response = Mock()
         error_response.status_code = 401
@@ -1,10 +1,11 @@
 import asyncio
 import importlib.util
-from unittest.mock import MagicMock, Mock, patch, AsyncMock, mock_open
+from unittest.mock import Mock, patch, AsyncMock
 from tests.test_data import TEST_ATTACHMENT_URL
 from task._models.message import Message
 from task._models.role import Role
 from task._models.custom_content import Attachment
+from task._utils.bucket_client import DialBucketClient
 from task.text_to_image.task_tti import Size, Quality, Style
 from tests.mock_client import MockDialModelClient
 
@@ -35,9 +36,10 @@ class TestTextToImage:
         assert Quality.standard == "standard"
         assert Quality.hd == "hd"
 
-    def test_save_images_function(self):
+    def test_save_images_function(self, tmp_path, monkeypatch):
         task_module = load_task_module("task/text_to_image/task_tti.py", "task_tti")
         _save_images = task_module._save_images
+        monkeypatch.chdir(tmp_path)
 
         TEST_IMAGE_TYPE = "image/png"
         mock_attachment = Attachment(
@@ -46,31 +48,25 @@ class TestTextToImage:
             type=TEST_IMAGE_TYPE
         )
 
-        with patch('task._utils.bucket_client.httpx.AsyncClient') as mock_httpx_client, \
-             patch('builtins.open', mock_open()) as mock_file:
+        async def fake_iter_file(self, url, chunk_size=None):
+            yield b"fake_image_data"
 
-            mock_http_instance = AsyncMock()
-            mock_response_get = MagicMock()
-            mock_response_get.content = b"fake_image_data"
-            mock_response_get.raise_for_status.return_value = None
-            mock_http_instance.get.return_value = mock_response_get
-            mock_httpx_client.return_value = mock_http_instance
+        with patch.object(DialBucketClient, "iter_file", fake_iter_file):
 
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
-            loop.run_until_complete(_save_images([mock_attachment]))
+            filenames = loop.run_until_complete(_save_images([mock_attachment]))
             loop.close()
 
 
-            mock_http_instance.get.assert_called()
-            mock_file.assert_called_once()
+            assert (tmp_path / filenames[0]).read_bytes() == b"fake_image_data"
 
     def test_tti_generation(self):
         task_module = load_task_module("task/text_to_image/task_tti.py", "task_tti")
         start_tti = task_module.start
 
-        with patch('task.text_to_image.task_tti.DialModelClient') as mock_client_class, \
-             patch('task._utils.model_client.requests.post') as mock_requests_post:
+        with patch('task.text_to_image.task_tti.AsyncDialModelClient') as mock_client_class, \
+             patch('task._utils.model_client.httpx.AsyncClient') as mock_httpx_client:
             mock_client_instance = MockDialModelClient()
             mock_client_instance.get_completion.return_value = Mock(
                 custom_content=Mock(attachments=[])
@@ -83,11 +79,13 @@ class TestTextToImage:
             mock_response.json.return_value = {
                 "choices": [{"message": {"role": "assistant", "content": "Generated image"}}]
             }
-            mock_requests_post.return_value = mock_response
+            mock_http_instance = AsyncMock()
+            mock_http_instance.post.return_value = mock_response
+            mock_httpx_client.return_value = mock_http_instance
 
             start_tti()
 
-            mock_requests_post.assert_called_once()
+            mock_http_instance.post.assert_called_once()
 
     def test_tti_generation_with_parameters(self):
         client = MockDialModelClient()
@@ -198,27 +196,18 @@ class TestTextToImage:
             assert "custom_fields" in kwargs
             assert kwargs["custom_fields"]["quality"] == quality
 
-    def test_tti_complete_workflow(self):
+    def test_tti_complete_workflow(self, tmp_path, monkeypatch):
         task_module = load_task_module("task/text_to_image/task_tti.py", "task_tti")
         start_tti = task_module.start
+        monkeypatch.chdir(tmp_path)
 
-        with patch('task.text_to_image.task_tti.DialModelClient') as mock_client_class, \
-             patch('task._utils.bucket_client.httpx.AsyncClient') as mock_httpx_client, \
-             patch('task._utils.model_client.requests.post') as mock_requests_post, \
-             patch('builtins.open', mock_open()) as mock_file:
-
-            mock_client_instance = MockDialModelClient()
-            mock_client_instance.get_completion.return_value = Mock(
-                custom_content=Mock(attachments=[Mock()])
-            )
-            mock_client_class.return_value = mock_client_instance
+        async def fake_iter_file(self, url, chunk_size=None):
+            yield b"fake_image_data"
 
+        with patch('task._utils.model_client.httpx.AsyncClient') as mock_httpx_client, \
+             patch.object(DialBucketClient, "iter_file", fake_iter_file):
 
             mock_http_instance = AsyncMock()
-            mock_response_get = MagicMock()
-            mock_response_get.content = b"fake_image_data"
-            mock_response_get.raise_for_status.return_value = None
-            mock_http_instance.get.return_value = mock_response_get
             mock_httpx_client.return_value = mock_http_instance
 
 
@@ -233,9 +222,10 @@ class TestTextToImage:
                     }
                 }}]
             }
-            mock_requests_post.return_value = mock_response
+            mock_http_instance.post.return_value = mock_response
 
             start_tti()
 
-            mock_requests_post.assert_called_once()
-            mock_file.assert_called()
\ No newline at end of file
+            mock_http_instance.post.assert_called_once()
+            images = list(tmp_path.glob("generated_image_*.png"))
+            assert [image.read_bytes() for image in images] == [b"fake_image_data"]
@@ -8,13 +8,14 @@ from task._utils.bucket_client import DialBucketClient
 from task._utils.model_client import DialModelClient
 from task._models.message import Message
 from task._models.role import Role
+from tests.mock_client import MockDialBucketClient
 
 
 @pytest.mark.asyncio
-async def test_save_images_with_png_attachments():
+async def test_save_images_with_png_attachments(tmp_path, monkeypatch):
     """Test _save_images function with PNG attachments."""
+    monkeypatch.chdir(tmp_path)
     with patch('task.text_to_image.task_tti.DialBucketClient') as mock_bucket_client_class, \
-         patch('builtins.open', create=True) as mock_open, \
          patch('task.text_to_image.task_tti.datetime') as mock_datetime:
         
 
@@ -30,22 +31,21 @@ async def test_save_images_with_png_attachments():
         ]
         
 
-        mock_bucket_instance = AsyncMock()
+        mock_bucket_instance = MockDialBucketClient()
         mock_bucket_instance.get_file.return_value = b'test_image_data'
-        mock_bucket_client_class.return_value.__aenter__.return_value = mock_bucket_instance
+        mock_bucket_client_class.return_value = mock_bucket_instance
         
 
-        mock_file_handle = MagicMock()
-        mock_open.return_value.__enter__.return_value = mock_file_handle
-        
-        await _save_images(test_attachments)
+        filenames = await _save_images(test_attachments)
+
+    assert [(tmp_path / filename).read_bytes() for filename in filenames] == [b'test_image_data'] * len(test_attachments)
 
 
 @pytest.mark.asyncio
-async def test_save_images_with_multiple_attachments():
+async def test_save_images_with_multiple_attachments(tmp_path, monkeypatch):
     """Test _save_images function with multiple attachments."""
+    monkeypatch.chdir(tmp_path)
     with patch('task.text_to_image.task_tti.DialBucketClient') as mock_bucket_client_class, \
-         patch('builtins.open', create=True) as mock_open, \
          patch('task.text_to_image.task_tti.datetime') as mock_datetime:
         
 
@@ -66,20 +66,19 @@ async def test_save_images_with_multiple_attachments():
         ]
         
 
-        mock_bucket_instance = AsyncMock()
+        mock_bucket_instance = MockDialBucketClient()
         mock_bucket_instance.get_file.return_value = b'test_image_data'
-        mock_bucket_client_class.return_value.__aenter__.return_value = mock_bucket_instance
+        mock_bucket_client_class.return_value = mock_bucket_instance
         
 
-        mock_file_handle = MagicMock()
-        mock_open.return_value.__enter__.return_value = mock_file_handle
-        
-        await _save_images(test_attachments)
+        filenames = await _save_images(test_attachments)
+
+    assert [(tmp_path / filename).read_bytes() for filename in filenames] == [b'test_image_data'] * len(test_attachments)
 
 
 def test_start_function_with_mocked_dependencies():
     
-    with patch('task.text_to_image.task_tti.DialModelClient') as mock_model_client_class, \
+    with patch('task.text_to_image.task_tti.AsyncDialModelClient') as mock_model_client_class, \
          patch('task.text_to_image.task_tti._save_images') as mock_save_images, \
          patch('builtins.print') as mock_print:
         
@@ -111,7 +110,7 @@ def test_start_function_with_mocked_dependencies():
 
 def test_start_function_with_custom_fields():
     
-    with patch('task.text_to_image.task_tti.DialModelClient') as mock_model_client_class, \
+    with patch('task.text_to_image.task_tti.AsyncDialModelClient') as mock_model_client_class, \
          patch('task.text_to_image.task_tti._save_images') as mock_save_images, \
          patch('builtins.print') as mock_print:
         
@@ -143,7 +142,7 @@ def test_start_function_with_custom_fields():
 
 def test_start_function_with_google_model():
     
-    with patch('task.text_to_image.task_tti.DialModelClient') as mock_model_client_class, \
+    with patch('task.text_to_image.task_tti.AsyncDialModelClient') as mock_model_client_class, \
          patch('task.text_to_image.task_tti._save_images') as mock_save_images, \
          patch('builtins.print') as mock_print:
         
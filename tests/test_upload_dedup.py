@@ -0,0 +1,99 @@
+import hashlib
+import json
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from task._models.custom_content import Attachment
+from task._utils.metrics import metrics
+from task._utils.upload_dedup import DedupUploader, UploadIndex, file_sha256
+from tests.mock_client import MockDialBucketClient
+
+IMAGE_BYTES = b"\x89PNG fake image content"
+IMAGE_DIGEST = hashlib.sha256(IMAGE_BYTES).hexdigest()
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    path = tmp_path / "banner.png"
+    path.write_bytes(IMAGE_BYTES)
+    return path
+
+
+@pytest.fixture
+def bucket_client():
+    client = MockDialBucketClient()
+    client.put_file.side_effect = lambda name, mime_type, content: {"url": f"files/mock_bucket_id/{name}"}
+    client.file_exists = AsyncMock(return_value=True)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_file_sha256(image_path):
+    assert await file_sha256(image_path, chunk_size=4) == IMAGE_DIGEST
+
+
+@pytest.mark.asyncio
+async def test_repeat_upload_is_skipped(image_path, bucket_client, tmp_path):
+    metrics.reset()
+    uploader = DedupUploader(bucket_client, UploadIndex(tmp_path / "index.json"))
+
+    first = await uploader.put_file("banner.png", "image/png", image_path)
+    second = await uploader.put_file("copy-of-banner.png", "image/png", image_path)
+
+    assert first["url"] == second["url"] == f"files/mock_bucket_id/cas/{IMAGE_DIGEST}.png"
+    bucket_client.put_file.assert_called_once_with(f"cas/{IMAGE_DIGEST}.png", "image/png", image_path)
+    assert metrics.get("upload_dedup.hits") == 1
+
+
+@pytest.mark.asyncio
+async def test_index_persists_between_runs(image_path, bucket_client, tmp_path):
+    index_path = tmp_path / "index.json"
+    await DedupUploader(bucket_client, UploadIndex(index_path)).put_file("banner.png", "image/png", image_path)
+
+    reloaded = UploadIndex(index_path)
+    await DedupUploader(bucket_client, reloaded).put_file("banner.png", "image/png", image_path)
+
+    assert json.loads(index_path.read_text())[f"https://mock-dial/mock_bucket_id/{IMAGE_DIGEST}"]["name"] == "banner.png"
+    assert bucket_client.put_file.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_index_is_scoped_to_service_and_bucket(image_path, bucket_client, tmp_path):
+    index = UploadIndex(tmp_path / "index.json")
+    other_bucket_client = MockDialBucketClient(base_url="https://other-dial")
+    other_bucket_client.put_file.side_effect = bucket_client.put_file.side_effect
+
+    await DedupUploader(bucket_client, index).put_file("banner.png", "image/png", image_path)
+    await DedupUploader(other_bucket_client, index).put_file("banner.png", "image/png", image_path)
+
+    bucket_client.put_file.assert_called_once()
+    other_bucket_client.put_file.assert_called_once()
+    assert len(index) == 2
+
+
+@pytest.mark.asyncio
+async def test_missing_file_is_uploaded_again_when_verifying(image_path, bucket_client, tmp_path):
+    uploader = DedupUploader(bucket_client, UploadIndex(tmp_path / "index.json"), verify=True)
+    await uploader.put_file("banner.png", "image/png", image_path)
+    bucket_client.file_exists.return_value = False
+
+    await uploader.put_file("banner.png", "image/png", image_path)
+
+    assert bucket_client.put_file.call_count == 2
+    bucket_client.file_exists.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_start_async_uses_dedup_index(tmp_path):
+    from task.image_to_text import task_dial_itt
+
+    with patch('task.image_to_text.task_dial_itt.DialBucketClient') as mock_bucket_client_class, \
+         patch('task.image_to_text.task_dial_itt._put_image') as mock_put_image, \
+         patch('task.image_to_text.task_dial_itt.AsyncDialModelClient'):
+        mock_bucket_client_class.return_value = MockDialBucketClient()
+        mock_put_image.return_value = Attachment(title='img.png', url='files/img.png', type='image/png')
+
+        await task_dial_itt.start_async(['img.png'], dedup_index=str(tmp_path / "index.json"))
+
+        assert isinstance(mock_put_image.call_args.kwargs['client'], DedupUploader)